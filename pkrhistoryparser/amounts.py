@@ -0,0 +1,34 @@
+"""
+This module converts the written numbers of the hand histories and summaries (stacks, postings, action amounts, levels,
+prize pools) into floats. They are written with a comma or a dot as decimal separator and with a k or M suffix for
+thousands and millions (1,5k or 2M).
+The conversions are memoised, since the same few values (blinds, antes and their multiples) come up again and again,
+and the plain integers missing from the cache are converted without rewriting them first.
+"""
+from functools import lru_cache
+
+WRITTEN_NUMBERS_CACHE_SIZE = 4096
+
+
+def convert_written_number(txt_num: str) -> float:
+    """
+    Transforms any written str number into a float
+
+    Parameters:
+        txt_num(str): The number to transform
+
+    Returns:
+        (float): The float number, 0.0 if the number is missing or cannot be read
+
+    """
+    if not isinstance(txt_num, str):
+        return 0.0
+    try:
+        if txt_num.isdigit() and txt_num.isascii():
+            return float(txt_num)
+        return float(txt_num.replace(",", ".").replace("k", "e3").replace("M", "e6"))
+    except ValueError:
+        return 0.0
+
+
+to_float = lru_cache(maxsize=WRITTEN_NUMBERS_CACHE_SIZE)(convert_written_number)
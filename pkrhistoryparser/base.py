@@ -0,0 +1,89 @@
+"""
+This module contains the base of the hand history and summary parsers, holding what they share to run their methods
+over keys: the checks of their settings, the execution strategies of the executors module and the per-process state of
+the workers.
+"""
+from abc import ABC
+from collections.abc import Iterable, Iterator
+
+from pkrhistoryparser.executors import iter_tasks, run_tasks
+from pkrhistoryparser.storage import StorageBackend
+
+ENGINES = ("regex", "scanner")
+
+
+class AbstractParser(ABC):
+
+    storage: StorageBackend
+    engine: str = "regex"
+    executor: str = "thread"
+    max_workers: int = None
+    batch_size: int = 100
+    max_in_flight: int = None
+    fetch_workers: int = 16
+    upload_workers: int = 16
+    queue_size: int = 64
+    compression: str = None
+    json_format: str = "compat"
+
+    @staticmethod
+    def check_engine(engine: str) -> str:
+        """
+        Check that the parse engine is supported.
+
+        Parameters:
+            engine (str): The parse engine, either "regex" (one search of the whole text per field) or "scanner" (a
+            single pass over the hand histories, a backward search of the last occurrence of each field of the
+            summaries).
+
+        Returns:
+            engine (str): The checked parse engine
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parse engine: {engine}")
+        return engine
+
+    def run_tasks(self, method_name: str, keys: Iterable, **method_kwargs) -> None:
+        """
+        Run a parser method on every key with the execution strategy of the parser (thread, process or inline).
+
+        Parameters:
+            method_name (str): The name of the parser method to run on each key.
+            keys (Iterable): The keys to process.
+            method_kwargs: The keyword arguments passed to the method with each key.
+        """
+        run_tasks(self, method_name, keys, executor=self.executor, max_workers=self.max_workers,
+                  batch_size=self.batch_size, method_kwargs=method_kwargs, max_in_flight=self.max_in_flight)
+        self.print_storage_stats()
+
+    def iter_tasks(self, method_name: str, keys: Iterable, **method_kwargs) -> Iterator[tuple]:
+        """
+        Run a parser method on every key, reading the keys lazily with at most max_in_flight tasks running, and
+        yield the results as they complete.
+
+        Parameters:
+            method_name (str): The name of the parser method to run on each key.
+            keys (Iterable): The keys to process.
+            method_kwargs: The keyword arguments passed to the method with each key.
+
+        Returns:
+            results (Iterator[tuple]): The (key, result) tuple of each key, in completion order.
+        """
+        yield from iter_tasks(self, method_name, keys, executor=self.executor, max_workers=self.max_workers,
+                              batch_size=self.batch_size, method_kwargs=method_kwargs,
+                              max_in_flight=self.max_in_flight)
+
+    def reset_worker_state(self) -> None:
+        """
+        Rebuild the state a worker process of the process executor must not share with the parent process: the
+        connections of the storage.
+        """
+        self.storage.reset_connections()
+
+    def print_storage_stats(self) -> None:
+        """
+        Print the statistics of the storage, e.g. the time spent waiting for a connection of the S3 pool.
+        """
+        stats = self.storage.get_stats()
+        if stats:
+            print(f"Storage stats: {stats}")
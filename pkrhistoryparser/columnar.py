@@ -0,0 +1,229 @@
+"""
+This module accumulates parsed hands into column-oriented tables keyed by hand_id (hands, players, postings, actions)
+and writes them as Parquet files when pyarrow is installed, or as NumPy .npz archives otherwise.
+"""
+import io
+import os
+import threading
+import uuid
+from collections.abc import Callable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa, pq = None, None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TABLES_COLUMNS = {
+    "hands": {
+        "hand_id": "str", "tournament_id": "str", "tournament_name": "str", "table_number": "str",
+        "buy_in": "float", "datetime": "str", "game_type": "str", "level": "int", "ante": "float", "sb": "float",
+        "bb": "float", "max_players": "int", "button_seat": "int", "hero": "str", "hero_first_card": "str",
+        "hero_second_card": "str", "flop_card_1": "str", "flop_card_2": "str", "flop_card_3": "str",
+        "turn_card": "str", "river_card": "str"
+    },
+    "players": {
+        "hand_id": "str", "seat": "int", "name": "str", "init_stack": "float", "bounty": "float",
+        "entered_hand": "bool", "shown_first_card": "str", "shown_second_card": "str", "amount_won": "float",
+        "pot_type": "str"
+    },
+    "postings": {"hand_id": "str", "name": "str", "blind_type": "str", "amount": "float"},
+    "actions": {
+        "hand_id": "str", "street": "str", "action_index": "int", "player": "str", "action": "str",
+        "amount": "float", "raise_total": "float", "is_all_in": "bool"
+    }
+}
+NUMPY_DTYPES = {"str": "str", "int": "int64", "float": "float64", "bool": "bool"}
+
+
+def get_columnar_format() -> str:
+    """
+    Get the format used to write the columnar outputs, depending on the installed libraries.
+
+    Returns:
+        columnar_format (str): Either "parquet" or "npz".
+    """
+    if pq is not None:
+        return "parquet"
+    if np is not None:
+        return "npz"
+    raise ImportError("pyarrow or numpy is required to write columnar outputs")
+
+
+def get_arrow_schema(table_name: str):
+    """
+    Get the Arrow schema of a table.
+
+    Parameters:
+        table_name (str): The name of the table (hands, players, postings or actions).
+
+    Returns:
+        schema (pyarrow.Schema): The schema of the table.
+    """
+    arrow_types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+    columns = TABLES_COLUMNS[table_name]
+    return pa.schema([(column, arrow_types[column_type]) for column, column_type in columns.items()])
+
+
+def load_npz_tables(npz_file) -> dict:
+    """
+    Load the tables of a columnar .npz archive.
+
+    Parameters:
+        npz_file: The path or file object of the archive.
+
+    Returns:
+        tables (dict): The columns of each table, as NumPy arrays.
+    """
+    tables = {table_name: {} for table_name in TABLES_COLUMNS}
+    with np.load(npz_file) as archive:
+        for key in archive.files:
+            table_name, column = key.split(".", 1)
+            tables[table_name][column] = archive[key]
+    return tables
+
+
+class ColumnarHandSink:
+    """
+    Accumulate parsed hands into columns and write them in parts bounded by a number of hands.
+
+    Parameters:
+        save_file (Callable[[str, bytes], None]): The function atomically writing a file content to its key.
+        columns_dir (str): The directory where the parts are written.
+        max_records (int): The maximum number of hands in a part.
+    """
+
+    def __init__(self, save_file: Callable[[str, bytes], None], columns_dir: str, max_records: int = 50000):
+        self.save_file = save_file
+        self.columns_dir = columns_dir
+        self.max_records = max_records
+        self.columnar_format = get_columnar_format()
+        self.reset()
+
+    def __getstate__(self) -> dict:
+        return {key: self.__dict__[key] for key in ("save_file", "columns_dir", "max_records", "columnar_format")}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Start a new writing session, with its own id and empty tables. The id holds the process id, so that the
+        workers of a process pool never write to the same keys.
+        """
+        self.writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.lock = threading.Lock()
+        self.nb_parts = 0
+        self.clear_tables()
+
+    def clear_tables(self) -> None:
+        self.tables = {
+            table_name: {column: [] for column in columns} for table_name, columns in TABLES_COLUMNS.items()
+        }
+        self.nb_records = 0
+
+    @staticmethod
+    def get_rows(hand_info: dict) -> dict:
+        """
+        Flatten a parsed hand into the rows of each table.
+
+        Parameters:
+            hand_info (dict): The parsed hand, as returned by parse_hand.
+
+        Returns:
+            rows (dict): The list of rows of each table (hands, players, postings, actions).
+        """
+        hand_id = hand_info["hand_id"]
+        tournament_info, level = hand_info["tournament_info"], hand_info["level"]
+        hero_hand, flop = hand_info["hero_hand"], hand_info["flop"]
+        hand_row = {
+            "hand_id": hand_id, "tournament_id": tournament_info["tournament_id"],
+            "tournament_name": tournament_info["tournament_name"], "table_number": tournament_info["table_number"],
+            "buy_in": hand_info["buy_in"], "datetime": hand_info["datetime"], "game_type": hand_info["game_type"],
+            "level": level["value"], "ante": level["ante"], "sb": level["sb"], "bb": level["bb"],
+            "max_players": hand_info["max_players"], "button_seat": hand_info["button_seat"],
+            "hero": hero_hand["hero"], "hero_first_card": hero_hand["first_card"],
+            "hero_second_card": hero_hand["second_card"], "flop_card_1": flop["flop_card_1"],
+            "flop_card_2": flop["flop_card_2"], "flop_card_3": flop["flop_card_3"],
+            "turn_card": hand_info["turn"]["turn_card"], "river_card": hand_info["river"]["river_card"]
+        }
+        player_rows = []
+        for player in hand_info["players"].values():
+            shown_cards = hand_info["showdown"].get(player["name"], {})
+            winnings = hand_info["winners"].get(player["name"], {})
+            player_rows.append({
+                "hand_id": hand_id, "seat": player["seat"], "name": player["name"],
+                "init_stack": player["init_stack"], "bounty": player["bounty"],
+                "entered_hand": player.get("entered_hand", False),
+                "shown_first_card": shown_cards.get("first_card"), "shown_second_card": shown_cards.get("second_card"),
+                "amount_won": winnings.get("amount", 0.0), "pot_type": winnings.get("pot_type")
+            })
+        posting_rows = [{"hand_id": hand_id, **posting} for posting in hand_info["postings"]]
+        action_rows = [
+            {"hand_id": hand_id, "street": street, "action_index": action_index, **action}
+            for street, actions in hand_info["actions"].items()
+            for action_index, action in enumerate(actions)
+        ]
+        return {"hands": [hand_row], "players": player_rows, "postings": posting_rows, "actions": action_rows}
+
+    def add(self, hand_info: dict, record_id: str = None, group: str = None) -> None:
+        """
+        Add a parsed hand to the tables and write them as a part once max_records hands are held.
+
+        Parameters:
+            hand_info (dict): The parsed hand.
+            record_id (str): Unused, the hand id is read from the hand itself.
+            group (str): Unused, all the hands go to the same tables.
+        """
+        rows = self.get_rows(hand_info)
+        with self.lock:
+            for table_name, table_rows in rows.items():
+                table = self.tables[table_name]
+                for row in table_rows:
+                    for column, values in table.items():
+                        values.append(row[column])
+            self.nb_records += 1
+            part = self.pop_part() if self.nb_records >= self.max_records else None
+        if part:
+            self.write_part(*part)
+
+    def pop_part(self) -> tuple:
+        tables, part_index = self.tables, self.nb_parts
+        self.nb_parts += 1
+        self.clear_tables()
+        return tables, part_index
+
+    def write_part(self, tables: dict, part_index: int) -> None:
+        part_name = f"{self.writer_id}-{part_index:05d}"
+        if self.columnar_format == "parquet":
+            for table_name, columns in tables.items():
+                buffer = io.BytesIO()
+                pq.write_table(pa.table(columns, schema=get_arrow_schema(table_name)), buffer)
+                self.save_file(os.path.join(self.columns_dir, table_name, f"{part_name}.parquet"), buffer.getvalue())
+        else:
+            arrays = {
+                f"{table_name}.{column}": np.array(
+                    ["" if value is None else value for value in values] if column_type == "str" else values,
+                    dtype=NUMPY_DTYPES[column_type])
+                for table_name, columns in tables.items()
+                for (column, values), column_type in zip(columns.items(), TABLES_COLUMNS[table_name].values())
+            }
+            buffer = io.BytesIO()
+            np.savez(buffer, **arrays)
+            self.save_file(os.path.join(self.columns_dir, f"{part_name}.npz"), buffer.getvalue())
+
+    def close(self) -> None:
+        """
+        Write the hands still held as a last part and start a new session.
+        """
+        with self.lock:
+            part = self.pop_part() if self.nb_records else None
+        if part:
+            self.write_part(*part)
+        self.reset()
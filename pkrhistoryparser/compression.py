@@ -0,0 +1,156 @@
+"""
+This module compresses and decompresses the contents of the storage backends with gzip or, when the zstandard library
+is installed, zstd. A compressed file is recognised by the extension of its key (.gz or .zst), so that the parsed
+outputs can be written compressed and the compressed raw inputs read as if they were plain text.
+"""
+import gzip
+import io
+import os
+from collections.abc import Iterable, Iterator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+# Compression of the parsed files (gzip or zstd), uncompressed when not set
+OUTPUT_COMPRESSION = os.environ.get("POKER_OUTPUT_COMPRESSION") or None
+
+
+def check_compression(compression: str | None) -> str | None:
+    """
+    Check that the compression is supported and that its library is installed.
+
+    Parameters:
+        compression (str | None): The compression (gzip or zstd), None for uncompressed files.
+
+    Returns:
+        compression (str | None): The checked compression.
+    """
+    if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstandard is required to compress files with zstd")
+    return compression
+
+
+def get_extension(compression: str | None) -> str:
+    return COMPRESSION_EXTENSIONS.get(compression, "")
+
+
+def get_compression(key: str) -> str | None:
+    """
+    Get the compression of a file from the extension of its key.
+
+    Parameters:
+        key (str): The key of the file.
+
+    Returns:
+        compression (str | None): The compression (gzip or zstd), None for an uncompressed file.
+    """
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if key.endswith(extension):
+            return compression
+    return None
+
+
+def strip_extension(key: str) -> str:
+    return key.removesuffix(get_extension(get_compression(key)))
+
+
+def iter_unique_stems(keys: Iterable[str]) -> Iterator[str]:
+    """
+    Skip the keys of the files already listed under another compression (e.g. x.txt.gz after x.txt), which would be
+    parsed into the same key. The keys must be listed in sorted order within each directory, as by list_prefix: the
+    keys sharing a stem then come after the stem itself and the keys starting with it, so only the stems of the keys
+    which the current key starts with are kept.
+
+    Parameters:
+        keys (Iterable[str]): The keys, in sorted order within each directory.
+
+    Returns:
+        keys (Iterator[str]): The first listed key of each stem, the uncompressed one when it exists.
+    """
+    stems = []
+    for key in keys:
+        while stems and not key.startswith(stems[-1]):
+            stems.pop()
+        stem = strip_extension(key)
+        if stem in stems:
+            continue
+        stems.append(stem)
+        yield key
+
+
+def get_suffixes(suffix: str) -> tuple:
+    """
+    Get the suffixes of the keys of a type of file, compressed or not.
+
+    Parameters:
+        suffix (str): The suffix of the uncompressed files (e.g. .txt).
+
+    Returns:
+        suffixes (tuple): The suffix followed by each compression extension, and the suffix alone.
+    """
+    return tuple(suffix + extension for extension in COMPRESSION_EXTENSIONS.values()) + (suffix,)
+
+
+def compress(content: str | bytes, compression: str | None) -> str | bytes:
+    """
+    Compress a content. The gzip output does not hold a timestamp, so that the same content is always compressed the
+    same way.
+
+    Parameters:
+        content (str | bytes): The content, encoded in UTF-8 if it is a string.
+        compression (str | None): The compression (gzip or zstd), the content is returned as is if None.
+
+    Returns:
+        content (str | bytes): The compressed content.
+    """
+    if compression is None:
+        return content
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def decompress(content: bytes, compression: str | None) -> bytes:
+    """
+    Decompress a content.
+
+    Parameters:
+        content (bytes): The compressed content.
+        compression (str | None): The compression (gzip or zstd), the content is returned as is if None.
+
+    Returns:
+        content (bytes): The decompressed content.
+    """
+    if compression is None:
+        return content
+    if compression == "gzip":
+        return gzip.decompress(content)
+    check_compression(compression)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+
+
+def open_text_stream(file, compression: str | None, newline: str | None = None) -> io.TextIOWrapper:
+    """
+    Read a binary file object (a local file or the body of an S3 object) as text, decompressed chunk by chunk, so that
+    its lines can be iterated without holding the whole content in memory.
+
+    Parameters:
+        file: The binary file object, read with file.read(size).
+        compression (str | None): The compression (gzip or zstd), the file is read as is if None.
+        newline (str | None): The newline mode of the text stream, as in open.
+
+    Returns:
+        text_stream (io.TextIOWrapper): The text stream, decoded from UTF-8.
+    """
+    if compression == "gzip":
+        file = gzip.GzipFile(fileobj=file, mode="rb")
+    elif compression is not None:
+        check_compression(compression)
+        file = zstandard.ZstdDecompressor().stream_reader(file)
+    return io.TextIOWrapper(file, encoding="utf-8", newline=newline)
@@ -0,0 +1,75 @@
+"""
+This module reads the UTC dates of the hand histories and summaries, written YYYY/MM/DD HH:MM:SS. Their layout is
+fixed, so they are converted by slicing instead of a strptime and strftime round trip. The date part is only checked
+and converted once, since all the hands of a tournament (and most of the tournaments of a day) share it. The time part
+is checked by hand, as strptime would.
+"""
+from datetime import date
+from functools import lru_cache
+
+DATES_CACHE_SIZE = 1024
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=DATES_CACHE_SIZE)
+def parse_date(date_text: str) -> tuple:
+    """
+    Check and convert the date part of a datetime
+
+    Parameters:
+        date_text (str): The date, written YYYY/MM/DD
+
+    Returns:
+        (tuple): The date written DD-MM-YYYY and the timestamp of its midnight UTC
+
+    """
+    day = date(int(date_text[:4]), int(date_text[5:7]), int(date_text[8:10]))
+    return f"{date_text[8:10]}-{date_text[5:7]}-{date_text[:4]}", (day.toordinal() - EPOCH_ORDINAL) * 86400
+
+
+def parse_time(datetime_text: str) -> int:
+    """
+    Check and convert the time part of a datetime
+
+    Parameters:
+        datetime_text (str): The datetime, written YYYY/MM/DD HH:MM:SS
+
+    Returns:
+        (int): The number of seconds since midnight
+
+    """
+    hours, minutes, seconds = datetime_text[11:13], datetime_text[14:16], datetime_text[17:19]
+    digits = hours + minutes + seconds
+    if (datetime_text[10:11] != " " or datetime_text[13:14] != ":" or datetime_text[16:17] != ":" or len(digits) != 6
+            or not digits.isdigit() or not digits.isascii() or hours > "23" or minutes > "59" or seconds > "61"):
+        raise ValueError(f"time data {datetime_text!r} does not match format '%Y/%m/%d %H:%M:%S'")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def format_datetime(datetime_text: str) -> str:
+    """
+    Rewrite a datetime in the format of the parsed hands, as strftime("%d-%m-%Y %H:%M:%S") would
+
+    Parameters:
+        datetime_text (str): The datetime, written YYYY/MM/DD HH:MM:SS
+
+    Returns:
+        (str): The datetime written DD-MM-YYYY HH:MM:SS
+
+    """
+    parse_time(datetime_text)
+    return parse_date(datetime_text[:10])[0] + datetime_text[10:19]
+
+
+def to_timestamp(datetime_text: str) -> int:
+    """
+    Convert a UTC datetime into the number of seconds since the epoch, to sort hands and tournaments
+
+    Parameters:
+        datetime_text (str): The datetime, written YYYY/MM/DD HH:MM:SS
+
+    Returns:
+        (int): The timestamp of the datetime
+
+    """
+    return parse_date(datetime_text[:10])[1] + parse_time(datetime_text)
@@ -0,0 +1,195 @@
+"""
+This module runs a parser method over keys with a selectable execution strategy:
+    - thread: one task per key in a thread pool, for I/O-bound work such as the cloud parsers.
+    - process: batches of keys sent to a process pool, each worker holding its own copy of the parser, whose outputs
+      are closed when the worker exits.
+    - inline: keys parsed one after the other in the current thread.
+Keys are consumed lazily and only a bounded number of tasks are in flight at once, so that the memory used does not
+depend on the number of keys.
+"""
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from functools import partial
+from itertools import islice
+from multiprocessing.util import Finalize
+
+EXECUTORS = ("thread", "process", "inline")
+
+worker_parser = None
+
+
+def check_executor(executor: str) -> str:
+    """
+    Check that the execution strategy is supported.
+
+    Parameters:
+        executor (str): The execution strategy (thread, process or inline).
+
+    Returns:
+        executor (str): The checked execution strategy.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    return executor
+
+
+def init_worker(parser) -> None:
+    """
+    Store in a worker process the parser it will use for all its batches, after rebuilding its per-process state, and
+    close its outputs once, when the pool shuts the worker down.
+    The workers are forked on Linux, where the parser is not unpickled but copied with the connections of the parent
+    process, still used by the parent while it lists the keys, and with its output writer.
+
+    Parameters:
+        parser: The parser copied in the worker process.
+    """
+    global worker_parser
+    if hasattr(parser, "reset_worker_state"):
+        parser.reset_worker_state()
+    worker_parser = parser
+    Finalize(None, close_output, args=(parser,), exitpriority=10)
+
+
+def close_output(parser) -> None:
+    """
+    Write what the parser may still buffer (e.g. open shards) once its tasks are done.
+
+    Parameters:
+        parser: The parser that ran the tasks.
+    """
+    if hasattr(parser, "close_output"):
+        parser.close_output()
+
+
+def run_keys(method: Callable, keys: list, method_kwargs: dict = None) -> list:
+    """
+    Run a method on a batch of keys.
+
+    Parameters:
+        method (Callable): The parser method to run on each key.
+        keys (list): The keys of the batch.
+        method_kwargs (dict): The keyword arguments passed to the method with each key.
+
+    Returns:
+        results (list): The (key, result) tuple of each key.
+    """
+    return [(key, method(key, **(method_kwargs or {}))) for key in keys]
+
+
+def run_batch(method_name: str, keys: list, method_kwargs: dict = None) -> list:
+    """
+    Run a method of the worker parser on a batch of keys.
+
+    Parameters:
+        method_name (str): The name of the parser method to run on each key.
+        keys (list): The keys of the batch.
+        method_kwargs (dict): The keyword arguments passed to the method with each key.
+
+    Returns:
+        results (list): The (key, result) tuple of each key.
+    """
+    return run_keys(getattr(worker_parser, method_name), keys, method_kwargs)
+
+
+def iter_batches(keys: Iterable, batch_size: int) -> Iterator[list]:
+    """
+    Group the keys in batches, only reading the keys of the next batch.
+
+    Parameters:
+        keys (Iterable): The keys to group.
+        batch_size (int): The number of keys in a batch.
+
+    Returns:
+        batches (Iterator[list]): The batches of keys.
+    """
+    keys_iterator = iter(keys)
+    while batch := list(islice(keys_iterator, batch_size)):
+        yield batch
+
+
+def get_nb_workers(executor: str, max_workers: int = None) -> int:
+    """
+    Get the number of workers of an execution strategy, with the defaults of the concurrent.futures executors.
+
+    Parameters:
+        executor (str): The execution strategy (thread, process or inline).
+        max_workers (int): The maximum number of threads or processes.
+
+    Returns:
+        nb_workers (int): The number of workers.
+    """
+    if executor == "inline":
+        return 1
+    if max_workers:
+        return max_workers
+    nb_cpus = os.cpu_count() or 1
+    return nb_cpus if executor == "process" else min(32, nb_cpus + 4)
+
+
+def iter_tasks(parser, method_name: str, keys: Iterable, executor: str = "thread", max_workers: int = None,
+               batch_size: int = 100, method_kwargs: dict = None, max_in_flight: int = None) -> Iterator[tuple]:
+    """
+    Run a method of a parser on every key with the given execution strategy and yield the results as they complete.
+    The keys are read lazily and a new task is only submitted when one of the max_in_flight running tasks is done.
+
+    Parameters:
+        parser: The parser holding the method.
+        method_name (str): The name of the parser method to run on each key.
+        keys (Iterable): The keys to process, e.g. a generator of listed keys.
+        executor (str): The execution strategy (thread, process or inline).
+        max_workers (int): The maximum number of threads or processes.
+        batch_size (int): The number of keys sent at once to a worker process.
+        method_kwargs (dict): The keyword arguments passed to the method with each key.
+        max_in_flight (int): The maximum number of tasks submitted and not done yet, twice the number of workers by
+        default.
+
+    Returns:
+        results (Iterator[tuple]): The (key, result) tuple of each key, in completion order.
+    """
+    check_executor(executor)
+    method_kwargs = method_kwargs or {}
+    if executor == "inline":
+        method = getattr(parser, method_name)
+        for key in keys:
+            yield key, method(key, **method_kwargs)
+        return
+    nb_workers = get_nb_workers(executor, max_workers)
+    max_in_flight = max_in_flight or 2 * nb_workers
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=nb_workers, initializer=init_worker, initargs=(parser,))
+        task, task_size = partial(run_batch, method_name), batch_size
+    else:
+        pool = ThreadPoolExecutor(max_workers=nb_workers)
+        task, task_size = partial(run_keys, getattr(parser, method_name)), 1
+    with pool:
+        in_flight = set()
+        for batch in iter_batches(keys, task_size):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            in_flight.add(pool.submit(task, batch, method_kwargs))
+        for future in as_completed(in_flight):
+            yield from future.result()
+
+
+def run_tasks(parser, method_name: str, keys: Iterable, executor: str = "thread", max_workers: int = None,
+              batch_size: int = 100, method_kwargs: dict = None, max_in_flight: int = None) -> None:
+    """
+    Run a method of a parser on every key with the given execution strategy, then close the outputs of the parser.
+
+    Parameters:
+        parser: The parser holding the method.
+        method_name (str): The name of the parser method to run on each key.
+        keys (Iterable): The keys to process.
+        executor (str): The execution strategy (thread, process or inline).
+        max_workers (int): The maximum number of threads or processes.
+        batch_size (int): The number of keys sent at once to a worker process.
+        method_kwargs (dict): The keyword arguments passed to the method with each key.
+        max_in_flight (int): The maximum number of tasks submitted and not done yet.
+    """
+    for _ in iter_tasks(parser, method_name, keys, executor=executor, max_workers=max_workers,
+                        batch_size=batch_size, method_kwargs=method_kwargs, max_in_flight=max_in_flight):
+        pass
+    close_output(parser)
@@ -1,56 +1,102 @@
-import re
-from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from json import dumps
-from pkrhistoryparser.patterns import winamax as patterns
+from itertools import chain
+from pkrhistoryparser.amounts import to_float
+from pkrhistoryparser.base import AbstractParser
+from pkrhistoryparser.columnar import ColumnarHandSink
+from pkrhistoryparser.compression import get_extension, get_suffixes, iter_unique_stems, strip_extension
+from pkrhistoryparser.dates import format_datetime, to_timestamp
+from pkrhistoryparser.models import Hand, LazyHand, STREETS
+from pkrhistoryparser.patterns import registry as patterns
+from pkrhistoryparser.pipeline import run_pipeline
+from pkrhistoryparser.serializers import to_json
+from pkrhistoryparser.shards import JsonLinesShardWriter
 
 
-class AbstractHandHistoryParser(ABC):
+class AbstractHandHistoryParser(AbstractParser):
 
     data_dir: str
+    raw_dir: str
     split_dir: str
     parsed_dir: str
+    shards_dir: str
+    columns_dir: str
     correction_split_keys_file_key: str
     correction_parsed_keys_file_key: str
+    with_timestamp: bool = False
+    output: str = "json"
+    output_writer: JsonLinesShardWriter | ColumnarHandSink = None
+
+    @staticmethod
+    def check_fields(fields: list) -> tuple:
+        """
+        Check that the projected fields are keys of the parsed hand and put them in the order of parse_hand.
+
+        Parameters:
+            fields (list): The keys of the parsed hand to extract.
+
+        Returns:
+            fields (tuple): The checked fields, in the order of parse_hand.
+        """
+        all_fields = LazyHand.FIELDS + LazyHand.OPTIONAL_FIELDS
+        unknown_fields = set(fields) - set(all_fields)
+        if unknown_fields:
+            raise ValueError(f"Unknown hand fields: {sorted(unknown_fields)}")
+        return tuple(field for field in all_fields if field in fields)
+
+    def set_output(self, output: str) -> None:
+        """
+        Set the output mode of the parsed hands.
+
+        Parameters:
+            output (str): The output mode, either "json" (one indented JSON file per hand), "jsonl" (compact JSON
+            lines written in bounded shards, one set of shards per tournament) or "columnar" (hands, players, postings
+            and actions tables written as Parquet or .npz files).
+        """
+        output_writers = {
+            "json": lambda: None,
+            "jsonl": lambda: JsonLinesShardWriter(self.save_shard, self.shards_dir),
+            "columnar": lambda: ColumnarHandSink(self.save_shard, self.columns_dir)
+        }
+        if output not in output_writers:
+            raise ValueError(f"Unknown output mode: {output}")
+        self.output = output
+        self.output_writer = output_writers[output]()
+
+    def iter_split_histories_keys(self, directory_key: str = None) -> Iterator[str]:
+        return iter_unique_stems(self.storage.list_prefix(directory_key or self.split_dir, get_suffixes(".txt")))
 
-    @abstractmethod
     def list_split_histories_keys(self, directory_key: str = None) -> list:
-        pass
+        return list(self.iter_split_histories_keys(directory_key))
+
+    def list_parsed_histories_keys(self) -> list:
+        return list(self.storage.list_prefix(self.parsed_dir, ".json" + get_extension(self.compression)))
 
-    @abstractmethod
     def get_text(self, file_key: str) -> str:
-        pass
+        return self.storage.get_text(file_key)
+
+    def iter_lines(self, file_key: str) -> Iterator[str]:
+        return self.storage.iter_lines(file_key)
 
-    @abstractmethod
     def write_text(self, key: str, content: str) -> None:
-        pass
+        self.storage.put(key, content)
 
-    @abstractmethod
     def write_text_from_list(self, key: str, content: list) -> None:
-        pass
+        self.storage.put(key, "\n".join(content))
 
-    @staticmethod
-    def get_parsed_key(split_key: str) -> str:
-        destination_key = split_key.replace("split", "parsed").replace(".txt", ".json")
-        return destination_key
+    def get_parsed_key(self, split_key: str, fields: tuple = None) -> str:
+        destination_dir = f"projections/{'-'.join(fields)}" if fields else "parsed"
+        destination_key = strip_extension(split_key).replace("split", destination_dir).replace(".txt", ".json")
+        return destination_key + get_extension(self.compression)
 
     @staticmethod
-    def to_float(txt_num: str) -> float:
-        """
-        Transforms any written str number into a float
-
-        Parameters:
-            txt_num(str): The number to transform
-
-        Returns:
-            (float): The float number
+    def get_split_key(raw_key: str, hand_id: str) -> str:
+        raw_root = os.path.splitext(strip_extension(raw_key).replace("raw", "split"))[0]
+        split_key = os.path.join(raw_root, f"{hand_id}.txt")
+        return split_key
 
-        """
-        try:
-            return float(txt_num.replace(",", ".").replace("k", "e3").replace("M", "e6"))
-        except (TypeError, AttributeError, ValueError):
-            return 0.0
+    to_float = staticmethod(to_float)
 
     @staticmethod
     def extract_game_type(hand_txt: str) -> dict:
@@ -77,8 +123,8 @@ class AbstractHandHistoryParser(ABC):
             from the poker hand history(prize_pool_contribution, bounty, rake).
 
         """
-        buy_in_match = re.search(pattern=patterns.NORMAL_BUY_IN_PATTERN, string=hand_txt)
-        free_roll_match = re.search(pattern=patterns.FREE_ROLL_PATTERN, string=hand_txt)
+        buy_in_match = patterns.NORMAL_BUY_IN_PATTERN.search(hand_txt)
+        free_roll_match = patterns.FREE_ROLL_PATTERN.search(hand_txt)
         if buy_in_match:
             prize_pool_contribution, rake = self.to_float(buy_in_match.group(1)), self.to_float(buy_in_match.group(2))
             bounty = 0
@@ -99,7 +145,7 @@ class AbstractHandHistoryParser(ABC):
             players_info (dict): A dictionary containing player information(seat, name, init_stack, bounty).
 
         """
-        matches = re.findall(pattern=patterns.PLAYER_PATTERN, string=hand_txt)
+        matches = patterns.PLAYER_PATTERN.findall(hand_txt)
         players_info = {int(seat): {
             "seat": int(seat),
             "name": name,
@@ -120,7 +166,7 @@ class AbstractHandHistoryParser(ABC):
             blind_type).
 
         """
-        matches = re.findall(pattern=patterns.BLINDS_PATTERN, string=hand_txt)
+        matches = patterns.BLINDS_PATTERN.findall(hand_txt)
         blinds_antes_info = [{"name": name.strip(), "amount": self.to_float(amount), "blind_type": blind_type} for
                              name, blind_type, amount in matches]
 
@@ -138,10 +184,23 @@ class AbstractHandHistoryParser(ABC):
             datetime (str): A dictionary containing the datetime extracted from the poker hand history (datetime) in
             str format.
         """
-        datetime_match = re.search(pattern=patterns.DATETIME_PATTERN, string=hand_txt)
-        dt = datetime.strptime(datetime_match.group(1), "%Y/%m/%d %H:%M:%S")
-        dt_str = dt.strftime("%d-%m-%Y %H:%M:%S")
-        return {"datetime": dt_str}
+        datetime_match = patterns.DATETIME_PATTERN.search(hand_txt)
+        return {"datetime": format_datetime(datetime_match.group(1))}
+
+    @staticmethod
+    def extract_timestamp(hand_txt: str) -> dict:
+        """
+        Extract the datetime of the hand as a timestamp, to sort the hands.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+
+        Returns:
+            timestamp (dict): A dictionary containing the number of seconds between the epoch and the UTC datetime of
+            the hand (timestamp).
+        """
+        datetime_match = patterns.DATETIME_PATTERN.search(hand_txt)
+        return {"timestamp": to_timestamp(datetime_match.group(1))}
 
     def extract_blinds(self, hand_txt: str) -> dict:
         """
@@ -154,8 +213,8 @@ class AbstractHandHistoryParser(ABC):
             blinds (dict): A dictionary containing the blind levels and ante extracted from the poker hand history
             (ante, sb, bb).
         """
-        tour_blinds_match = re.search(pattern=patterns.TOURNAMENT_BLINDS_PATTERN, string=hand_txt)
-        other_blinds_match = re.search(pattern=patterns.OTHER_BLINDS_PATTERN, string=hand_txt)
+        tour_blinds_match = patterns.TOURNAMENT_BLINDS_PATTERN.search(hand_txt)
+        other_blinds_match = patterns.OTHER_BLINDS_PATTERN.search(hand_txt)
         if tour_blinds_match:
             ante, sb, bb = tour_blinds_match.group(1), tour_blinds_match.group(2), tour_blinds_match.group(3)
         elif other_blinds_match:
@@ -177,7 +236,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             level (dict): A dictionary containing the level extracted from the poker hand history (level).
         """
-        level_match = re.search(pattern=patterns.LEVEL_PATTERN, string=hand_txt)
+        level_match = patterns.LEVEL_PATTERN.search(hand_txt)
         return {"level": int(level_match.group(1)) if level_match else 0}
 
     @staticmethod
@@ -192,7 +251,7 @@ class AbstractHandHistoryParser(ABC):
             max_players (dict): A dictionary containing the max players extracted from the poker hand history
             (max_players).
         """
-        max_players = re.search(pattern=patterns.MAX_PLAYERS_PATTERN, string=hand_txt).group(1)
+        max_players = patterns.MAX_PLAYERS_PATTERN.search(hand_txt).group(1)
         return {"max_players": int(max_players)}
 
     @staticmethod
@@ -206,7 +265,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             button_seat (dict): A dictionary containing the button seat extracted from the poker hand history (button).
         """
-        button = re.search(pattern=patterns.BUTTON_SEAT_PATTERN, string=hand_txt).group(1)
+        button = patterns.BUTTON_SEAT_PATTERN.search(hand_txt).group(1)
         return {"button": int(button)}
 
     @staticmethod
@@ -221,7 +280,7 @@ class AbstractHandHistoryParser(ABC):
             tournament_info (dict): A dictionary containing the tournament information extracted from the poker hand
             history (tournament_name, tournament_id, table_ident).
         """
-        tournament_info = re.search(pattern=patterns.TOURNAMENT_INFO_PATTERN, string=hand_txt)
+        tournament_info = patterns.TOURNAMENT_INFO_PATTERN.search(hand_txt)
         tournament_name = tournament_info.group(1)
         tournament_id = tournament_info.group(2)
         table_number = tournament_info.group(3)
@@ -241,8 +300,7 @@ class AbstractHandHistoryParser(ABC):
             (hero, first_card, second_card).
         """
         try:
-            hero, card1, card2 = re.search(
-                pattern=patterns.HERO_HAND_PATTERN, string=hand_txt, flags=re.UNICODE).groups()
+            hero, card1, card2 = patterns.HERO_HAND_PATTERN.search(hand_txt).groups()
             return {"hero": hero, "first_card": card1, "second_card": card2}
         except AttributeError:
             return {"hero": "manggy94", "first_card": None, "second_card": None}
@@ -258,7 +316,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             flop_cards (dict): A dictionary representing the cards on the Flop (flop_card_1, flop_card_2, flop_card_3).
         """
-        flop_match = re.search(pattern=patterns.FLOP_PATTERN, string=hand_txt, flags=re.UNICODE)
+        flop_match = patterns.FLOP_PATTERN.search(hand_txt)
         card1, card2, card3 = flop_match.groups() if flop_match else (None, None, None)
         return {"flop_card_1": card1, "flop_card_2": card2, "flop_card_3": card3}
 
@@ -273,7 +331,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             turn_card (dict): A dictionary representing the card on the Turn (turn_card).
         """
-        turn_match = re.search(pattern=patterns.TURN_PATTERN, string=hand_txt, flags=re.UNICODE)
+        turn_match = patterns.TURN_PATTERN.search(hand_txt)
         card = turn_match.group(1) if turn_match else None
         return {"turn_card": card}
 
@@ -288,7 +346,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             river_card (dict): A dictionary representing the card on the River (river_card).
         """
-        river_match = re.search(pattern=patterns.RIVER_PATTERN, string=hand_txt, flags=re.UNICODE)
+        river_match = patterns.RIVER_PATTERN.search(hand_txt)
         card = river_match.group(1) if river_match else None
         return {"river_card": card}
 
@@ -303,7 +361,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             parsed_actions (list): A list of dictionaries (player, action, amount), each representing an action.
         """
-        actions = re.findall(pattern=patterns.ACTION_PATTERN, string=actions_txt)
+        actions = patterns.ACTION_PATTERN.findall(actions_txt)
         parsed_actions = [
             {
                 'player': player.strip(),
@@ -326,12 +384,23 @@ class AbstractHandHistoryParser(ABC):
             actions_dict (dict): A dictionary containing all the actions extracted for each street
             of the poker hand history (preflop, flop, turn, river).
         """
-        actions_dict = {
-            street: self.parse_actions(re.search(pattern, string=hand_txt, flags=re.DOTALL).group(1))
-            if re.search(pattern, string=hand_txt, flags=re.DOTALL) else []
-            for pattern, street in zip(patterns.STREET_ACTION_PATTERNS, ['preflop', 'flop', 'turn', 'river'])}
+        actions_dict = {street: self.extract_street_actions(hand_txt, street) for street in STREETS}
         return actions_dict
 
+    def extract_street_actions(self, hand_txt: str, street: str) -> list:
+        """
+        Extract the actions of a single street from a poker hand history.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+            street (str): The street (preflop, flop, turn or river).
+
+        Returns:
+            actions (list): A list of dictionaries, each representing an action of the street.
+        """
+        street_match = patterns.STREET_ACTION_PATTERNS[STREETS.index(street)].search(hand_txt)
+        return self.parse_actions(street_match.group(1)) if street_match else []
+
     @staticmethod
     def extract_showdown(hand_txt: str) -> dict:
         """
@@ -345,7 +414,7 @@ class AbstractHandHistoryParser(ABC):
             from the poker hand history(first_card, second_card).
         """
         showdown_info = {player.strip(): {"first_card": card1, "second_card": card2}
-                         for player, card1, card2 in re.findall(pattern=patterns.SHOWDOWN_PATTERN, string=hand_txt)}
+                         for player, card1, card2 in patterns.SHOWDOWN_PATTERN.findall(hand_txt)}
         return showdown_info
 
     def extract_winners(self, hand_txt: str) -> dict:
@@ -360,7 +429,7 @@ class AbstractHandHistoryParser(ABC):
             from the poker hand history(winner_name(amount, pot_type)).
         """
         winners_info = {winner: {"amount": self.to_float(amount), "pot_type": pot_type}
-                        for winner, amount, pot_type in re.findall(pattern=patterns.WINNERS_PATTERN, string=hand_txt)}
+                        for winner, amount, pot_type in patterns.WINNERS_PATTERN.findall(hand_txt)}
         return winners_info
 
     @staticmethod
@@ -374,7 +443,7 @@ class AbstractHandHistoryParser(ABC):
         Returns:
             hand_id (dict): A dictionary containing the hand id extracted from the poker hand history(hand_id).
         """
-        hand_id = re.search(pattern=patterns.HAND_ID_PATTERN, string=hand_txt).group(1)
+        hand_id = patterns.HAND_ID_PATTERN.search(hand_txt).group(1)
         return {"hand_id": hand_id}
 
     @staticmethod
@@ -392,18 +461,123 @@ class AbstractHandHistoryParser(ABC):
         for player in players.values():
             player["entered_hand"] = player["name"] in verified_players
 
-    def parse_hand(self, hand_txt: str) -> dict:
+    @staticmethod
+    def split_hand_sections(hand_txt: str) -> dict:
+        """
+        Walk a poker hand history once and dispatch each line to the section it belongs to, based on its prefix.
+        A street section ends at the first character its action pattern does not accept, as in the regex engine.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+
+        Returns:
+            sections (dict): A dictionary containing the text of each section of the hand (header, seats, postings,
+            hero, street_headers, streets, showdown, winners).
+        """
+        header_end = hand_txt.find("\nSeat ")
+        seat_lines, posting_lines, showdown_lines, winner_lines = [], [], [], []
+        street_headers, street_lines = {}, {}
+        hero_line = ""
+        current_street = None
+        for line in hand_txt[header_end + 1:].split("\n"):
+            if current_street is not None:
+                stop_match = patterns.STREET_STOP_PATTERN.search(line)
+                street_lines[current_street].append(line[:stop_match.start()] if stop_match else line)
+                if stop_match:
+                    current_street = None
+            if line.startswith("Seat "):
+                seat_lines.append(line)
+            elif line.startswith("***"):
+                street = next((street for header, street in patterns.STREET_HEADERS.items()
+                               if line.startswith(header)), None)
+                if street and street not in street_headers:
+                    street_headers[street] = line
+                    street_lines[street] = []
+                    current_street = street
+            elif line.startswith("Dealt to") and not hero_line:
+                hero_line = line
+            if " posts " in line:
+                posting_lines.append(line)
+            if " collected " in line:
+                winner_lines.append(line)
+            if " shows " in line:
+                showdown_lines.append(line)
+        return {
+            "header": hand_txt[:header_end] if header_end != -1 else hand_txt,
+            "seats": "\n".join(seat_lines),
+            "postings": "\n" + "\n".join(posting_lines),
+            "hero": hero_line,
+            "street_headers": street_headers,
+            "streets": {street: "\n" + "\n".join(lines) for street, lines in street_lines.items()},
+            "showdown": "\n".join(showdown_lines),
+            "winners": "\n" + "\n".join(winner_lines)
+        }
+
+    def scan_hand(self, hand_txt: str) -> dict:
+        """
+        Extract all information from a poker hand history in a single pass over its lines, then run each extractor
+        on its own section instead of on the whole hand text.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+
+        Returns:
+            hand_history_dict (dict): The same dictionary as the one returned by the regex engine.
+        """
+        sections = self.split_hand_sections(hand_txt)
+        header = sections["header"]
+        street_headers = sections["street_headers"]
+        blinds = self.extract_blinds(header)
+        hand_history_dict = {
+            "tournament_info": self.extract_tournament_info(header),
+            "buy_in": self.extract_buy_in(header)["buy_in"],
+            "hand_id": self.extract_hand_id(header)["hand_id"],
+            "datetime": self.extract_datetime(header)["datetime"],
+            "game_type": self.extract_game_type(header)["game_type"],
+            "level": {
+                "value": self.extract_level(header)["level"],
+                "ante": blinds["ante"],
+                "sb": blinds["sb"],
+                "bb": blinds["bb"]
+            },
+            "max_players": self.extract_max_players(header)["max_players"],
+            "button_seat": self.extract_button_seat(header)["button"],
+            "players": self.extract_players(sections["seats"]),
+            "hero_hand": self.extract_hero_hand(sections["hero"]),
+            "postings": self.extract_posting(sections["postings"]),
+            "actions": {
+                street: self.parse_actions(sections["streets"][street]) if street in sections["streets"] else []
+                for street in ['preflop', 'flop', 'turn', 'river']},
+            "flop": self.extract_flop(street_headers.get("flop", "")),
+            "turn": self.extract_turn(street_headers.get("turn", "")),
+            "river": self.extract_river(street_headers.get("river", "")),
+            "showdown": self.extract_showdown(sections["showdown"]),
+            "winners": self.extract_winners(sections["winners"]),
+        }
+        if self.with_timestamp:
+            hand_history_dict["timestamp"] = self.extract_timestamp(header)["timestamp"]
+        self.check_players(hand_history_dict)
+        return hand_history_dict
+
+    def parse_hand(self, hand_txt: str, fields: list = None) -> dict:
         """
         Extract all information from a poker hand history and return as a dictionary.
 
         Parameters:
             hand_txt (str): The raw poker hand text as a string.
+            fields (list): The keys of the dictionary to extract, only running the extractors they need. All the keys
+            are extracted by default, the timestamp only if with_timestamp is set.
 
         Returns:
             hand_history_dict (dict): A dictionary containing all the information extracted from the poker hand history
         (hand_id, datetime, game_type, buy_in, blinds, level, max_players, button_seat, table_name, table_ident,
         players, hero_hand, postings, actions, flop, turn, river, showdown, winners).
         """
+        if fields is not None:
+            hand = self.parse_hand_lazy(hand_txt)
+            return {field: hand[field] for field in self.check_fields(fields)}
+        if self.engine == "scanner":
+            return self.scan_hand(hand_txt)
         hand_history_dict = {
             "tournament_info": self.extract_tournament_info(hand_txt),
             "buy_in": self.extract_buy_in(hand_txt)["buy_in"],
@@ -429,39 +603,242 @@ class AbstractHandHistoryParser(ABC):
             "winners": self.extract_winners(hand_txt),
 
         }
+        if self.with_timestamp:
+            hand_history_dict["timestamp"] = self.extract_timestamp(hand_txt)["timestamp"]
         self.check_players(hand_history_dict)
         return hand_history_dict
 
-    @abstractmethod
+    def parse_hand_model(self, hand_txt: str) -> Hand:
+        """
+        Extract all information from a poker hand history and return it as a compact typed Hand model.
+        The model is built from the outputs of the extractors, without the parse_hand dictionary: the actions of each
+        street are extracted once those of the previous street are converted, so that the dictionaries of the whole
+        hand are never held at once. The scanner engine splits the hand in sections first, as in parse_hand.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+
+        Returns:
+            hand (Hand): The hand model, whose to_dict method gives back the dictionary returned by parse_hand.
+        """
+        if self.engine == "scanner":
+            sections = self.split_hand_sections(hand_txt)
+            street_headers, street_texts = sections["street_headers"], sections["streets"]
+            texts = {**sections, **{street: street_headers.get(street, "") for street in STREETS[1:]}}
+
+            def get_street_actions(street: str) -> list:
+                return self.parse_actions(street_texts[street]) if street in street_texts else []
+        else:
+            texts = dict.fromkeys(("header", "seats", "hero", "postings", *STREETS[1:], "showdown", "winners"),
+                                  hand_txt)
+
+            def get_street_actions(street: str) -> list:
+                return self.extract_street_actions(hand_txt, street)
+        header = texts["header"]
+        blinds = self.extract_blinds(header)
+        players, postings = self.extract_players(texts["seats"]), self.extract_posting(texts["postings"])
+        preflop_actions = get_street_actions("preflop")
+        self.check_players({"players": players, "postings": postings, "actions": {"preflop": preflop_actions}})
+        return Hand.from_sections(
+            tournament_info=self.extract_tournament_info(header),
+            buy_in=self.extract_buy_in(header)["buy_in"],
+            hand_id=self.extract_hand_id(header)["hand_id"],
+            datetime=self.extract_datetime(header)["datetime"],
+            game_type=self.extract_game_type(header)["game_type"],
+            level={"value": self.extract_level(header)["level"], "ante": blinds["ante"], "sb": blinds["sb"],
+                   "bb": blinds["bb"]},
+            max_players=self.extract_max_players(header)["max_players"],
+            button_seat=self.extract_button_seat(header)["button"],
+            players=players,
+            hero_hand=self.extract_hero_hand(texts["hero"]),
+            postings=postings,
+            street_actions=chain([preflop_actions], (get_street_actions(street) for street in STREETS[1:])),
+            flop=self.extract_flop(texts["flop"]),
+            turn=self.extract_turn(texts["turn"]),
+            river=self.extract_river(texts["river"]),
+            showdown=self.extract_showdown(texts["showdown"]),
+            winners=self.extract_winners(texts["winners"]),
+            timestamp=self.extract_timestamp(header)["timestamp"] if self.with_timestamp else None
+        )
+
+    def parse_hand_lazy(self, hand_txt: str) -> LazyHand:
+        """
+        Wrap a poker hand history in a lazy view which only extracts the sections that are accessed.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+
+        Returns:
+            hand (LazyHand): The lazy view of the hand.
+        """
+        return LazyHand(hand_txt, self)
+
     def check_is_parsed(self, split_key: str) -> bool:
-        pass
+        return self.storage.exists(self.get_parsed_key(split_key))
 
-    def parse_to_json(self, split_key: str) -> str:
+    def parse_to_json(self, split_key: str, fields: list = None) -> str:
         """
         Parse a poker hand history to a JSON format.
 
         Parameters:
             split_key (str): The path to the poker hand history file.
+            fields (list): The keys of the parsed hand to extract, all of them by default.
         """
         hand_text = self.get_text(split_key)
-        hand_info = self.parse_hand(hand_text)
-        json_hand = dumps(hand_info, indent=4, ensure_ascii=False)
+        hand_info = self.parse_hand(hand_text, fields=fields)
+        json_hand = to_json(hand_info, self.json_format)
         return json_hand
 
-    @abstractmethod
-    def save_parsed_hand(self, split_key: str, json_hand: str) -> None:
-        pass
+    def save_parsed_hand(self, split_key: str, json_hand: str, fields: tuple = None) -> None:
+        self.storage.put(self.get_parsed_key(split_key, fields), json_hand)
+
+    def save_shard(self, shard_key: str, content: str | bytes) -> None:
+        self.storage.put(shard_key, content)
+
+    def parse_hand_history(self, split_key: str, fields: list = None) -> None:
+        """
+        Parse a poker hand history and save it in JSON format, or add it to the open shard of its tournament in
+        jsonl and columnar output modes.
+        Projected hands are saved in JSON format in a projections directory named after their fields, so that they
+        are never taken for fully parsed hands.
+
+        Parameters:
+            split_key (str): The path to the poker hand history file.
+            fields (list): The keys of the parsed hand to extract, all of them by default.
+        """
+        if fields is not None:
+            fields = self.check_projection(fields)
+            print(f"\nParsing {split_key} to {self.get_parsed_key(split_key, fields)}")
+            self.save_parsed_hand(split_key, self.parse_to_json(split_key, fields=fields), fields=fields)
+        elif self.output_writer is not None:
+            print(f"\nParsing {split_key} to {self.output} output")
+            self.save_hand_info(split_key, self.parse_hand(self.get_text(split_key)))
+        else:
+            print(f"\nParsing {split_key} to {self.get_parsed_key(split_key)}")
+            json_hand = self.parse_to_json(split_key)
+            self.save_parsed_hand(split_key, json_hand)
+
+    def check_projection(self, fields: list) -> tuple:
+        """
+        Check that the projected fields can be saved in the output mode of the parser.
+
+        Parameters:
+            fields (list): The keys of the parsed hands to extract.
+
+        Returns:
+            fields (tuple): The checked fields, in the order of parse_hand.
+        """
+        if self.output_writer is not None:
+            raise ValueError(f"Field projection is not available in {self.output} output mode")
+        return self.check_fields(fields)
+
+    def check_new_hands_output(self) -> None:
+        """
+        Check that the parsed hands can be found by split key in the output mode of the parser. The shards and the
+        columnar parts are not saved by split key, so the new hand histories could not be told apart from the parsed
+        ones and would be parsed (and saved) again.
+        """
+        if self.output_writer is not None:
+            raise ValueError(f"The new hand histories cannot be found in {self.output} output mode")
+
+    def parse_hand_content(self, hand_txt: str, fields: tuple = None) -> dict | str:
+        """
+        Parse a poker hand history into the content saved by save_hand_content: its JSON text in json output mode, or
+        the parsed hand itself for the output writers.
+
+        Parameters:
+            hand_txt (str): The raw poker hand text as a string.
+            fields (tuple): The keys of the parsed hand to extract, all of them by default.
+
+        Returns:
+            content (dict | str): The content to save.
+        """
+        hand_info = self.parse_hand(hand_txt, fields=fields)
+        if self.output_writer is not None:
+            return hand_info
+        return to_json(hand_info, self.json_format)
 
-    def parse_hand_history(self, split_key: str) -> None:
+    def save_hand_content(self, split_key: str, content: dict | str, fields: tuple = None) -> None:
         """
-        Parse a poker hand history and save it in JSON format.
+        Save the content returned by parse_hand_content in the output mode of the parser.
 
         Parameters:
             split_key (str): The path to the poker hand history file.
+            content (dict | str): The content to save.
+            fields (tuple): The keys of the parsed hand, all of them by default.
+        """
+        if self.output_writer is not None:
+            self.save_hand_info(split_key, content)
+        else:
+            self.save_parsed_hand(split_key, content, fields=fields)
+
+    def save_hand_info(self, split_key: str, hand_info: dict) -> None:
+        """
+        Save a parsed hand in the output mode of the parser.
+
+        Parameters:
+            split_key (str): The path to the poker hand history file.
+            hand_info (dict): The parsed hand.
+        """
+        if self.output_writer is not None:
+            self.output_writer.add(hand_info, hand_info["hand_id"], hand_info["tournament_info"]["tournament_id"])
+        else:
+            self.save_parsed_hand(split_key, to_json(hand_info, self.json_format))
+
+    def close_output(self) -> None:
+        """
+        Write the shards or columnar parts still open in jsonl and columnar output modes.
+        """
+        if self.output_writer is not None:
+            self.output_writer.close()
+
+    def iter_hands(self, file_key: str) -> Iterator[str]:
+        """
+        Read a raw multi-hand history file line by line and yield the text of each hand as soon as the header of
+        the next one is seen, so that the whole file is never held in memory.
+
+        Parameters:
+            file_key (str): The path to the raw poker hand history file.
+
+        Returns:
+            hand_texts (Iterator[str]): The raw text of each hand of the file.
+        """
+        hand_lines = None
+        for line in self.iter_lines(file_key):
+            if line.lstrip("\ufeff").startswith("Winamax Poker - "):
+                if hand_lines:
+                    yield "".join(hand_lines)
+                hand_lines = [line]
+            elif hand_lines is not None:
+                hand_lines.append(line)
+        if hand_lines:
+            yield "".join(hand_lines)
+
+    def iter_parsed_hands(self, file_key: str) -> Iterator[dict]:
+        """
+        Parse each hand of a raw multi-hand history file as it is read.
+
+        Parameters:
+            file_key (str): The path to the raw poker hand history file.
+
+        Returns:
+            parsed_hands (Iterator[dict]): The dictionary of each hand of the file.
+        """
+        for hand_txt in self.iter_hands(file_key):
+            yield self.parse_hand(hand_txt)
+
+    def parse_raw_history(self, raw_key: str) -> None:
+        """
+        Parse all the hands of a raw multi-hand history file and save each of them in JSON format, without writing
+        the split files first.
+
+        Parameters:
+            raw_key (str): The path to the raw poker hand history file.
         """
-        print(f"\nParsing {split_key} to {self.get_parsed_key(split_key)}")
-        json_hand = self.parse_to_json(split_key)
-        self.save_parsed_hand(split_key, json_hand)
+        print(f"\nParsing raw history {raw_key}")
+        for hand_info in self.iter_parsed_hands(raw_key):
+            self.save_hand_info(self.get_split_key(raw_key, hand_info["hand_id"]), hand_info)
+        self.close_output()
 
     def parse_new_hand_history(self, split_key: str) -> None:
         """
@@ -470,43 +847,95 @@ class AbstractHandHistoryParser(ABC):
         Parameters:
             split_key (str): The path to the poker hand history file.
         """
+        self.check_new_hands_output()
         if not self.check_is_parsed(split_key):
             self.parse_hand_history(split_key)
         else:
             print(f"\n{split_key} is already parsed")
 
-    def parse_hand_histories(self) -> None:
+    def reset_worker_state(self) -> None:
+        """
+        Rebuild the state a worker process of the process executor must not share with the parent process: the
+        connections of the storage and the session of the output writer, whose shards or parts are named after it.
+        """
+        super().reset_worker_state()
+        if self.output_writer is not None:
+            self.output_writer.reset()
+
+    def parse_hand_histories(self, fields: list = None) -> None:
         """
         Parse all poker hand histories and save them in JSON format.
+        The split keys are listed lazily as they are parsed, so that the memory used does not depend on their number.
+
+        Parameters:
+            fields (list): The keys of the parsed hands to extract, all of them by default.
         """
-        split_keys = self.list_split_histories_keys()
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_hand_history, split_key) for split_key in split_keys]
-            for future in as_completed(futures):
-                future.result()
+        split_keys = self.iter_split_histories_keys()
+        self.run_tasks("parse_hand_history", split_keys, fields=fields)
 
-    def parse_hand_histories_from_directory(self, directory_key: str):
+    def parse_hand_histories_from_directory(self, directory_key: str, fields: list = None):
         """
         Parse all poker hand histories from a directory and save them in JSON format.
 
         Parameters:
             directory_key (str): The path to the directory containing the poker hand history files.
+            fields (list): The keys of the parsed hands to extract, all of them by default.
         """
-        split_keys = self.list_split_histories_keys(directory_key)
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_hand_history, split_key) for split_key in split_keys]
-            for future in as_completed(futures):
-                future.result()
+        split_keys = self.iter_split_histories_keys(directory_key)
+        self.run_tasks("parse_hand_history", split_keys, fields=fields)
+
+    def parse_hand_histories_pipeline(self, split_keys: Iterable = None, fields: list = None) -> list:
+        """
+        Parse poker hand histories with overlapping fetch, parse and save stages, so that the network and the CPU are
+        busy at the same time. The parse stage runs in processes with the process executor and in threads otherwise.
+
+        Parameters:
+            split_keys (Iterable): The paths to the poker hand history files, all the split files by default.
+            fields (list): The keys of the parsed hands to extract, all of them by default.
+
+        Returns:
+            failed_keys (list): The keys that could not be parsed and saved.
+        """
+        fields = self.check_projection(fields) if fields is not None else None
+        split_keys = self.iter_split_histories_keys() if split_keys is None else split_keys
+        failed_keys = run_pipeline(
+            self, split_keys, "get_text", "parse_hand_content", "save_hand_content", method_kwargs={"fields": fields},
+            executor=self.executor, fetch_workers=self.fetch_workers, parse_workers=self.max_workers,
+            upload_workers=self.upload_workers, queue_size=self.queue_size)
+        print(f"Finished parsing hand histories at {datetime.now()}, {len(failed_keys)} failed")
+        self.print_storage_stats()
+        return failed_keys
+
+    def parse_hand_histories_batch(self, split_keys: Iterable, fields: list = None) -> None:
+        """
+        Parse a batch of poker hand histories, reading and writing them with the batched operations of the storage.
+
+        Parameters:
+            split_keys (Iterable): The paths to the poker hand history files.
+            fields (list): The keys of the parsed hands to extract, all of them by default.
+        """
+        fields = self.check_projection(fields) if fields is not None else None
+        contents = ((split_key, self.parse_hand_content(hand_txt, fields=fields))
+                    for split_key, hand_txt in self.storage.get_many(split_keys))
+        if self.output_writer is not None:
+            for split_key, hand_info in contents:
+                self.save_hand_info(split_key, hand_info)
+        else:
+            self.storage.put_many((self.get_parsed_key(split_key, fields), json_hand)
+                                  for split_key, json_hand in contents)
 
     def parse_new_hand_histories(self) -> None:
         """
         Parse new poker hand histories and save them in JSON format if they have not been parsed yet.
+        The parsed keys are listed once and the new split keys are found by set difference, instead of checking
+        every split key on its own.
         """
+        self.check_new_hands_output()
         split_keys = self.list_split_histories_keys()[::-1]
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_new_hand_history, split_key) for split_key in split_keys]
-            for future in as_completed(futures):
-                future.result()
+        parsed_keys = set(self.list_parsed_histories_keys())
+        new_split_keys = [split_key for split_key in split_keys if self.get_parsed_key(split_key) not in parsed_keys]
+        print(f"\n{len(new_split_keys)} of {len(split_keys)} hand histories are not parsed yet")
+        self.run_tasks("parse_hand_history", new_split_keys)
 
     def parse_correction_files(self):
         """
@@ -519,9 +948,6 @@ class AbstractHandHistoryParser(ABC):
         print(f"There are {len(split_keys)} split files to parse.\n")
         print(f"Writing parsed keys to {self.correction_parsed_keys_file_key}...\n")
         self.write_text_from_list(self.correction_parsed_keys_file_key, parsed_keys)
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_hand, split_key) for split_key in split_keys]
-            for future in as_completed(futures):
-                future.result()
+        self.run_tasks("parse_hand_history", split_keys)
         self.write_text(self.correction_split_keys_file_key, "")
         print("Corrections have been parsed")
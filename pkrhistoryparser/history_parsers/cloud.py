@@ -1,44 +1,38 @@
-import boto3
+from pkrhistoryparser.compression import OUTPUT_COMPRESSION, check_compression
+from pkrhistoryparser.executors import check_executor, get_nb_workers
+from pkrhistoryparser.serializers import JSON_FORMAT, check_json_format
+from pkrhistoryparser.storage import S3_MAX_POOL_CONNECTIONS, S3Storage
 from .abstract import AbstractHandHistoryParser
 
 
 class CloudHandHistoryParser(AbstractHandHistoryParser):
 
-    def __init__(self, bucket_name: str):
+    def __init__(self, bucket_name: str, engine: str = "regex", executor: str = "thread", max_workers: int = None,
+                 output: str = "json", s3_client=None, compression: str = None, json_format: str = None,
+                 with_timestamp: bool = False):
         self.bucket_name = bucket_name
-        self.s3 = boto3.client("s3")
+        self.compression = check_compression(compression or OUTPUT_COMPRESSION)
+        self.json_format = check_json_format(json_format or JSON_FORMAT)
+        self.engine = self.check_engine(engine)
+        self.executor = check_executor(executor)
+        self.max_workers = max_workers
+        self.with_timestamp = with_timestamp
+        # One connection per thread of the executor or of the fetch and upload stages of the pipeline
+        pool_size = S3_MAX_POOL_CONNECTIONS or max(
+            get_nb_workers(self.executor, max_workers), self.fetch_workers + self.upload_workers)
+        self.storage = S3Storage(bucket_name, s3_client, max_pool_connections=pool_size)
         self.data_dir = "data"
+        self.raw_dir = "data/histories/raw"
         self.split_dir = "data/histories/split"
         self.parsed_dir = "data/histories/parsed"
+        self.shards_dir = "data/histories/shards"
+        self.columns_dir = "data/histories/columns"
         self.correction_split_keys_file_key = "data/correction_split_keys.txt"
         self.correction_parsed_keys_file_key = "data/correction_parsed_keys.txt"
+        self.set_output(output)
 
-    def list_split_histories_keys(self, directory_key: str = None) -> list:
-        paginator = self.s3.get_paginator("list_objects_v2")
-        directory = directory_key or self.split_dir
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=directory)
-        keys = [obj["Key"] for page in pages for obj in page.get("Contents", [])]
-        return keys
-
-    def get_text(self, key: str) -> str:
-        response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
-        content = response["Body"].read().decode("utf-8")
-        return content
-
-    def write_text(self, key: str, content: str) -> None:
-        self.s3.put_object(Bucket=self.bucket_name, Key=key, Body=content)
-
-    def write_text_from_list(self, key: str, content: list) -> None:
-        content = "\n".join(content)
-        self.s3.put_object(Bucket=self.bucket_name, Key=key, Body=content)
-
-    def check_is_parsed(self, split_key: str) -> bool:
-        parsed_key = self.get_parsed_key(split_key)
-        response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=parsed_key)
-        return "Contents" in response
-
-    def save_parsed_hand(self, split_key: str, json_hand: str) -> None:
-        parsed_key = self.get_parsed_key(split_key)
-        self.s3.put_object(Bucket=self.bucket_name, Key=parsed_key, Body=json_hand)
+    @property
+    def s3(self):
+        return self.storage.s3
 
 
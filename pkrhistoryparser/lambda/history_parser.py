@@ -1,27 +1,33 @@
-import json
+import threading
 from ..history_parsers.cloud import CloudHandHistoryParser
+from .records import ENGINE, process_records
+
+parsers = {}
+parsers_lock = threading.Lock()
+
+
+def get_parser(bucket_name: str) -> CloudHandHistoryParser:
+    """
+    Get the parser of a bucket. It is built with its S3 client on the first invocation of a container and reused by
+    the next invocations while the container stays warm. Its engine is set by POKER_LAMBDA_ENGINE (regex by default).
+
+    Parameters:
+        bucket_name (str): The name of the bucket of the hand histories.
+
+    Returns:
+        parser (CloudHandHistoryParser): The parser of the bucket.
+    """
+    with parsers_lock:
+        if bucket_name not in parsers:
+            parsers[bucket_name] = CloudHandHistoryParser(bucket_name, engine=ENGINE)
+        return parsers[bucket_name]
+
+
+def process_object(bucket_name: str, key: str) -> None:
+    parser = get_parser(bucket_name)
+    parser.parse_hand_history(key)
+    print(f"File {key} processed successfully to {parser.get_parsed_key(key)}")
 
 
 def lambda_handler(event, context):
-    for record in event['Records']:
-        body = record['body']
-        body_dict = json.loads(body)
-        message = body_dict["Message"]
-        message_dict = json.loads(message)
-        message_record = message_dict["Records"][0]
-        bucket_name = message_record['s3']['bucket']['name']
-        key = message_record['s3']['object']['key']
-        print(f"Parsing file {key}")
-        try:
-            parser = CloudHandHistoryParser(bucket_name)
-            parser.parse_hand_history(key)
-            return {
-                'statusCode': 200,
-                'body': f'File {key} processed successfully as parsed hand to {parser.get_parsed_key(key)}'
-            }
-        except Exception as e:
-            print(f"Error in lambda_handler: {e}")
-            return {
-                'statusCode': 500,
-                'body': f'Error processing file {key}: {e}'
-            }
+    return process_records(event["Records"], process_object, context=context)
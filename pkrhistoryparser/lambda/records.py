@@ -0,0 +1,103 @@
+"""
+This module processes the records of an SQS batch for the lambda handlers.
+Each SQS message wraps an SNS notification of S3 events, and the ids of the messages that failed are reported in the
+batchItemFailures response, so that only them are delivered again. Lambda only reads this response when the SQS
+event source mapping has the ReportBatchItemFailures function response type (see functionResponseTypes in
+config/lambda_params.json), and retries the whole batch otherwise.
+No new object is picked up once the remaining time of the invocation gets below a safety margin: the records left
+are reported as failures too, to be delivered again instead of being lost with the whole batch on a timeout.
+"""
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = int(os.environ.get("POKER_LAMBDA_MAX_WORKERS", "4"))
+DEADLINE_MARGIN_MS = int(os.environ.get("POKER_LAMBDA_DEADLINE_MARGIN_MS", "3000"))
+# Parse engine of the handlers: "regex" or "scanner"
+ENGINE = os.environ.get("POKER_LAMBDA_ENGINE", "regex")
+
+
+class DeadlineReached(Exception):
+    """Raised when an object is not processed because the invocation is about to time out."""
+
+
+def check_deadline(context, margin_ms: int = DEADLINE_MARGIN_MS) -> None:
+    """
+    Check that the invocation has enough time left to process a new object.
+
+    Parameters:
+        context: The lambda context, or None when the handler is not run by lambda.
+        margin_ms (int): The minimum remaining time in milliseconds to process a new object.
+    """
+    if context is not None and context.get_remaining_time_in_millis() < margin_ms:
+        raise DeadlineReached(f"Less than {margin_ms} ms left in the invocation")
+
+
+def get_s3_objects(record: dict) -> list:
+    """
+    Get the S3 objects notified in an SQS record.
+
+    Parameters:
+        record (dict): The SQS record, whose body is an SNS notification of S3 events.
+
+    Returns:
+        s3_objects (list): The (bucket_name, key) tuple of each notified object.
+    """
+    body_dict = json.loads(record["body"])
+    message_dict = json.loads(body_dict["Message"])
+    s3_objects = [(message_record["s3"]["bucket"]["name"], message_record["s3"]["object"]["key"])
+                  for message_record in message_dict["Records"]]
+    return s3_objects
+
+
+def process_record(record: dict, process_object: Callable[[str, str], None], context=None,
+                   margin_ms: int = DEADLINE_MARGIN_MS) -> None:
+    """
+    Process every S3 object notified in an SQS record, as long as the invocation has time left.
+
+    Parameters:
+        record (dict): The SQS record.
+        process_object (Callable[[str, str], None]): The function processing an object from its bucket name and key.
+        context: The lambda context, or None when the handler is not run by lambda.
+        margin_ms (int): The minimum remaining time in milliseconds to process a new object.
+    """
+    for bucket_name, key in get_s3_objects(record):
+        check_deadline(context, margin_ms)
+        print(f"Parsing file {key}")
+        process_object(bucket_name, key)
+
+
+def process_records(records: list, process_object: Callable[[str, str], None], max_workers: int = MAX_WORKERS,
+                    context=None, margin_ms: int = DEADLINE_MARGIN_MS) -> dict:
+    """
+    Process all the records of an SQS batch, concurrently when max_workers is above 1 since the work is S3-bound.
+
+    Parameters:
+        records (list): The SQS records of the batch.
+        process_object (Callable[[str, str], None]): The function processing an object from its bucket name and key.
+        max_workers (int): The maximum number of threads processing the records.
+        context: The lambda context, used to stop picking up new objects before the invocation times out.
+        margin_ms (int): The minimum remaining time in milliseconds to process a new object.
+
+    Returns:
+        response (dict): The partial batch response, listing the message id of each failed or unprocessed record.
+    """
+    batch_item_failures = []
+    nb_unprocessed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(records) or 1))) as pool:
+        futures = [(record, pool.submit(process_record, record, process_object, context, margin_ms))
+                   for record in records]
+        for record, future in futures:
+            try:
+                future.result()
+            except DeadlineReached:
+                nb_unprocessed += 1
+                batch_item_failures.append({"itemIdentifier": record["messageId"]})
+            except Exception as e:
+                print(f"Error processing message {record['messageId']}: {e}")
+                batch_item_failures.append({"itemIdentifier": record["messageId"]})
+    if nb_unprocessed:
+        print(f"{nb_unprocessed} records left unprocessed before the timeout, to be delivered again")
+    print(f"Processed {len(records) - len(batch_item_failures)} of {len(records)} records")
+    return {"batchItemFailures": batch_item_failures}
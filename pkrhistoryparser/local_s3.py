@@ -0,0 +1,188 @@
+"""
+This module contains a stand-in for the boto3 S3 client, backed by memory or by a local directory, which can be
+injected in the cloud parsers to test and benchmark them offline.
+It implements the calls used by the parsers (list_objects_v2 and its paginator, get_object, put_object) with an
+optional simulated latency.
+"""
+import io
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+# Suffix of the file holding the Content-Encoding of an object stored in a local directory
+CONTENT_ENCODING_SUFFIX = ".content-encoding"
+
+
+class NoSuchKey(Exception):
+    """Raised when getting an object that does not exist, as the NoSuchKey error of S3."""
+
+
+class LocalS3Body(io.BytesIO):
+    """
+    The streaming body of an object returned by get_object, which can be read at once, by chunks or by lines.
+
+    Parameters:
+        content (bytes): The content of the object.
+    """
+
+    def iter_lines(self, keepends: bool = False) -> Iterator[bytes]:
+        yield from self.read().splitlines(keepends)
+
+
+class LocalS3Paginator:
+    """
+    The paginator of list_objects_v2, following the continuation tokens of the pages.
+
+    Parameters:
+        client (LocalS3Client): The client whose objects are listed.
+    """
+
+    def __init__(self, client: "LocalS3Client"):
+        self.client = client
+
+    def paginate(self, Bucket: str, Prefix: str = "", **kwargs) -> Iterator[dict]:
+        page = self.client.list_objects_v2(Bucket=Bucket, Prefix=Prefix, **kwargs)
+        yield page
+        while page["IsTruncated"]:
+            page = self.client.list_objects_v2(
+                Bucket=Bucket, Prefix=Prefix, ContinuationToken=page["NextContinuationToken"], **kwargs)
+            yield page
+
+
+class LocalS3Client:
+    """
+    A stand-in for the boto3 S3 client, storing the objects in memory or in a local directory.
+    The memory storage is copied in each worker process, so a local directory is needed with the process executor.
+
+    Parameters:
+        root_dir (str): The directory holding one subdirectory per bucket. The objects are kept in memory if None.
+        latency (float): The simulated latency of each call, in seconds.
+        latency_per_mb (float): The simulated transfer time of each MB read or written, in seconds.
+    """
+
+    def __init__(self, root_dir: str = None, latency: float = 0.0, latency_per_mb: float = 0.0):
+        self.root_dir = root_dir
+        self.latency = latency
+        self.latency_per_mb = latency_per_mb
+        self.buckets = {}
+        self.content_encodings = {}
+        self.listings = {}
+        self.lock = threading.Lock()
+        self.exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["listings"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def wait(self, nb_bytes: int = 0) -> None:
+        delay = self.latency + self.latency_per_mb * nb_bytes / 1e6
+        if delay:
+            time.sleep(delay)
+
+    def get_path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root_dir, bucket, *key.split("/"))
+
+    def iter_keys(self, bucket: str) -> Iterator[str]:
+        if self.root_dir is None:
+            with self.lock:
+                yield from list(self.buckets.get(bucket, {}))
+            return
+        bucket_dir = os.path.join(self.root_dir, bucket)
+        for root, _, filenames in os.walk(bucket_dir):
+            for filename in filenames:
+                if filename.endswith((".tmp", CONTENT_ENCODING_SUFFIX)):
+                    continue
+                yield os.path.relpath(os.path.join(root, filename), bucket_dir).replace(os.sep, "/")
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", ContinuationToken: str = None,
+                        MaxKeys: int = 1000, **kwargs) -> dict:
+        """
+        List the objects of a bucket whose key starts with the prefix, in key order and by pages of MaxKeys objects.
+        The keys are listed and sorted once, on the first page of a listing, and the next pages start from their
+        continuation token by bisection, so that paging through the keys costs no more than one sort.
+
+        Returns:
+            page (dict): The page, with the Contents key only when objects are listed, as in S3.
+        """
+        self.wait()
+        with self.lock:
+            keys = self.listings.get((Bucket, Prefix)) if ContinuationToken is not None else None
+        if keys is None:
+            keys = sorted(key for key in self.iter_keys(Bucket) if key.startswith(Prefix))
+        start = bisect_right(keys, ContinuationToken) if ContinuationToken is not None else 0
+        page_keys = keys[start:start + MaxKeys]
+        page = {"KeyCount": len(page_keys), "IsTruncated": start + MaxKeys < len(keys), "Prefix": Prefix}
+        if page_keys:
+            page["Contents"] = [{"Key": key} for key in page_keys]
+        with self.lock:
+            if page["IsTruncated"]:
+                page["NextContinuationToken"] = page_keys[-1]
+                self.listings[(Bucket, Prefix)] = keys
+            else:
+                self.listings.pop((Bucket, Prefix), None)
+        return page
+
+    def get_paginator(self, operation_name: str) -> LocalS3Paginator:
+        if operation_name != "list_objects_v2":
+            raise NotImplementedError(f"No paginator for {operation_name}")
+        return LocalS3Paginator(self)
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        content_encoding = None
+        if self.root_dir is None:
+            with self.lock:
+                content = self.buckets.get(Bucket, {}).get(Key)
+                content_encoding = self.content_encodings.get((Bucket, Key))
+        else:
+            path = self.get_path(Bucket, Key)
+            try:
+                with open(path, "rb") as file:
+                    content = file.read()
+            except FileNotFoundError:
+                content = None
+            if os.path.exists(path + CONTENT_ENCODING_SUFFIX):
+                with open(path + CONTENT_ENCODING_SUFFIX, "r", encoding="utf-8") as file:
+                    content_encoding = file.read()
+        self.wait(len(content or b""))
+        if content is None:
+            raise NoSuchKey(f"The specified key does not exist: {Key}")
+        response = {"Body": LocalS3Body(content), "ContentLength": len(content)}
+        if content_encoding:
+            response["ContentEncoding"] = content_encoding
+        return response
+
+    def put_object(self, Bucket: str, Key: str, Body: str | bytes, ContentEncoding: str = None, **kwargs) -> dict:
+        """
+        Write an object, with its Content-Encoding if given, which is returned by get_object as in S3.
+        In a local directory, the Content-Encoding is written next to the object, in a file not listed as an object.
+        """
+        content = Body.encode("utf-8") if isinstance(Body, str) else Body
+        self.wait(len(content))
+        if self.root_dir is None:
+            with self.lock:
+                self.buckets.setdefault(Bucket, {})[Key] = content
+                self.content_encodings.pop((Bucket, Key), None)
+                if ContentEncoding:
+                    self.content_encodings[(Bucket, Key)] = ContentEncoding
+        else:
+            path = self.get_path(Bucket, Key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, path)
+            if ContentEncoding:
+                with open(path + CONTENT_ENCODING_SUFFIX, "w", encoding="utf-8") as file:
+                    file.write(ContentEncoding)
+            elif os.path.exists(path + CONTENT_ENCODING_SUFFIX):
+                os.remove(path + CONTENT_ENCODING_SUFFIX)
+        return {}
@@ -0,0 +1,382 @@
+"""
+This module contains a compact typed model of a parsed hand, made of slotted dataclasses.
+It holds the same information as the dictionary returned by parse_hand with a much smaller memory footprint, and
+to_dict gives back exactly the dictionary shape of the JSON files.
+It also contains a lazy view of a hand, which only runs the extractors of the sections that are accessed.
+"""
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cached_property
+from sys import intern
+
+STREETS = ("preflop", "flop", "turn", "river")
+
+
+def intern_card(card: str | None) -> str | None:
+    return intern(card) if card else card
+
+
+@dataclass(slots=True)
+class Player:
+    seat: int
+    name: str
+    init_stack: float
+    bounty: float
+    entered_hand: bool = False
+
+    @classmethod
+    def from_dict(cls, player_dict: dict) -> "Player":
+        return cls(player_dict["seat"], player_dict["name"], player_dict["init_stack"], player_dict["bounty"],
+                   player_dict.get("entered_hand", False))
+
+    def to_dict(self) -> dict:
+        return {
+            "seat": self.seat,
+            "name": self.name,
+            "init_stack": self.init_stack,
+            "bounty": self.bounty,
+            "entered_hand": self.entered_hand
+        }
+
+
+@dataclass(slots=True)
+class Posting:
+    name: str
+    amount: float
+    blind_type: str
+
+    @classmethod
+    def from_dict(cls, posting_dict: dict) -> "Posting":
+        return cls(posting_dict["name"], posting_dict["amount"], intern(posting_dict["blind_type"]))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "amount": self.amount, "blind_type": self.blind_type}
+
+
+@dataclass(slots=True)
+class Action:
+    player: str
+    action: str
+    amount: float
+    raise_total: float
+    is_all_in: bool
+
+    @classmethod
+    def from_dict(cls, action_dict: dict) -> "Action":
+        return cls(action_dict["player"], intern(action_dict["action"]), action_dict["amount"],
+                   action_dict["raise_total"], action_dict["is_all_in"])
+
+    def to_dict(self) -> dict:
+        return {
+            "player": self.player,
+            "action": self.action,
+            "amount": self.amount,
+            "raise_total": self.raise_total,
+            "is_all_in": self.is_all_in
+        }
+
+
+@dataclass(slots=True)
+class Street:
+    name: str
+    actions: list[Action]
+    cards: tuple
+
+    def to_cards_dict(self) -> dict:
+        """
+        Give the cards dealt on the street in the format of parse_hand (flop, turn and river only).
+        """
+        if self.name == "flop":
+            return {f"flop_card_{index}": card for index, card in enumerate(self.cards, start=1)}
+        return {f"{self.name}_card": self.cards[0]}
+
+
+@dataclass(slots=True)
+class Hand:
+    tournament_name: str
+    tournament_id: str
+    table_number: str
+    buy_in: float
+    hand_id: str
+    datetime: str
+    game_type: str
+    level: int
+    ante: float
+    sb: float
+    bb: float
+    max_players: int
+    button_seat: int
+    players: dict[int, Player]
+    hero: str
+    hero_cards: tuple
+    postings: list[Posting]
+    streets: tuple[Street, Street, Street, Street]
+    showdown: dict[str, tuple]
+    winners: dict[str, tuple]
+    timestamp: int | None = None
+
+    @classmethod
+    def from_dict(cls, hand_dict: dict) -> "Hand":
+        """
+        Build a hand model from the dictionary returned by parse_hand.
+
+        Parameters:
+            hand_dict (dict): The parsed hand dictionary.
+
+        Returns:
+            hand (Hand): The hand model.
+        """
+        return cls.from_sections(
+            **{field: hand_dict[field] for field in hand_dict if field != "actions"},
+            street_actions=(hand_dict["actions"][street] for street in STREETS))
+
+    @classmethod
+    def from_sections(cls, tournament_info: dict, buy_in: float, hand_id: str, datetime: str, game_type: str,
+                      level: dict, max_players: int, button_seat: int, players: dict, hero_hand: dict, postings: list,
+                      street_actions: Iterable, flop: dict, turn: dict, river: dict, showdown: dict,
+                      winners: dict, timestamp: int = None) -> "Hand":
+        """
+        Build a hand model from the outputs of the extractors, each section in the format of parse_hand.
+
+        Parameters:
+            tournament_info, buy_in, hand_id, datetime, game_type, level, max_players, button_seat, players,
+            hero_hand, postings, flop, turn, river, showdown, winners: The sections of the hand, as in parse_hand.
+            timestamp (int): The timestamp of the hand, only given when the parser extracts it.
+            street_actions (Iterable): The actions of each street, in the order of STREETS. A generator is consumed
+            one street at a time, so that the actions of a street can be extracted once the previous one is converted.
+
+        Returns:
+            hand (Hand): The hand model.
+        """
+        street_cards = {
+            "preflop": (),
+            "flop": tuple(intern_card(flop[f"flop_card_{index}"]) for index in range(1, 4)),
+            "turn": (intern_card(turn["turn_card"]),),
+            "river": (intern_card(river["river_card"]),)
+        }
+        return cls(
+            tournament_name=tournament_info["tournament_name"],
+            tournament_id=tournament_info["tournament_id"],
+            table_number=tournament_info["table_number"],
+            buy_in=buy_in,
+            hand_id=hand_id,
+            datetime=datetime,
+            game_type=intern(game_type),
+            level=level["value"],
+            ante=level["ante"],
+            sb=level["sb"],
+            bb=level["bb"],
+            max_players=max_players,
+            button_seat=button_seat,
+            players={seat: Player.from_dict(player) for seat, player in players.items()},
+            hero=hero_hand["hero"],
+            hero_cards=(intern_card(hero_hand["first_card"]), intern_card(hero_hand["second_card"])),
+            postings=[Posting.from_dict(posting) for posting in postings],
+            streets=tuple(
+                Street(street, [Action.from_dict(action) for action in actions], street_cards[street])
+                for street, actions in zip(STREETS, street_actions)),
+            showdown={player: (intern_card(cards["first_card"]), intern_card(cards["second_card"]))
+                      for player, cards in showdown.items()},
+            winners={winner: (winner_info["amount"], intern(winner_info["pot_type"]))
+                     for winner, winner_info in winners.items()},
+            timestamp=timestamp
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Give back the hand in the dictionary format of parse_hand.
+
+        Returns:
+            hand_dict (dict): The parsed hand dictionary.
+        """
+        _, flop, turn, river = self.streets
+        hand_dict = {
+            "tournament_info": {
+                "tournament_name": self.tournament_name,
+                "tournament_id": self.tournament_id,
+                "table_number": self.table_number
+            },
+            "buy_in": self.buy_in,
+            "hand_id": self.hand_id,
+            "datetime": self.datetime,
+            "game_type": self.game_type,
+            "level": {"value": self.level, "ante": self.ante, "sb": self.sb, "bb": self.bb},
+            "max_players": self.max_players,
+            "button_seat": self.button_seat,
+            "players": {seat: player.to_dict() for seat, player in self.players.items()},
+            "hero_hand": {"hero": self.hero, "first_card": self.hero_cards[0], "second_card": self.hero_cards[1]},
+            "postings": [posting.to_dict() for posting in self.postings],
+            "actions": {street.name: [action.to_dict() for action in street.actions] for street in self.streets},
+            "flop": flop.to_cards_dict(),
+            "turn": turn.to_cards_dict(),
+            "river": river.to_cards_dict(),
+            "showdown": {player: {"first_card": cards[0], "second_card": cards[1]}
+                         for player, cards in self.showdown.items()},
+            "winners": {winner: {"amount": amount, "pot_type": pot_type}
+                        for winner, (amount, pot_type) in self.winners.items()}
+        }
+        if self.timestamp is not None:
+            hand_dict["timestamp"] = self.timestamp
+        return hand_dict
+
+
+class LazyHand:
+    """
+    A view of a raw poker hand history which extracts each section the first time it is accessed and caches it.
+    Sections can be read as attributes or as items (hand.winners or hand["winners"]).
+    With the scanner engine, the extractors run on the texts of the sections split by split_hand_sections (the header
+    alone being cut without splitting the hand), as in scan_hand, instead of on the whole hand text.
+
+    Parameters:
+        hand_txt (str): The raw poker hand text as a string.
+        parser (AbstractHandHistoryParser): The parser whose extractors are run on the hand text.
+    """
+    FIELDS = ("tournament_info", "buy_in", "hand_id", "datetime", "game_type", "level", "max_players", "button_seat",
+              "players", "hero_hand", "postings", "actions", "flop", "turn", "river", "showdown", "winners")
+    # Fields which can be projected but are only in to_dict when the parser extracts them, as in parse_hand
+    OPTIONAL_FIELDS = ("timestamp",)
+
+    def __init__(self, hand_txt: str, parser):
+        self.hand_txt = hand_txt
+        self.parser = parser
+        self.street_actions = {}
+
+    def __getitem__(self, field: str):
+        if field not in self.FIELDS and field not in self.OPTIONAL_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __repr__(self) -> str:
+        return f"LazyHand(hand_id={self.hand_id!r})"
+
+    @cached_property
+    def header(self) -> str:
+        if self.parser.engine != "scanner":
+            return self.hand_txt
+        header_end = self.hand_txt.find("\nSeat ")
+        return self.hand_txt[:header_end] if header_end != -1 else self.hand_txt
+
+    @cached_property
+    def sections(self) -> dict:
+        """
+        The texts the extractors of the body of the hand run on: the sections split in a single pass with the scanner
+        engine, the whole hand text otherwise.
+        """
+        if self.parser.engine != "scanner":
+            return dict.fromkeys(("seats", "hero", "postings", *STREETS[1:], "showdown", "winners"), self.hand_txt)
+        sections = self.parser.split_hand_sections(self.hand_txt)
+        return {**sections, **{street: sections["street_headers"].get(street, "") for street in STREETS[1:]}}
+
+    @cached_property
+    def tournament_info(self) -> dict:
+        return self.parser.extract_tournament_info(self.header)
+
+    @cached_property
+    def buy_in(self) -> float:
+        return self.parser.extract_buy_in(self.header)["buy_in"]
+
+    @cached_property
+    def hand_id(self) -> str:
+        return self.parser.extract_hand_id(self.header)["hand_id"]
+
+    @cached_property
+    def datetime(self) -> str:
+        return self.parser.extract_datetime(self.header)["datetime"]
+
+    @cached_property
+    def timestamp(self) -> int:
+        return self.parser.extract_timestamp(self.header)["timestamp"]
+
+    @cached_property
+    def game_type(self) -> str:
+        return self.parser.extract_game_type(self.header)["game_type"]
+
+    @cached_property
+    def level(self) -> dict:
+        blinds = self.parser.extract_blinds(self.header)
+        return {
+            "value": self.parser.extract_level(self.header)["level"],
+            "ante": blinds["ante"],
+            "sb": blinds["sb"],
+            "bb": blinds["bb"]
+        }
+
+    @cached_property
+    def max_players(self) -> int:
+        return self.parser.extract_max_players(self.header)["max_players"]
+
+    @cached_property
+    def button_seat(self) -> int:
+        return self.parser.extract_button_seat(self.header)["button"]
+
+    @cached_property
+    def players(self) -> dict:
+        """
+        The players of the hand, flagged as having entered the hand as in parse_hand. Only the preflop actions are
+        parsed to flag them.
+        """
+        players = self.parser.extract_players(self.sections["seats"])
+        self.parser.check_players(
+            {"players": players, "postings": self.postings, "actions": {"preflop": self.get_street_actions("preflop")}})
+        return players
+
+    @cached_property
+    def hero_hand(self) -> dict:
+        return self.parser.extract_hero_hand(self.sections["hero"])
+
+    @cached_property
+    def postings(self) -> list:
+        return self.parser.extract_posting(self.sections["postings"])
+
+    def get_street_actions(self, street: str) -> list:
+        """
+        Parse the actions of a single street, once.
+
+        Parameters:
+            street (str): The street (preflop, flop, turn or river).
+
+        Returns:
+            actions (list): The actions of the street.
+        """
+        if street not in self.street_actions:
+            if self.parser.engine != "scanner":
+                self.street_actions[street] = self.parser.extract_street_actions(self.hand_txt, street)
+            else:
+                street_texts = self.sections["streets"]
+                self.street_actions[street] = (
+                    self.parser.parse_actions(street_texts[street]) if street in street_texts else [])
+        return self.street_actions[street]
+
+    @cached_property
+    def actions(self) -> dict:
+        return {street: self.get_street_actions(street) for street in STREETS}
+
+    @cached_property
+    def flop(self) -> dict:
+        return self.parser.extract_flop(self.sections["flop"])
+
+    @cached_property
+    def turn(self) -> dict:
+        return self.parser.extract_turn(self.sections["turn"])
+
+    @cached_property
+    def river(self) -> dict:
+        return self.parser.extract_river(self.sections["river"])
+
+    @cached_property
+    def showdown(self) -> dict:
+        return self.parser.extract_showdown(self.sections["showdown"])
+
+    @cached_property
+    def winners(self) -> dict:
+        return self.parser.extract_winners(self.sections["winners"])
+
+    def to_dict(self) -> dict:
+        """
+        Extract every section not accessed yet and give back the hand in the dictionary format of parse_hand.
+
+        Returns:
+            hand_dict (dict): The parsed hand dictionary.
+        """
+        fields = self.FIELDS + self.OPTIONAL_FIELDS if self.parser.with_timestamp else self.FIELDS
+        return {field: getattr(self, field) for field in fields}
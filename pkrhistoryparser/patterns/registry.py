@@ -0,0 +1,51 @@
+"""
+This module compiles once, at import, the regular expressions used to parse Winamax hand histories and summaries.
+The parsers use these compiled patterns instead of passing the raw strings of the winamax module to the re functions.
+"""
+import re
+from pkrhistoryparser.patterns import winamax
+
+# HAND HISTORY PATTERNS
+PLAYER_PATTERN = re.compile(winamax.PLAYER_PATTERN)
+BLINDS_PATTERN = re.compile(winamax.BLINDS_PATTERN)
+DATETIME_PATTERN = re.compile(winamax.DATETIME_PATTERN)
+TOURNAMENT_BLINDS_PATTERN = re.compile(winamax.TOURNAMENT_BLINDS_PATTERN)
+OTHER_BLINDS_PATTERN = re.compile(winamax.OTHER_BLINDS_PATTERN)
+LEVEL_PATTERN = re.compile(winamax.LEVEL_PATTERN)
+NORMAL_BUY_IN_PATTERN = re.compile(winamax.NORMAL_BUY_IN_PATTERN)
+KO_BUY_IN_PATTERN = re.compile(winamax.KO_BUY_IN_PATTERN)
+FREE_ROLL_PATTERN = re.compile(winamax.FREE_ROLL_PATTERN)
+MAX_PLAYERS_PATTERN = re.compile(winamax.MAX_PLAYERS_PATTERN)
+BUTTON_SEAT_PATTERN = re.compile(winamax.BUTTON_SEAT_PATTERN)
+TABLE_NAME_PATTERN = re.compile(winamax.TABLE_NAME_PATTERN)
+TOURNAMENT_INFO_PATTERN = re.compile(winamax.TOURNAMENT_INFO_PATTERN)
+TABLE_IDENT_PATTERN = re.compile(winamax.TABLE_IDENT_PATTERN)
+HERO_HAND_PATTERN = re.compile(winamax.HERO_HAND_PATTERN, re.UNICODE)
+FLOP_PATTERN = re.compile(winamax.FLOP_PATTERN, re.UNICODE)
+TURN_PATTERN = re.compile(winamax.TURN_PATTERN, re.UNICODE)
+RIVER_PATTERN = re.compile(winamax.RIVER_PATTERN, re.UNICODE)
+ACTION_PATTERN = re.compile(winamax.ACTION_PATTERN)
+SHOWDOWN_PATTERN = re.compile(winamax.SHOWDOWN_PATTERN)
+WINNERS_PATTERN = re.compile(winamax.WINNERS_PATTERN)
+HAND_ID_PATTERN = re.compile(winamax.HAND_ID_PATTERN)
+PREFLOP_ACTION_PATTERN = re.compile(winamax.PREFLOP_ACTION_PATTERN, re.DOTALL)
+FLOP_ACTION_PATTERN = re.compile(winamax.FLOP_ACTION_PATTERN, re.DOTALL)
+TURN_ACTION_PATTERN = re.compile(winamax.TURN_ACTION_PATTERN, re.DOTALL)
+RIVER_ACTION_PATTERN = re.compile(winamax.RIVER_ACTION_PATTERN, re.DOTALL)
+STREET_ACTION_PATTERNS = [PREFLOP_ACTION_PATTERN, FLOP_ACTION_PATTERN, TURN_ACTION_PATTERN, RIVER_ACTION_PATTERN]
+# LINE SCANNER PATTERNS
+STREET_HEADERS = winamax.STREET_HEADERS
+STREET_STOP_PATTERN = re.compile(winamax.STREET_STOP_PATTERN)
+# TOURNAMENT INFO PATTERNS
+SPLIT_PATTERN = re.compile(winamax.SPLIT_PATTERN)
+PRIZE_POOL_PATTERN = re.compile(winamax.PRIZE_POOL_PATTERN)
+REGISTERED_PLAYERS_PATTERN = re.compile(winamax.REGISTERED_PLAYERS_PATTERN)
+SPEED_PATTERN = re.compile(winamax.SPEED_PATTERN)
+LEVELS_STRUCTURE_PATTERN = re.compile(winamax.LEVELS_STRUCTURE_PATTERN)
+START_DATE_PATTERN = re.compile(winamax.START_DATE_PATTERN)
+LEVEL_BLINDS_PATTERN = re.compile(winamax.LEVEL_BLINDS_PATTERN)
+TOURNAMENT_TYPE_PATTERN = re.compile(winamax.TOURNAMENT_TYPE_PATTERN)
+SUMMARY_TOURNAMENT_INFO_PATTERN = re.compile(winamax.SUMMARY_TOURNAMENT_INFO_PATTERN)
+BUY_IN_PATTERN = re.compile(winamax.BUY_IN_PATTERN)
+AMOUNT_WON_PATTERN = re.compile(winamax.AMOUNT_WON_PATTERN)
+FINAL_POSITION_PATTERN = re.compile(winamax.FINAL_POSITION_PATTERN)
@@ -29,6 +29,9 @@ FLOP_ACTION_PATTERN = r"\*\*\*\sFLOP\s\*\*\*\s\[[\w\s]+\]([&\w\s.€-]+)"
 TURN_ACTION_PATTERN = r"\*\*\*\sTURN\s\*\*\*\s\[[\w\s]+\]\[[\w\s]+\]([&\w\s.€-]+)"
 RIVER_ACTION_PATTERN = r"\*\*\*\sRIVER\s\*\*\*\s\[[\w\s]+\]\[[\w\s]+\]([&\w\s.€-]+)"
 STREET_ACTION_PATTERNS = [PREFLOP_ACTION_PATTERN, FLOP_ACTION_PATTERN, TURN_ACTION_PATTERN, RIVER_ACTION_PATTERN]
+# LINE SCANNER PATTERNS
+STREET_HEADERS = {"*** PRE-FLOP ***": "preflop", "*** FLOP ***": "flop", "*** TURN ***": "turn", "*** RIVER ***": "river"}
+STREET_STOP_PATTERN = r"[^&\w\s.€-]"
 # TOURNAMENT INFO PATTERNS
 SPLIT_PATTERN = r"Winamax\sPoker\s-\sTournament\ssummary"
 PRIZE_POOL_PATTERN = r"Prizepool[\s\:]+([\d\.\,]+)\s?€"
@@ -0,0 +1,154 @@
+"""
+This module runs a parser over keys as an asyncio pipeline of three bounded stages connected by queues:
+    - fetch: the raw texts are read in a thread pool shared with the upload stage. The keys are pulled from their
+      iterator in a thread of their own, since listing a page of S3 keys blocks.
+    - parse: the texts are parsed in a thread or process pool, with the same parse_hand/parse_tournament_summary core.
+    - upload: the parsed contents are saved in the thread pool.
+The queues between the stages are bounded, so a fast stage waits for the slow one instead of piling up texts in
+memory, and the network and the CPU are kept busy at the same time.
+"""
+import asyncio
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from pkrhistoryparser import executors
+
+STOP = None
+
+
+def run_worker_method(method_name: str, *args, **kwargs):
+    """
+    Run a method of the parser stored in a worker process by init_worker.
+
+    Parameters:
+        method_name (str): The name of the parser method to run.
+        args: The positional arguments of the method.
+        kwargs: The keyword arguments of the method.
+
+    Returns:
+        result: The result of the method.
+    """
+    return getattr(executors.worker_parser, method_name)(*args, **kwargs)
+
+
+async def fetch_stage(keys_iterator, fetch: Callable, keys_pool: Executor, io_pool: Executor,
+                      parse_queue: asyncio.Queue, failed_keys: list) -> None:
+    loop = asyncio.get_running_loop()
+    # The keys pool has a single thread, so the fetchers never advance the shared iterator at the same time
+    while (key := await loop.run_in_executor(keys_pool, next, keys_iterator, STOP)) is not STOP:
+        try:
+            text = await loop.run_in_executor(io_pool, fetch, key)
+        except Exception as e:
+            print(f"Error fetching {key}: {e}")
+            failed_keys.append(key)
+            continue
+        await parse_queue.put((key, text))
+
+
+async def parse_stage(parse: Callable, parse_pool: Executor, parse_queue: asyncio.Queue,
+                      upload_queue: asyncio.Queue, failed_keys: list) -> None:
+    loop = asyncio.get_running_loop()
+    while (item := await parse_queue.get()) is not STOP:
+        key, text = item
+        try:
+            content = await loop.run_in_executor(parse_pool, parse, text)
+        except Exception as e:
+            print(f"Error parsing {key}: {e}")
+            failed_keys.append(key)
+            continue
+        await upload_queue.put((key, content))
+
+
+async def upload_stage(upload: Callable, io_pool: Executor, upload_queue: asyncio.Queue, failed_keys: list) -> None:
+    loop = asyncio.get_running_loop()
+    while (item := await upload_queue.get()) is not STOP:
+        key, content = item
+        try:
+            await loop.run_in_executor(io_pool, upload, key, content)
+        except Exception as e:
+            print(f"Error uploading {key}: {e}")
+            failed_keys.append(key)
+
+
+async def run_stages(keys: Iterable, fetch: Callable, parse: Callable, upload: Callable, io_pool: Executor,
+                     parse_pool: Executor, fetch_workers: int, parse_workers: int, upload_workers: int,
+                     queue_size: int) -> list:
+    """
+    Run the fetch, parse and upload stages over the keys, each stage with its own number of concurrent workers.
+
+    Parameters:
+        keys (Iterable): The keys to process, consumed lazily by the fetch stage.
+        fetch (Callable[[str], str]): The function reading the text of a key.
+        parse (Callable[[str], object]): The function parsing a text into the content to save.
+        upload (Callable[[str, object], None]): The function saving the content of a key.
+        io_pool (Executor): The executor running the fetch and upload functions.
+        parse_pool (Executor): The executor running the parse function.
+        fetch_workers (int): The number of concurrent fetches.
+        parse_workers (int): The number of concurrent parses.
+        upload_workers (int): The number of concurrent uploads.
+        queue_size (int): The maximum number of items waiting between two stages.
+
+    Returns:
+        failed_keys (list): The keys that could not be fetched, parsed or uploaded.
+    """
+    failed_keys = []
+    parse_queue, upload_queue = asyncio.Queue(maxsize=queue_size), asyncio.Queue(maxsize=queue_size)
+    keys_iterator = iter(keys)
+    keys_pool = ThreadPoolExecutor(max_workers=1)
+    fetchers = [asyncio.create_task(fetch_stage(keys_iterator, fetch, keys_pool, io_pool, parse_queue, failed_keys))
+                for _ in range(fetch_workers)]
+    parsers = [asyncio.create_task(parse_stage(parse, parse_pool, parse_queue, upload_queue, failed_keys))
+               for _ in range(parse_workers)]
+    uploaders = [asyncio.create_task(upload_stage(upload, io_pool, upload_queue, failed_keys))
+                 for _ in range(upload_workers)]
+    await asyncio.gather(*fetchers)
+    keys_pool.shutdown()
+    for _ in parsers:
+        await parse_queue.put(STOP)
+    await asyncio.gather(*parsers)
+    for _ in uploaders:
+        await upload_queue.put(STOP)
+    await asyncio.gather(*uploaders)
+    return failed_keys
+
+
+def run_pipeline(parser, keys: Iterable, fetch_method: str, parse_method: str, upload_method: str,
+                 method_kwargs: dict = None, executor: str = "thread", fetch_workers: int = 16,
+                 parse_workers: int = None, upload_workers: int = 16, queue_size: int = 64) -> list:
+    """
+    Run three methods of a parser over the keys as a fetch, parse and upload pipeline.
+
+    Parameters:
+        parser: The parser holding the methods.
+        keys (Iterable): The keys to process.
+        fetch_method (str): The name of the parser method reading the text of a key.
+        parse_method (str): The name of the parser method parsing a text into the content to save.
+        upload_method (str): The name of the parser method saving the content of a key.
+        method_kwargs (dict): The keyword arguments passed to the parse and upload methods.
+        executor (str): The executor of the parse stage: "process" for a process pool, where each worker holds its
+        own copy of the parser, or "thread" for a thread pool ("inline" parses with a single thread).
+        fetch_workers (int): The number of concurrent fetches.
+        parse_workers (int): The number of concurrent parses, the number of CPUs by default.
+        upload_workers (int): The number of concurrent uploads.
+        queue_size (int): The maximum number of items waiting between two stages.
+
+    Returns:
+        failed_keys (list): The keys that could not be fetched, parsed or uploaded.
+    """
+    method_kwargs = method_kwargs or {}
+    parse_workers = 1 if executor == "inline" else parse_workers or os.cpu_count() or 1
+    if executor == "process":
+        parse_pool = ProcessPoolExecutor(
+            max_workers=parse_workers, initializer=executors.init_worker, initargs=(parser,))
+        parse = partial(run_worker_method, parse_method, **method_kwargs)
+    else:
+        parse_pool = ThreadPoolExecutor(max_workers=parse_workers)
+        parse = partial(getattr(parser, parse_method), **method_kwargs)
+    upload = partial(getattr(parser, upload_method), **method_kwargs)
+    with parse_pool, ThreadPoolExecutor(max_workers=fetch_workers + upload_workers) as io_pool:
+        failed_keys = asyncio.run(run_stages(keys, getattr(parser, fetch_method), parse, upload, io_pool, parse_pool,
+                                             fetch_workers, parse_workers, upload_workers, queue_size))
+    executors.close_output(parser)
+    return failed_keys
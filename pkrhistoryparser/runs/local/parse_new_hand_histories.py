@@ -2,5 +2,5 @@ from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
 from pkrhistoryparser.settings import DATA_DIR
 
 if __name__ == "__main__":
-    parser = LocalHandHistoryParser(DATA_DIR)
+    parser = LocalHandHistoryParser(DATA_DIR, executor="process")
     parser.parse_new_hand_histories()
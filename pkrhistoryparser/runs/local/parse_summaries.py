@@ -3,5 +3,5 @@ from pkrhistoryparser.settings import DATA_DIR
 
 
 if __name__ == "__main__":
-    parser = LocalSummaryParser(DATA_DIR)
+    parser = LocalSummaryParser(DATA_DIR, executor="process")
     parser.parse_summaries()
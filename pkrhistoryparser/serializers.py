@@ -0,0 +1,66 @@
+"""
+This module serializes the parsed hands and summaries to JSON, in one of two formats:
+    - compat: indented with 4 spaces by the json module, byte for byte the format of the existing parsed files.
+    - compact: without indentation nor spaces, written by orjson when it is installed and by the json module otherwise.
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_FORMATS = ("compat", "compact")
+# Format of the parsed files: "compat" (indented, as the existing files) or "compact" (no indentation, with orjson)
+JSON_FORMAT = os.environ.get("POKER_JSON_FORMAT", "compat")
+
+
+def check_json_format(json_format: str) -> str:
+    """
+    Check that the JSON format is supported.
+
+    Parameters:
+        json_format (str): The JSON format (compat or compact).
+
+    Returns:
+        json_format (str): The checked JSON format.
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format: {json_format}")
+    return json_format
+
+
+def to_compact_json(obj, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to compact JSON, with orjson when it is installed.
+    The integer keys (e.g. the seats of the players) are written as strings, as the json module does.
+
+    Parameters:
+        obj: The object to serialize.
+        sort_keys (bool): Whether to sort the keys of the dictionaries.
+
+    Returns:
+        json_text (str): The JSON text.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def to_json(obj, json_format: str = "compat", sort_keys: bool = False) -> str:
+    """
+    Serialize an object to JSON in the given format.
+
+    Parameters:
+        obj: The object to serialize.
+        json_format (str): The JSON format (compat or compact).
+        sort_keys (bool): Whether to sort the keys of the dictionaries.
+
+    Returns:
+        json_text (str): The JSON text.
+    """
+    if json_format == "compat":
+        return json.dumps(obj, indent=4, sort_keys=sort_keys, ensure_ascii=False)
+    return to_compact_json(obj, sort_keys=sort_keys)
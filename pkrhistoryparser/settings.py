@@ -1,10 +1,10 @@
 import os
 
 DATA_DIR = os.environ.get("POKER_DATA_DIR")
-HISTORIES_DIR = os.path.join(DATA_DIR, "histories")
-SUMMARIES_DIR = os.path.join(DATA_DIR, "summaries")
-SPLIT_HISTORIES_DIR = os.path.join(HISTORIES_DIR, "split")
-PARSED_HISTORIES_DIR = os.path.join(HISTORIES_DIR, "parsed")
+HISTORIES_DIR = os.path.join(DATA_DIR, "histories") if DATA_DIR else None
+SUMMARIES_DIR = os.path.join(DATA_DIR, "summaries") if DATA_DIR else None
+SPLIT_HISTORIES_DIR = os.path.join(HISTORIES_DIR, "split") if DATA_DIR else None
+PARSED_HISTORIES_DIR = os.path.join(HISTORIES_DIR, "parsed") if DATA_DIR else None
 BUCKET_NAME = os.environ.get("POKER_AWS_BUCKET_NAME")
 TEST_DATA_DIR = os.environ.get("POKER_TEST_DATA_DIR")
 
@@ -0,0 +1,111 @@
+"""
+This module writes parsed records as compact JSON lines into bounded shard files instead of one JSON file per record.
+Shards are only written once complete and a manifest listing their contents is written when the writer is closed.
+The open shards of all the groups share a bound on their buffered bytes, so that the memory of the writer does not grow
+with the number of groups (most tournaments never fill a shard of their own).
+"""
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from json import dumps
+
+from pkrhistoryparser.serializers import to_compact_json
+
+
+class JsonLinesShardWriter:
+    """
+    Buffer parsed records as JSON lines and write them in shards bounded by a number of records and a size in bytes.
+
+    Parameters:
+        save_shard (Callable[[str, str], None]): The function atomically writing the content of a shard to its key.
+        shards_dir (str): The directory where the shards and the manifests are written.
+        max_records (int): The maximum number of records in a shard.
+        max_bytes (int): The maximum size of a shard in bytes.
+        max_buffered_bytes (int): The maximum size in bytes of the open shards of all the groups, beyond which the
+            largest open shards are written before they are full.
+    """
+
+    def __init__(self, save_shard: Callable[[str, str], None], shards_dir: str, max_records: int = 5000,
+                 max_bytes: int = 16 * 1024 * 1024, max_buffered_bytes: int = 64 * 1024 * 1024):
+        self.save_shard = save_shard
+        self.shards_dir = shards_dir
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_buffered_bytes = max_buffered_bytes
+        self.reset()
+
+    def __getstate__(self) -> dict:
+        return {key: self.__dict__[key]
+                for key in ("save_shard", "shards_dir", "max_records", "max_bytes", "max_buffered_bytes")}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Start a new writing session, with its own id, shards and manifest. The id holds the process id, so that the
+        workers of a process pool never write to the same keys.
+        """
+        self.writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.lock = threading.Lock()
+        self.open_shards = {}
+        self.buffered_bytes = 0
+        self.nb_shards = 0
+        self.manifest = []
+
+    def add(self, record: dict, record_id: str, group: str = "all") -> None:
+        """
+        Add a record to the open shard of its group and write the shard if it is full, then write the largest open
+        shards while the open shards of all the groups hold more than max_buffered_bytes.
+
+        Parameters:
+            record (dict): The parsed record.
+            record_id (str): The id of the record, listed in the manifest.
+            group (str): The group of the record (e.g. its tournament id), each group having its own shards.
+        """
+        line = to_compact_json(record) + "\n"
+        nb_bytes = len(line.encode("utf-8"))
+        with self.lock:
+            shard = self.open_shards.setdefault(group, {"lines": [], "ids": [], "nb_bytes": 0})
+            shard["lines"].append(line)
+            shard["ids"].append(record_id)
+            shard["nb_bytes"] += nb_bytes
+            self.buffered_bytes += nb_bytes
+            is_full = len(shard["lines"]) >= self.max_records or shard["nb_bytes"] >= self.max_bytes
+            full_shards = [self.pop_shard(group)] if is_full else []
+            while self.buffered_bytes > self.max_buffered_bytes:
+                largest_group = max(self.open_shards, key=lambda open_group: self.open_shards[open_group]["nb_bytes"])
+                full_shards.append(self.pop_shard(largest_group))
+        for full_shard in full_shards:
+            self.write_shard(**full_shard)
+
+    def pop_shard(self, group: str) -> dict:
+        shard = self.open_shards.pop(group)
+        self.buffered_bytes -= shard["nb_bytes"]
+        shard_key = os.path.join(self.shards_dir, group, f"{self.writer_id}-{self.nb_shards:05d}.jsonl")
+        self.nb_shards += 1
+        return {"shard_key": shard_key, "group": group, **shard}
+
+    def write_shard(self, shard_key: str, group: str, lines: list, ids: list, nb_bytes: int) -> None:
+        self.save_shard(shard_key, "".join(lines))
+        with self.lock:
+            self.manifest.append(
+                {"key": shard_key, "group": group, "nb_records": len(ids), "nb_bytes": nb_bytes, "ids": ids})
+
+    def get_manifest_key(self) -> str:
+        return os.path.join(self.shards_dir, f"manifest-{self.writer_id}.json")
+
+    def close(self) -> None:
+        """
+        Write all the open shards, then the manifest listing every shard of the session, and start a new session.
+        """
+        with self.lock:
+            open_shards = [self.pop_shard(group) for group in list(self.open_shards)]
+        for shard in open_shards:
+            self.write_shard(**shard)
+        if self.manifest:
+            print(f"\nWriting {len(self.manifest)} shards manifest to {self.get_manifest_key()}")
+            self.save_shard(self.get_manifest_key(), dumps({"shards": self.manifest}, indent=4, ensure_ascii=False))
+        self.reset()
@@ -0,0 +1,337 @@
+"""
+This module contains the storage backends the parsers read their files from and write their outputs to: the local
+file system, S3 and memory.
+Each backend implements the single-key operations and can optimise the batched ones (get_many, put_many,
+list_prefix), which by default run the single-key operations in a thread pool.
+The keys ending with a compression extension (.gz or .zst) are compressed when written and decompressed when read.
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from pkrhistoryparser.compression import COMPRESSION_EXTENSIONS, compress, decompress, get_compression, open_text_stream
+
+try:
+    import boto3
+    from botocore.config import Config
+except ImportError:
+    boto3, Config = None, None
+
+# S3 client: the connection pool is sized to the number of workers of the parser when not set
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get("POKER_S3_MAX_POOL_CONNECTIONS", "0")) or None
+S3_RETRY_MODE = os.environ.get("POKER_S3_RETRY_MODE", "adaptive")
+S3_MAX_ATTEMPTS = int(os.environ.get("POKER_S3_MAX_ATTEMPTS", "5"))
+
+
+class StorageBackend(ABC):
+    """
+    The interface of a storage backend, where files are identified by their key.
+
+    Parameters:
+        max_workers (int): The maximum number of threads of the batched operations.
+    """
+    max_workers: int = 16
+
+    @abstractmethod
+    def get_text(self, key: str) -> str:
+        pass
+
+    @abstractmethod
+    def iter_lines(self, key: str) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, content: str | bytes) -> None:
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def list_prefix(self, prefix: str, suffix: str | tuple = "") -> Iterator[str]:
+        """
+        List lazily the keys starting with a prefix (a directory for the local file system), in sorted order within
+        each directory.
+
+        Parameters:
+            prefix (str): The prefix of the keys.
+            suffix (str | tuple): The suffix the keys must end with, or the suffixes they can end with.
+
+        Returns:
+            keys (Iterator[str]): The listed keys.
+        """
+        pass
+
+    def get_many(self, keys: Iterable) -> Iterator[tuple]:
+        """
+        Get the text of several keys concurrently.
+
+        Parameters:
+            keys (Iterable): The keys to read.
+
+        Returns:
+            texts (Iterator[tuple]): The (key, text) tuple of each key, in the order of the keys.
+        """
+        keys = list(keys)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            yield from zip(keys, pool.map(self.get_text, keys))
+
+    def put_many(self, items: Iterable) -> None:
+        """
+        Write several contents concurrently.
+
+        Parameters:
+            items (Iterable): The (key, content) tuples to write.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for _ in pool.map(lambda item: self.put(*item), items):
+                pass
+
+    def reset_connections(self) -> None:
+        """
+        Rebuild the connections of the backend in a worker process, which must not use those copied from the parent
+        process when it is forked (none by default).
+        """
+        pass
+
+    def get_stats(self) -> dict:
+        """
+        Get the statistics of the backend worth reporting after a bulk run (none by default).
+
+        Returns:
+            stats (dict): The statistics, by name.
+        """
+        return {}
+
+
+class LocalStorage(StorageBackend):
+    """
+    The local file system, where the keys are file paths. The files are written atomically through a temporary file.
+    """
+
+    def get_text(self, key: str) -> str:
+        compression = get_compression(key)
+        if compression:
+            with open(key, 'rb') as file:
+                return decompress(file.read(), compression).decode('utf-8')
+        with open(key, 'r', encoding='utf-8') as file:
+            content = file.read()
+        return content
+
+    def iter_lines(self, key: str) -> Iterator[str]:
+        compression = get_compression(key)
+        if compression:
+            with open(key, 'rb') as file, open_text_stream(file, compression) as text_stream:
+                yield from text_stream
+            return
+        with open(key, 'r', encoding='utf-8') as file:
+            yield from file
+
+    def put(self, key: str, content: str | bytes) -> None:
+        directory = os.path.dirname(key)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        content = compress(content, get_compression(key))
+        temp_key = f"{key}.{threading.get_ident()}.tmp"
+        with open(temp_key, 'wb') as file:
+            file.write(content.encode('utf-8') if isinstance(content, str) else content)
+        os.replace(temp_key, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(key)
+
+    def list_prefix(self, prefix: str, suffix: str | tuple = "") -> Iterator[str]:
+        for root, _, filenames in os.walk(prefix):
+            for filename in sorted(filenames):
+                if filename.endswith(suffix):
+                    yield os.path.join(root, filename)
+
+
+class S3Storage(StorageBackend):
+    """
+    An S3 bucket. The boto3 client is thread-safe and shared by the threads of the parser.
+    Its connection pool holds max_pool_connections connections and each call waits for a free one, instead of
+    opening a connection discarded afterwards ("Connection pool is full"). The time spent waiting is reported in the
+    statistics of the backend.
+
+    Parameters:
+        bucket_name (str): The name of the bucket.
+        s3_client: The S3 client to use (e.g. a LocalS3Client), a boto3 client is created if None. An injected client
+        is kept when the storage is pickled, a boto3 client is created again.
+        max_pool_connections (int): The size of the connection pool, S3_MAX_POOL_CONNECTIONS or 10 by default.
+    """
+
+    def __init__(self, bucket_name: str, s3_client=None, max_pool_connections: int = None):
+        self.bucket_name = bucket_name
+        self.max_pool_connections = max_pool_connections or S3_MAX_POOL_CONNECTIONS or 10
+        self.max_workers = self.max_pool_connections
+        self.is_s3_injected = s3_client is not None
+        self.s3 = s3_client or self.create_client()
+        self.reset_pool_stats()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for key in ("pool_slots", "pool_lock"):
+            del state[key]
+        if not self.is_s3_injected:
+            del state["s3"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.reset_connections()
+
+    def reset_connections(self) -> None:
+        """
+        Create a new boto3 client, with its own connection pool, and a new pool semaphore. An injected client is kept.
+        """
+        if not self.is_s3_injected:
+            self.s3 = self.create_client()
+        self.reset_pool_stats()
+
+    def create_client(self):
+        config = Config(max_pool_connections=self.max_pool_connections,
+                        retries={"mode": S3_RETRY_MODE, "total_max_attempts": S3_MAX_ATTEMPTS})
+        return boto3.client("s3", config=config)
+
+    def reset_pool_stats(self) -> None:
+        self.pool_slots = threading.BoundedSemaphore(self.max_pool_connections)
+        self.pool_lock = threading.Lock()
+        self.nb_calls = 0
+        self.pool_wait_time = 0.0
+
+    @contextmanager
+    def pool_slot(self):
+        """
+        Wait for a free connection of the pool during an S3 call and count the time spent waiting.
+        """
+        start = time.perf_counter()
+        self.pool_slots.acquire()
+        wait_time = time.perf_counter() - start
+        with self.pool_lock:
+            self.nb_calls += 1
+            self.pool_wait_time += wait_time
+        try:
+            yield
+        finally:
+            self.pool_slots.release()
+
+    def get_stats(self) -> dict:
+        return {
+            "max_pool_connections": self.max_pool_connections,
+            "nb_calls": self.nb_calls,
+            "pool_wait_time": round(self.pool_wait_time, 3),
+            "average_pool_wait_ms": round(self.pool_wait_time / self.nb_calls * 1000, 3) if self.nb_calls else 0.0
+        }
+
+    @staticmethod
+    def get_object_compression(key: str, response: dict) -> str | None:
+        """
+        Get the compression of an object from the extension of its key, or else from its Content-Encoding.
+        """
+        content_encoding = response.get("ContentEncoding")
+        return get_compression(key) or (content_encoding if content_encoding in COMPRESSION_EXTENSIONS else None)
+
+    def get_text(self, key: str) -> str:
+        with self.pool_slot():
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+            content = response["Body"].read()
+        content = decompress(content, self.get_object_compression(key, response)).decode("utf-8")
+        return content
+
+    def iter_lines(self, key: str) -> Iterator[str]:
+        # The slot is only held for the call: the callers save what they read while the body is still streamed
+        # (parse_raw_history saves each hand of its raw file), so holding it until the body is consumed would make
+        # them wait for their own slot.
+        with self.pool_slot():
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        compression = self.get_object_compression(key, response)
+        if compression:
+            with open_text_stream(response["Body"], compression, newline="") as text_stream:
+                yield from text_stream
+            return
+        for line in response["Body"].iter_lines(keepends=True):
+            yield line.decode("utf-8")
+
+    def put(self, key: str, content: str | bytes) -> None:
+        compression = get_compression(key)
+        put_kwargs = {"ContentEncoding": compression} if compression else {}
+        content = compress(content, compression)
+        with self.pool_slot():
+            self.s3.put_object(Bucket=self.bucket_name, Key=key, Body=content, **put_kwargs)
+
+    def exists(self, key: str) -> bool:
+        with self.pool_slot():
+            response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=key)
+        return "Contents" in response
+
+    def list_prefix(self, prefix: str, suffix: str | tuple = "") -> Iterator[str]:
+        list_kwargs = {"Bucket": self.bucket_name, "Prefix": prefix}
+        while True:
+            with self.pool_slot():
+                page = self.s3.list_objects_v2(**list_kwargs)
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(suffix):
+                    yield obj["Key"]
+            if not page.get("IsTruncated"):
+                break
+            list_kwargs["ContinuationToken"] = page["NextContinuationToken"]
+
+
+class MemoryStorage(StorageBackend):
+    """
+    A dictionary of contents, e.g. for tests or to chain parsing steps without writing files.
+
+    Parameters:
+        files (dict): The initial contents, by key.
+    """
+    max_workers = 1
+
+    def __init__(self, files: dict = None):
+        self.files = {}
+        self.lock = threading.Lock()
+        for key, content in (files or {}).items():
+            self.put(key, content)
+
+    def __getstate__(self) -> dict:
+        return {"files": self.files}
+
+    def __setstate__(self, state: dict) -> None:
+        self.files = state["files"]
+        self.lock = threading.Lock()
+
+    def get_text(self, key: str) -> str:
+        with self.lock:
+            content = self.files[key]
+        return decompress(content, get_compression(key)).decode("utf-8") if isinstance(content, bytes) else content
+
+    def iter_lines(self, key: str) -> Iterator[str]:
+        yield from self.get_text(key).splitlines(keepends=True)
+
+    def put(self, key: str, content: str | bytes) -> None:
+        content = compress(content, get_compression(key))
+        with self.lock:
+            self.files[key] = content
+
+    def exists(self, key: str) -> bool:
+        return key in self.files
+
+    def list_prefix(self, prefix: str, suffix: str | tuple = "") -> Iterator[str]:
+        with self.lock:
+            keys = sorted(self.files)
+        for key in keys:
+            if key.startswith(prefix) and key.endswith(suffix):
+                yield key
+
+    def get_many(self, keys: Iterable) -> Iterator[tuple]:
+        for key in keys:
+            yield key, self.get_text(key)
+
+    def put_many(self, items: Iterable) -> None:
+        for key, content in items:
+            self.put(key, content)
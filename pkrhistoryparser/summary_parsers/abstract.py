@@ -1,42 +1,97 @@
+import os
 import re
-from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from json import dumps
-from pkrhistoryparser.patterns import winamax as patterns
+from functools import lru_cache
+from hashlib import blake2b
+from pkrhistoryparser.amounts import to_float
+from pkrhistoryparser.base import AbstractParser
+from pkrhistoryparser.compression import get_extension, get_suffixes, iter_unique_stems, strip_extension
+from pkrhistoryparser.dates import to_timestamp
+from pkrhistoryparser.patterns import registry as patterns
+from pkrhistoryparser.pipeline import run_pipeline
+from pkrhistoryparser.serializers import to_json
+
+SUMMARY_FIELDS = {
+    "tournament_id": ("extract_tournament_id", "tournament_id"),
+    "tournament_name": ("extract_tournament_name", "tournament_name"),
+    "speed": ("extract_speed", "speed"),
+    "buy_in": ("extract_buy_in", None),
+    "nb_entries": ("extract_nb_entries", "nb_entries"),
+    "prize_pool": ("extract_prize_pool", "prize_pool"),
+    "registered_players": ("extract_registered_players", "registered_players"),
+    "start_date": ("extract_start_date", "start_date"),
+    "start_timestamp": ("extract_start_timestamp", "start_timestamp"),
+    "levels_structure": ("extract_levels_structure", "levels_structure"),
+    "levels_structure_id": ("extract_levels_structure", "levels_structure_id"),
+    "tournament_type": ("extract_tournament_type", "tournament_type"),
+    "amount_won": ("extract_amount_won", "amount_won"),
+    "bounty_won": ("extract_amount_won", "bounty_won"),
+    "final_position": ("extract_final_position", "final_position"),
+    "entries": ("extract_entries", "entries")
+}
+# Number of distinct levels structures kept parsed, most tournaments sharing a handful of structures
+LEVELS_CACHE_SIZE = 256
+# Extractors of the scanner engine replacing those of the regex engine, with the same results
+SCANNER_EXTRACTORS = {
+    "extract_tournament_id": "scan_tournament_info",
+    "extract_tournament_name": "scan_tournament_info",
+    "extract_prize_pool": "scan_prize_pool",
+    "extract_registered_players": "scan_registered_players",
+    "extract_speed": "scan_speed",
+    "extract_start_date": "scan_start_date",
+    "extract_start_timestamp": "scan_start_timestamp",
+    "extract_levels_structure": "scan_levels_structure",
+    "extract_tournament_type": "scan_tournament_type",
+    "extract_final_position": "scan_final_position"
+}
+
+
+class AbstractSummaryParser(AbstractParser):
+
+    raw_dir: str
+    parsed_dir: str
+    structures_dir: str
+    saved_levels_structure_ids: set
+    with_entries: bool = False
+    with_timestamp: bool = False
+    levels_table: bool = False
+
+    def iter_summary_keys(self) -> Iterator[str]:
+        return iter_unique_stems(self.storage.list_prefix(self.raw_dir, get_suffixes(".txt")))
 
-
-class AbstractSummaryParser(ABC):
-
-    @abstractmethod
     def list_summary_keys(self) -> list:
-        pass
+        return list(self.iter_summary_keys())
+
+    def list_parsed_summary_keys(self) -> list:
+        return list(self.storage.list_prefix(self.parsed_dir, ".json" + get_extension(self.compression)))
 
-    @abstractmethod
     def get_text(self, file_key: str) -> str:
-        pass
+        return self.storage.get_text(file_key)
 
-    @staticmethod
-    def get_parsed_key(summary_key: str) -> str:
-        destination_key = summary_key.replace("raw", "parsed").replace(".txt", ".json")
-        return destination_key
+    def get_parsed_key(self, summary_key: str, fields: tuple = None) -> str:
+        destination_dir = f"projections/{'-'.join(fields)}" if fields else "parsed"
+        destination_key = strip_extension(summary_key).replace("raw", destination_dir).replace(".txt", ".json")
+        return destination_key + get_extension(self.compression)
 
     @staticmethod
-    def to_float(txt_num: str) -> float:
+    def check_fields(fields: list) -> tuple:
         """
-        Transforms any written str number into a float
+        Check that the projected fields are keys of the parsed summary and put them in the order of
+        parse_tournament_summary.
 
         Parameters:
-            txt_num(str): The number to transform
+            fields (list): The keys of the parsed summary to extract.
 
         Returns:
-            (float): The float number
-
+            fields (tuple): The checked fields, in the order of parse_tournament_summary.
         """
-        try:
-            return float(txt_num.replace(",", ".").replace("k", "e3").replace("M", "e6"))
-        except (TypeError, AttributeError, ValueError):
-            return 0.0
+        unknown_fields = set(fields) - set(SUMMARY_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Unknown summary fields: {sorted(unknown_fields)}")
+        return tuple(field for field in SUMMARY_FIELDS if field in fields)
+
+    to_float = staticmethod(to_float)
 
     def extract_prize_pool(self, summary_text: str) -> dict:
         """
@@ -48,7 +103,7 @@ class AbstractSummaryParser(ABC):
         Returns:
             prize_pool (dict): A dictionary containing the prize pool extracted from the poker hand history(prize_pool).
         """
-        prize_pool = re.findall(pattern=patterns.PRIZE_POOL_PATTERN, string=summary_text)[-1]
+        prize_pool = patterns.PRIZE_POOL_PATTERN.findall(summary_text)[-1]
         return {"prize_pool": self.to_float(prize_pool)}
 
     @staticmethod
@@ -63,7 +118,7 @@ class AbstractSummaryParser(ABC):
             registered_players (dict): A dictionary containing the registered players extracted from the poker hand
             history(registered_players).
         """
-        registered_players = re.findall(pattern=patterns.REGISTERED_PLAYERS_PATTERN, string=summary_text)[-1]
+        registered_players = patterns.REGISTERED_PLAYERS_PATTERN.findall(summary_text)[-1]
         return {"registered_players": int(registered_players)}
 
     @staticmethod
@@ -78,7 +133,7 @@ class AbstractSummaryParser(ABC):
             speed (dict): A dictionary containing the speed extracted from the poker hand history(speed).
         """
         try:
-            speed = re.findall(pattern=patterns.SPEED_PATTERN, string=summary_text)[-1]
+            speed = patterns.SPEED_PATTERN.findall(summary_text)[-1]
             return {"speed": speed}
         except IndexError:
             return {"speed": "normal"}
@@ -94,9 +149,22 @@ class AbstractSummaryParser(ABC):
         Returns:
             start_date (dict): A dictionary containing the start date extracted from the poker hand history(start_date).
         """
-        start_date = re.findall(pattern=patterns.START_DATE_PATTERN, string=summary_text)[-1]
+        start_date = patterns.START_DATE_PATTERN.findall(summary_text)[-1]
         return {"start_date": start_date}
 
+    def extract_start_timestamp(self, summary_text: str) -> dict:
+        """
+        Extract the start date of the tournament as a timestamp, to sort the tournaments.
+
+        Parameters:
+            summary_text (str): The raw poker hand text as a string.
+
+        Returns:
+            start_timestamp (dict): A dictionary containing the number of seconds between the epoch and the UTC start
+            date of the tournament (start_timestamp).
+        """
+        return {"start_timestamp": to_timestamp(self.extract_start_date(summary_text)["start_date"])}
+
     def extract_levels_structure(self, summary_text: str) -> dict:
         """
         Extract the levels structure information from a poker summary.
@@ -108,23 +176,79 @@ class AbstractSummaryParser(ABC):
             levels_structure (dict): A dictionary containing the levels structure extracted from the poker hand history
             (levels_structure).
         """
-        levels_text = re.findall(pattern=patterns.LEVELS_STRUCTURE_PATTERN, string=summary_text)[-1][0]
-        levels = re.findall(patterns.LEVEL_BLINDS_PATTERN, levels_text)
-        levels_structure = [
-            self.extract_level_from_structure(level_tuple=level_tuple, level_value=level_value)
+        levels_text = patterns.LEVELS_STRUCTURE_PATTERN.findall(summary_text)[-1][0]
+        return self.get_levels_structure(levels_text)
+
+    def get_levels_structure(self, levels_text: str) -> dict:
+        """
+        Get the levels structure of the Levels line of a summary, parsed once for all the summaries sharing it, and
+        save it in the structures table the first time it is met if the parser writes one.
+
+        Parameters:
+            levels_text (str): The text between the brackets of the Levels line.
+
+        Returns:
+            levels_structure (dict): A dictionary containing the levels structure and its id (levels_structure,
+            levels_structure_id). Each summary gets its own list of levels, built from the cached structure.
+        """
+        levels_structure_id, levels = self.parse_levels_text(levels_text)
+        levels_structure = [dict(level) for level in levels]
+        if self.levels_table:
+            self.save_levels_structure(levels_structure_id, levels_structure)
+        return {"levels_structure": levels_structure, "levels_structure_id": levels_structure_id}
+
+    @staticmethod
+    @lru_cache(maxsize=LEVELS_CACHE_SIZE)
+    def parse_levels_text(levels_text: str) -> tuple:
+        """
+        Parse the blinds of the levels listed in the Levels line of a summary. The last parsed structures are cached
+        by their text, each level as a tuple of its (key, value) pairs so that the cached structures cannot be modified.
+
+        Parameters:
+            levels_text (str): The text between the brackets of the Levels line.
+
+        Returns:
+            levels_structure (tuple): The id of the structure, a hash of its text, and the tuple of its levels.
+        """
+        levels_structure_id = blake2b(levels_text.encode("utf-8"), digest_size=8).hexdigest()
+        levels = patterns.LEVEL_BLINDS_PATTERN.findall(levels_text)
+        levels_structure = tuple(
+            tuple(AbstractSummaryParser.extract_level_from_structure(level_tuple=level_tuple,
+                                                                     level_value=level_value).items())
             for level_value, level_tuple in enumerate(levels, start=1)
-        ]
-        return {"levels_structure": levels_structure}
+        )
+        return levels_structure_id, levels_structure
 
-    def extract_level_from_structure(self, level_tuple: tuple, level_value: int) -> dict:
+    @staticmethod
+    def extract_level_from_structure(level_tuple: tuple, level_value: int) -> dict:
 
         return {
             "value": level_value if level_value < 300 else 1,
-            "sb": self.to_float(level_tuple[0]),
-            "bb": self.to_float(level_tuple[1]),
-            "ante": self.to_float(level_tuple[2])
+            "sb": to_float(level_tuple[0]),
+            "bb": to_float(level_tuple[1]),
+            "ante": to_float(level_tuple[2])
         }
 
+    def get_levels_structure_key(self, levels_structure_id: str) -> str:
+        return os.path.join(self.structures_dir, f"{levels_structure_id}.json{get_extension(self.compression)}")
+
+    def save_levels_structure(self, levels_structure_id: str, levels_structure: list) -> None:
+        """
+        Save a levels structure in the structures table, unless this parser has already seen it or it is already
+        saved.
+
+        Parameters:
+            levels_structure_id (str): The id of the structure.
+            levels_structure (list): The levels of the structure.
+        """
+        if levels_structure_id in self.saved_levels_structure_ids:
+            return
+        self.saved_levels_structure_ids.add(levels_structure_id)
+        structure_key = self.get_levels_structure_key(levels_structure_id)
+        if not self.storage.exists(structure_key):
+            structure_info = {"levels_structure_id": levels_structure_id, "levels_structure": levels_structure}
+            self.storage.put(structure_key, to_json(structure_info, self.json_format))
+
     @staticmethod
     def extract_tournament_type(summary_text: str) -> dict:
         """
@@ -137,7 +261,7 @@ class AbstractSummaryParser(ABC):
             tournament_type (dict): A dictionary containing the tournament type extracted from the poker hand
             history(tournament_type).
         """
-        tournament_type = re.findall(pattern=patterns.TOURNAMENT_TYPE_PATTERN, string=summary_text)[-1]
+        tournament_type = patterns.TOURNAMENT_TYPE_PATTERN.findall(summary_text)[-1]
         return {"tournament_type": tournament_type}
 
     @staticmethod
@@ -153,7 +277,7 @@ class AbstractSummaryParser(ABC):
             history(tournament_id).
         """
         try:
-            match = re.search(pattern=patterns.SUMMARY_TOURNAMENT_INFO_PATTERN, string=summary_text)
+            match = patterns.SUMMARY_TOURNAMENT_INFO_PATTERN.search(summary_text)
             tournament_id = match.group(2)
             return {"tournament_id": tournament_id}
         except AttributeError:
@@ -172,7 +296,7 @@ class AbstractSummaryParser(ABC):
             tournament_name (dict): A dictionary containing the tournament name extracted from the poker hand
             history(tournament_name).
         """
-        match = re.search(pattern=patterns.SUMMARY_TOURNAMENT_INFO_PATTERN, string=summary_text)
+        match = patterns.SUMMARY_TOURNAMENT_INFO_PATTERN.search(summary_text)
         tournament_name = match.group(1)
         return {"tournament_name": tournament_name}
 
@@ -190,7 +314,7 @@ class AbstractSummaryParser(ABC):
         """
         try:
 
-            match = re.search(pattern=patterns.BUY_IN_PATTERN, string=summary_text)
+            match = patterns.BUY_IN_PATTERN.search(summary_text)
             prize_pool_contribution = self.to_float(match.group(1))
             bounty = self.to_float(match.group(2))
             rake = self.to_float(match.group(3))
@@ -209,7 +333,7 @@ class AbstractSummaryParser(ABC):
         Returns:
             final_position (dict): A dict containing the final position of the player.
         """
-        match = re.findall(pattern=patterns.FINAL_POSITION_PATTERN, string=summary_text)
+        match = patterns.FINAL_POSITION_PATTERN.findall(summary_text)
         final_position = int(match[-1]) if match else 0
         return {"final_position": final_position}
 
@@ -223,11 +347,30 @@ class AbstractSummaryParser(ABC):
         Returns:
             amount_won (dict): A dict containing the amount won by the player.
         """
-        matches = re.findall(patterns.AMOUNT_WON_PATTERN, string=summary_text)
+        matches = patterns.AMOUNT_WON_PATTERN.findall(summary_text)
         total_amount = sum([self.to_float(match[0]) for match in matches])
         total_bounty = sum([self.to_float(match[2]) for match in matches])
         return {"amount_won": total_amount, "bounty_won": total_bounty}
 
+    @staticmethod
+    def iter_entry_spans(summary_text: str) -> Iterator[tuple]:
+        """
+        Iterate over the entries of a summary (one per re-entry in the tournament) without copying their texts.
+
+        Parameters:
+            summary_text (str): The raw poker hand text as a string.
+
+        Returns:
+            spans (Iterator[tuple]): The (start, end) offsets of each entry in the summary text.
+        """
+        start = None
+        for match in patterns.SPLIT_PATTERN.finditer(summary_text):
+            if start is not None:
+                yield start, match.start()
+            start = match.start()
+        if start is not None:
+            yield start, len(summary_text)
+
     def extract_nb_entries(self, summary_text: str) -> dict:
         """
         Extract the number of entries in the tournament
@@ -238,68 +381,212 @@ class AbstractSummaryParser(ABC):
         Returns:
             nb_entries (dict): A dict containing the number of entries in the tournament.
         """
-        split_histories = re.split(patterns.SPLIT_PATTERN, summary_text)
-        split_histories.pop(0)
-        return {"nb_entries": len(split_histories)}
+        return {"nb_entries": sum(1 for _ in self.iter_entry_spans(summary_text))}
+
+    def extract_entry(self, summary_text: str, start: int, end: int) -> dict:
+        """
+        Extract the result of a single entry, only searching its span of the summary text.
+
+        Parameters:
+            summary_text (str): The raw poker hand text as a string.
+            start (int): The offset of the start of the entry.
+            end (int): The offset of the end of the entry.
+
+        Returns:
+            entry (dict): A dict containing the final position, the amount won and the bounty won with the entry.
+        """
+        final_positions = patterns.FINAL_POSITION_PATTERN.findall(summary_text, start, end)
+        amounts_won = patterns.AMOUNT_WON_PATTERN.findall(summary_text, start, end)
+        return {
+            "final_position": int(final_positions[-1]) if final_positions else 0,
+            "amount_won": sum([self.to_float(match[0]) for match in amounts_won]),
+            "bounty_won": sum([self.to_float(match[2]) for match in amounts_won])
+        }
+
+    def extract_entries(self, summary_text: str) -> dict:
+        """
+        Extract the result of each entry in the tournament, in the order of the summary.
+
+        Parameters:
+            summary_text (str): The raw poker hand text as a string.
+
+        Returns:
+            entries (dict): A dict containing the list of the results of the entries.
+        """
+        return {"entries": [self.extract_entry(summary_text, start, end)
+                            for start, end in self.iter_entry_spans(summary_text)]}
+
+    @staticmethod
+    def find_last(pattern: re.Pattern, summary_text: str, keyword: str, offset: int = 0) -> re.Match | None:
+        """
+        Find the last match of a pattern by searching the text backwards for a keyword, found at a fixed offset from
+        the start of every match, and matching the pattern there. The earlier occurrences are only tried if the last
+        ones do not match, so that the result is the last match listed by findall.
+        Args:
+            pattern: The compiled pattern
+            summary_text: The raw text of the summary
+            keyword: A literal text found in every match of the pattern
+            offset: The position of the keyword in the matches
+
+        Returns:
+            match: The last match of the pattern, None if there is none
+        """
+        position = len(summary_text)
+        while (position := summary_text.rfind(keyword, 0, position)) != -1:
+            if position >= offset and (match := pattern.match(summary_text, position - offset)):
+                return match
+        return None
+
+    def get_last_group(self, pattern: re.Pattern, summary_text: str, keyword: str, offset: int = 0) -> str:
+        """
+        Get the first group of the last match of a pattern, which must be found in the summary
+        Args:
+            pattern: The compiled pattern
+            summary_text: The raw text of the summary
+            keyword: A literal text found in every match of the pattern
+            offset: The position of the keyword in the matches
+
+        Returns:
+            group: The first group of the last match
+        """
+        match = self.find_last(pattern, summary_text, keyword, offset)
+        if match is None:
+            raise IndexError(f"No match of {pattern.pattern} in the summary")
+        return match.group(1)
+
+    @staticmethod
+    def scan_tournament_info(summary_text: str) -> dict:
+        """
+        Extract the tournament id and name with a single search
+        Args:
+            summary_text: The raw text of the summary
+
+        Returns:
+            tournament_info: A dictionary containing the tournament id and name (tournament_id, tournament_name)
+        """
+        match = patterns.SUMMARY_TOURNAMENT_INFO_PATTERN.search(summary_text)
+        if match is None:
+            raise AttributeError(f"No tournament info in the summary: {summary_text[:100]}")
+        return {"tournament_id": match.group(2), "tournament_name": match.group(1)}
+
+    def scan_prize_pool(self, summary_text: str) -> dict:
+        prize_pool = self.get_last_group(patterns.PRIZE_POOL_PATTERN, summary_text, "Prizepool")
+        return {"prize_pool": self.to_float(prize_pool)}
+
+    def scan_registered_players(self, summary_text: str) -> dict:
+        registered_players = self.get_last_group(patterns.REGISTERED_PLAYERS_PATTERN, summary_text, "Registered")
+        return {"registered_players": int(registered_players)}
+
+    def scan_speed(self, summary_text: str) -> dict:
+        match = self.find_last(patterns.SPEED_PATTERN, summary_text, "Speed")
+        return {"speed": match.group(1) if match else "normal"}
+
+    def scan_start_date(self, summary_text: str) -> dict:
+        # The dates end with " UTC", 20 characters after their start
+        return {"start_date": self.get_last_group(patterns.START_DATE_PATTERN, summary_text, "UTC", offset=20)}
+
+    def scan_start_timestamp(self, summary_text: str) -> dict:
+        return {"start_timestamp": to_timestamp(self.scan_start_date(summary_text)["start_date"])}
+
+    def scan_levels_structure(self, summary_text: str) -> dict:
+        return self.get_levels_structure(self.get_last_group(patterns.LEVELS_STRUCTURE_PATTERN, summary_text, "Levels"))
+
+    def scan_tournament_type(self, summary_text: str) -> dict:
+        return {"tournament_type": self.get_last_group(patterns.TOURNAMENT_TYPE_PATTERN, summary_text, "Type")}
+
+    def scan_final_position(self, summary_text: str) -> dict:
+        # The matches start with "You finished"
+        match = self.find_last(patterns.FINAL_POSITION_PATTERN, summary_text, "finished", offset=4)
+        return {"final_position": int(match.group(1)) if match else 0}
+
+    def get_default_fields(self) -> tuple:
+        """
+        Get the fields extracted when none are requested: the levels structure inline, or its id if the parser writes
+        a structures table, the result of each entry and the start timestamp if the parser is set to add them
+        Returns:
+            fields: The default fields, in the order of parse_tournament_summary
+        """
+        excluded_fields = {"levels_structure" if self.levels_table else "levels_structure_id"}
+        if not self.with_entries:
+            excluded_fields.add("entries")
+        if not self.with_timestamp:
+            excluded_fields.add("start_timestamp")
+        return tuple(field for field in SUMMARY_FIELDS if field not in excluded_fields)
 
-    def parse_tournament_summary(self, summary_text: str) -> dict:
+    def parse_tournament_summary(self, summary_text: str, fields: list = None) -> dict:
         """
         Get all the information from a poker summary.
+        Each field is read from the result of its extractor (see SUMMARY_FIELDS), which is only run once and only
+        if one of the requested fields needs it. The scanner engine replaces the extractors listing every match of a
+        pattern to keep the last one by a backward search (see SCANNER_EXTRACTORS), with the same results.
         Args:
             summary_text (str): The raw text of the summary
+            fields (list): The keys of the dictionary to extract, all of them by default (the results of the entries
+            and the start timestamp are only extracted if requested, or if with_entries or with_timestamp is set)
         Returns:
             summary_info (dict): A dictionary containing all the information extracted from the poker
         """
-        summary_info = {
-            "tournament_id": self.extract_tournament_id(summary_text)["tournament_id"],
-            "tournament_name": self.extract_tournament_name(summary_text)["tournament_name"],
-            "speed": self.extract_speed(summary_text)["speed"],
-            "buy_in": self.extract_buy_in(summary_text),
-            "nb_entries": self.extract_nb_entries(summary_text)["nb_entries"],
-            "prize_pool": self.extract_prize_pool(summary_text)["prize_pool"],
-            "registered_players": self.extract_registered_players(summary_text)["registered_players"],
-            "start_date": self.extract_start_date(summary_text)["start_date"],
-            "levels_structure": self.extract_levels_structure(summary_text)["levels_structure"],
-            "tournament_type": self.extract_tournament_type(summary_text)["tournament_type"],
-            "amount_won": self.extract_amount_won(summary_text)["amount_won"],
-            "bounty_won": self.extract_amount_won(summary_text)["bounty_won"],
-            "final_position": self.extract_final_position(summary_text)["final_position"],
-
-        }
+        extractions = {}
+        summary_info = {}
+        for field in self.get_default_fields() if fields is None else self.check_fields(fields):
+            extractor_name, extraction_key = SUMMARY_FIELDS[field]
+            if self.engine == "scanner":
+                extractor_name = SCANNER_EXTRACTORS.get(extractor_name, extractor_name)
+            if extractor_name not in extractions:
+                extractions[extractor_name] = getattr(self, extractor_name)(summary_text)
+            extraction = extractions[extractor_name]
+            summary_info[field] = extraction[extraction_key] if extraction_key else extraction
         return summary_info
 
-    @abstractmethod
     def check_is_parsed(self, summary_key: str) -> bool:
-        pass
+        return self.storage.exists(self.get_parsed_key(summary_key))
 
-    def parse_to_json(self, summary_key: str) -> str:
+    def parse_to_json(self, summary_key: str, fields: list = None) -> str:
         """
         Parse a summary to a json string
         Args:
             summary_key:  The key of the summary to parse
+            fields: The keys of the parsed summary to extract, all of them by default
 
         Returns:
             json_summary: The json string of the parsed summary
         """
         print(summary_key)
         summary_text = self.get_text(summary_key)
-        summary_info = self.parse_tournament_summary(summary_text)
-        json_summary = dumps(summary_info, indent=4, sort_keys=True, ensure_ascii=False)
+        json_summary = self.parse_summary_content(summary_text, fields=fields)
+        return json_summary
+
+    def parse_summary_content(self, summary_text: str, fields: list = None) -> str:
+        """
+        Parse the text of a summary to a json string
+        Args:
+            summary_text: The raw text of the summary
+            fields: The keys of the parsed summary to extract, all of them by default
+
+        Returns:
+            json_summary: The json string of the parsed summary
+        """
+        summary_info = self.parse_tournament_summary(summary_text, fields=fields)
+        json_summary = to_json(summary_info, self.json_format, sort_keys=True)
         return json_summary
 
-    @abstractmethod
-    def save_parsed_summary(self, summary_key: str, json_summary: str) -> None:
-        pass
+    def save_parsed_summary(self, summary_key: str, json_summary: str, fields: tuple = None) -> None:
+        self.storage.put(self.get_parsed_key(summary_key, fields), json_summary)
 
-    def parse_summary(self, summary_key: str) -> None:
+    def parse_summary(self, summary_key: str, fields: list = None) -> None:
         """
         Parse a summary to a JSON string
+        Projected summaries are saved in a projections directory named after their fields, so that they are never
+        taken for fully parsed summaries.
         Args:
             summary_key: The key of the summary to parse
+            fields: The keys of the parsed summary to extract, all of them by default
         """
-        print(f"\n Parsing summary: {summary_key} to {self.get_parsed_key(summary_key)}")
-        json_summary = self.parse_to_json(summary_key)
-        self.save_parsed_summary(summary_key, json_summary)
+        if fields is not None:
+            fields = self.check_fields(fields)
+        print(f"\n Parsing summary: {summary_key} to {self.get_parsed_key(summary_key, fields)}")
+        json_summary = self.parse_to_json(summary_key, fields=fields)
+        self.save_parsed_summary(summary_key, json_summary, fields=fields)
 
     def parse_new_summary(self, summary_key: str) -> None:
         """
@@ -310,26 +597,61 @@ class AbstractSummaryParser(ABC):
         if not self.check_is_parsed(summary_key):
             self.parse_summary(summary_key)
 
-    def parse_summaries(self) -> None:
+    def parse_summaries(self, fields: list = None) -> None:
         """
         Parse all the summaries in the raw directory
+        The summary keys are listed lazily as they are parsed, so that the memory used does not depend on their number.
+        Args:
+            fields: The keys of the parsed summaries to extract, all of them by default
         """
-        summary_keys = self.list_summary_keys()[::-1]
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_summary, summary_key) for summary_key in summary_keys]
-            for future in as_completed(futures):
-                future.result()
+        summary_keys = self.iter_summary_keys()
+        self.run_tasks("parse_summary", summary_keys, fields=fields)
         print(f"Finished parsing summaries at {datetime.now()}")
 
+    def parse_summaries_pipeline(self, summary_keys: Iterable = None, fields: list = None) -> list:
+        """
+        Parse summaries with overlapping fetch, parse and save stages, so that the network and the CPU are busy at the
+        same time. The parse stage runs in processes with the process executor and in threads otherwise.
+        Args:
+            summary_keys: The keys of the summaries to parse, all the summaries in the raw directory by default
+            fields: The keys of the parsed summaries to extract, all of them by default
+
+        Returns:
+            failed_keys: The keys that could not be parsed and saved
+        """
+        fields = self.check_fields(fields) if fields is not None else None
+        summary_keys = self.iter_summary_keys() if summary_keys is None else summary_keys
+        failed_keys = run_pipeline(
+            self, summary_keys, "get_text", "parse_summary_content", "save_parsed_summary",
+            method_kwargs={"fields": fields}, executor=self.executor, fetch_workers=self.fetch_workers,
+            parse_workers=self.max_workers, upload_workers=self.upload_workers, queue_size=self.queue_size)
+        print(f"Finished parsing summaries at {datetime.now()}, {len(failed_keys)} failed")
+        self.print_storage_stats()
+        return failed_keys
+
+    def parse_summaries_batch(self, summary_keys: Iterable, fields: list = None) -> None:
+        """
+        Parse a batch of summaries, reading and writing them with the batched operations of the storage
+        Args:
+            summary_keys: The keys of the summaries to parse
+            fields: The keys of the parsed summaries to extract, all of them by default
+        """
+        fields = self.check_fields(fields) if fields is not None else None
+        self.storage.put_many(
+            (self.get_parsed_key(summary_key, fields), self.parse_summary_content(summary_text, fields=fields))
+            for summary_key, summary_text in self.storage.get_many(summary_keys))
+
     def parse_new_summaries(self) -> None:
         """
-        Parse all the summaries in the raw directory if they have not already been parsed
+        Parse all the summaries in the raw directory if they have not already been parsed.
+        The parsed keys are listed once and the new summary keys are found by set difference.
         """
         summary_keys = self.list_summary_keys()[::-1]
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_new_summary, summary_key) for summary_key in summary_keys]
-            for future in as_completed(futures):
-                future.result()
+        parsed_keys = set(self.list_parsed_summary_keys())
+        new_summary_keys = [
+            summary_key for summary_key in summary_keys if self.get_parsed_key(summary_key) not in parsed_keys]
+        print(f"{len(new_summary_keys)} of {len(summary_keys)} summaries are not parsed yet")
+        self.run_tasks("parse_summary", new_summary_keys)
         print(f"Finished parsing summaries at {datetime.now()}")
 
 
@@ -1,30 +1,34 @@
-import boto3
+from pkrhistoryparser.compression import OUTPUT_COMPRESSION, check_compression
+from pkrhistoryparser.executors import check_executor, get_nb_workers
+from pkrhistoryparser.serializers import JSON_FORMAT, check_json_format
+from pkrhistoryparser.storage import S3_MAX_POOL_CONNECTIONS, S3Storage
 from pkrhistoryparser.summary_parsers.abstract import AbstractSummaryParser
 
 
 class CloudSummaryParser(AbstractSummaryParser):
-    def __init__(self, bucket_name: str):
+    def __init__(self, bucket_name: str, engine: str = "regex", executor: str = "thread", max_workers: int = None,
+                 s3_client=None, compression: str = None, json_format: str = None, with_entries: bool = False,
+                 levels_table: bool = False, with_timestamp: bool = False):
         self.bucket_name = bucket_name
-        self.s3 = boto3.client("s3")
+        self.compression = check_compression(compression or OUTPUT_COMPRESSION)
+        self.json_format = check_json_format(json_format or JSON_FORMAT)
+        self.engine = self.check_engine(engine)
+        self.executor = check_executor(executor)
+        self.max_workers = max_workers
+        self.with_entries = with_entries
+        self.levels_table = levels_table
+        self.with_timestamp = with_timestamp
+        # One connection per thread of the executor or of the fetch and upload stages of the pipeline
+        pool_size = S3_MAX_POOL_CONNECTIONS or max(
+            get_nb_workers(self.executor, max_workers), self.fetch_workers + self.upload_workers)
+        self.storage = S3Storage(bucket_name, s3_client, max_pool_connections=pool_size)
         self.raw_prefix = "data/summaries/raw"
         self.parsed_prefix = "data/summaries/parsed"
+        self.structures_dir = "data/summaries/structures"
+        self.saved_levels_structure_ids = set()
+        self.raw_dir = self.raw_prefix
+        self.parsed_dir = self.parsed_prefix
 
-    def list_summary_keys(self) -> list:
-        paginator = self.s3.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=self.raw_prefix)
-        keys = [obj["Key"] for page in pages for obj in page.get("Contents", [])]
-        return keys
-
-    def get_text(self, file_key: str) -> str:
-        response = self.s3.get_object(Bucket=self.bucket_name, Key=file_key)
-        content = response["Body"].read().decode("utf-8")
-        return content
-
-    def check_is_parsed(self, summary_key: str) -> bool:
-        parsed_key = self.get_parsed_key(summary_key)
-        response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=parsed_key)
-        return "Contents" in response
-
-    def save_parsed_summary(self, summary_key: str, json_summary: str) -> None:
-        parsed_key = self.get_parsed_key(summary_key)
-        self.s3.put_object(Bucket=self.bucket_name, Key=parsed_key, Body=json_summary)
+    @property
+    def s3(self):
+        return self.storage.s3
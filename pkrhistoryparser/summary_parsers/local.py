@@ -1,37 +1,33 @@
 import os
+from pkrhistoryparser.compression import OUTPUT_COMPRESSION, check_compression
+from pkrhistoryparser.executors import check_executor
+from pkrhistoryparser.serializers import JSON_FORMAT, check_json_format
+from pkrhistoryparser.storage import LocalStorage
 from .abstract import AbstractSummaryParser
 
 
 class LocalSummaryParser(AbstractSummaryParser):
 
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, engine: str = "regex", executor: str = "thread", max_workers: int = None,
+                 compression: str = None, json_format: str = None, with_entries: bool = False,
+                 levels_table: bool = False, with_timestamp: bool = False):
         data_dir = self.correct_data_dir(data_dir)
+        self.storage = LocalStorage()
+        self.compression = check_compression(compression or OUTPUT_COMPRESSION)
+        self.json_format = check_json_format(json_format or JSON_FORMAT)
+        self.engine = self.check_engine(engine)
+        self.executor = check_executor(executor)
+        self.max_workers = max_workers
+        self.with_entries = with_entries
+        self.levels_table = levels_table
+        self.with_timestamp = with_timestamp
         self.raw_dir = os.path.join(data_dir, "summaries", "raw")
         self.parsed_dir = os.path.join(data_dir, "summaries", "parsed")
+        self.structures_dir = os.path.join(data_dir, "summaries", "structures")
+        self.saved_levels_structure_ids = set()
 
     @staticmethod
     def correct_data_dir(data_dir: str) -> str:
         if not os.path.exists(data_dir):
             data_dir = data_dir.replace("C:/", "/mnt/c/")
         return data_dir
-
-    def list_summary_keys(self) -> list:
-        summaries_list = [os.path.join(root, file)
-                          for root, _, files in os.walk(self.raw_dir)
-                          for file in files if file.endswith(".txt")]
-        return summaries_list
-
-    def get_text(self, file_key: str) -> str:
-        with open(file_key, "r", encoding="utf-8") as file:
-            content = file.read()
-        return content
-
-    def check_is_parsed(self, summary_key: str) -> bool:
-        parsed_key = self.get_parsed_key(summary_key)
-        return os.path.exists(parsed_key)
-
-    def save_parsed_summary(self, summary_key: str, json_summary: str) -> None:
-        parsed_key = self.get_parsed_key(summary_key)
-        os.makedirs(os.path.dirname(parsed_key), exist_ok=True)
-        with open(parsed_key, "w", encoding="utf-8") as file:
-            file.write(json_summary)
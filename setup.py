@@ -7,6 +7,12 @@ install_requires = [
     "python-dotenv"
 ]
 
+extras_require = {
+    "columnar": ["pyarrow", "numpy"],
+    "zstd": ["zstandard"],
+    "orjson": ["orjson"]
+}
+
 classifiers = [
     "Development Status :: 4 - Beta",
     "Intended Audience :: Developers",
@@ -42,5 +48,6 @@ setup(
     packages=find_packages(exclude=["tests", ".venv", "venv", "venv.*"]),
     python_requires=">=3.10",
     install_requires=install_requires,
+    extras_require=extras_require,
     license="MIT",
 )
@@ -0,0 +1,81 @@
+import unittest
+import json
+import os
+
+from datetime import datetime, timezone
+from unittest import mock
+
+from pkrhistoryparser import serializers
+from pkrhistoryparser.amounts import to_float
+from pkrhistoryparser.dates import format_datetime, to_timestamp
+from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+from pkrhistoryparser.serializers import check_json_format, to_compact_json, to_json
+from pkrhistoryparser.summary_parsers.local import LocalSummaryParser
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestSerializers(unittest.TestCase):
+    def setUp(self):
+        parsed_key = os.path.join(TESTS_DIR, "history_parser", "parsed_files", "example01.json")
+        with open(parsed_key, encoding="utf-8") as file:
+            self.json_hand = file.read()
+        self.hand_info = json.loads(self.json_hand)
+        self.hand_info["players"] = {int(seat): player for seat, player in self.hand_info["players"].items()}
+
+    def test_compat_format(self):
+        self.assertEqual(to_json(self.hand_info), self.json_hand)
+        self.assertEqual(to_json(self.hand_info, sort_keys=True),
+                         json.dumps(self.hand_info, indent=4, sort_keys=True, ensure_ascii=False))
+
+    def test_compact_format(self):
+        for orjson in [serializers.orjson, None]:
+            with mock.patch.object(serializers, "orjson", orjson):
+                json_hand = to_json(self.hand_info, json_format="compact")
+                self.assertEqual(json_hand, to_compact_json(self.hand_info))
+                self.assertNotIn("\n", json_hand)
+                self.assertEqual(json.loads(json_hand), json.loads(self.json_hand))
+                self.assertEqual(list(json.loads(to_compact_json({"b": 1, "a": 2}, sort_keys=True))), ["a", "b"])
+
+    def test_unknown_format(self):
+        self.assertEqual(check_json_format("compact"), "compact")
+        with self.assertRaises(ValueError):
+            check_json_format("pretty")
+
+
+class TestToFloat(unittest.TestCase):
+    @staticmethod
+    def replace_to_float(txt_num) -> float:
+        try:
+            return float(txt_num.replace(",", ".").replace("k", "e3").replace("M", "e6"))
+        except (TypeError, AttributeError, ValueError):
+            return 0.0
+
+    def test_same_numbers(self):
+        txt_nums = ["0", "1200", "007", "12.5", "0,75", "1.5k", "2M", "12,5k", "", "k", "1..2", "²", "１２", " 12 ",
+                    None, 12, b"12"]
+        for txt_num in txt_nums:
+            self.assertEqual(to_float(txt_num), self.replace_to_float(txt_num), txt_num)
+
+    def test_shared_by_parsers(self):
+        self.assertIs(LocalHandHistoryParser.to_float, to_float)
+        self.assertIs(LocalSummaryParser.to_float, to_float)
+
+
+class TestDates(unittest.TestCase):
+    def test_same_datetimes(self):
+        datetime_texts = ["2023/01/04 17:36:27", "1970/01/01 00:00:00", "2024/02/29 23:59:59", "2021/10/17 09:05:07"]
+        for datetime_text in datetime_texts:
+            dt = datetime.strptime(datetime_text, "%Y/%m/%d %H:%M:%S")
+            self.assertEqual(format_datetime(datetime_text), dt.strftime("%d-%m-%Y %H:%M:%S"))
+            self.assertEqual(to_timestamp(datetime_text), int(dt.replace(tzinfo=timezone.utc).timestamp()))
+
+    def test_invalid_date(self):
+        with self.assertRaises(ValueError):
+            format_datetime("2023/02/30 17:36:27")
+        for datetime_text in ["2023/01/04 24:36:27", "2023/01/04 17:60:27", "2023/01/04 17:36:7", "2023/01/04 17-36-27",
+                              "2023/01/04T17:36:27", "2023/01/04 1a:36:27"]:
+            with self.assertRaises(ValueError):
+                format_datetime(datetime_text)
+            with self.assertRaises(ValueError):
+                to_timestamp(datetime_text)
@@ -1,7 +1,18 @@
 import unittest
+import gzip
+import inspect
+import json
 import os
+import shutil
+import tempfile
+import threading
+import types
+from unittest import mock
 
+from pkrhistoryparser.history_parsers.cloud import CloudHandHistoryParser
 from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+from pkrhistoryparser.local_s3 import LocalS3Client
+from pkrhistoryparser.models import Hand, LazyHand, Street
 from pkrhistoryparser.settings import TEST_DATA_DIR
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -221,4 +232,469 @@ class Test01(unittest.TestCase):
              'tournament_info', 'hero_hand', 'postings', 'actions', 'flop', 'turn', 'river', 'showdown',
              'winners', "buy_in"
              }
-        )
\ No newline at end of file
+        )
+
+
+class TestScannerEngine(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.scanner = LocalHandHistoryParser(data_dir=TEST_DATA_DIR, engine="scanner")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            LocalHandHistoryParser(data_dir=TEST_DATA_DIR, engine="unknown")
+
+    def test_split_hand_sections(self):
+        hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+        sections = self.scanner.split_hand_sections(hand_text)
+        self.assertIn("HandId: #2612804708405870609-6-1672853787", sections["header"])
+        self.assertEqual(sections["hero"], "Dealt to manggy94 [2c 5h]")
+        self.assertEqual(set(sections["streets"].keys()), {"preflop", "flop", "turn", "river"})
+
+    def test_scan_hand(self):
+        for example in ["example01.txt", "example03.txt"]:
+            hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", example))
+            self.assertEqual(self.scanner.parse_hand(hand_text), self.parser.parse_hand(hand_text))
+
+
+class TestRawHistory(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.hand_texts = [
+            self.parser.get_text(os.path.join(TEST_DIR, "split_files", example))
+            for example in ["example01.txt", "example03.txt"]
+        ]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.raw_key = os.path.join(self.temp_dir.name, "histories", "raw", "history.txt")
+        os.makedirs(os.path.dirname(self.raw_key))
+        self.parser.write_text(self.raw_key, "".join(f"Winamax Poker -{text}" for text in self.hand_texts))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_hands(self):
+        hands = list(self.parser.iter_hands(self.raw_key))
+        self.assertEqual(hands, [f"Winamax Poker -{text}" for text in self.hand_texts])
+
+    def test_iter_parsed_hands(self):
+        parsed_hands = list(self.parser.iter_parsed_hands(self.raw_key))
+        self.assertEqual(parsed_hands, [self.parser.parse_hand(text) for text in self.hand_texts])
+
+    def test_parse_raw_history(self):
+        self.parser.parse_raw_history(self.raw_key)
+        parsed_key = os.path.join(self.temp_dir.name, "histories", "parsed", "history",
+                                  "2612804708405870609-6-1672853787.json")
+        self.assertTrue(os.path.exists(parsed_key))
+
+
+class TestExecutors(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "split_files", example), split_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="unknown")
+
+    def test_parsers_parameters(self):
+        for parser_class in [LocalHandHistoryParser, CloudHandHistoryParser]:
+            parameters = list(inspect.signature(parser_class).parameters)
+            self.assertEqual(parameters[1:4], ["engine", "executor", "max_workers"], parser_class.__name__)
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="process", max_workers=3)
+        self.assertEqual(parser.max_workers, 3)
+
+    def test_parse_hand_histories(self):
+        for executor in ["thread", "process", "inline"]:
+            parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor=executor)
+            shutil.rmtree(parser.parsed_dir, ignore_errors=True)
+            parser.parse_hand_histories()
+            parsed_files = sorted(os.listdir(parser.parsed_dir))
+            self.assertEqual(parsed_files, ["example01.json", "example03.json"])
+
+    def test_iter_split_histories_keys(self):
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name)
+        split_keys = parser.iter_split_histories_keys()
+        self.assertIsInstance(split_keys, types.GeneratorType)
+        self.assertEqual(sorted(split_keys), sorted(parser.list_split_histories_keys()))
+
+    def test_iter_tasks_bounded(self):
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="thread")
+        parser.max_workers, parser.max_in_flight = 2, 3
+        nb_read_keys = []
+
+        def keys():
+            for index in range(100):
+                nb_read_keys.append(index)
+                yield str(index)
+
+        results = parser.iter_tasks("get_parsed_key", keys())
+        first_key, first_result = next(results)
+        self.assertLessEqual(len(nb_read_keys), 4)
+        self.assertEqual(first_result, parser.get_parsed_key(first_key))
+        self.assertEqual(len(list(results)), 99)
+
+    def test_iter_tasks_process(self):
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="process")
+        parser.max_workers, parser.batch_size = 2, 7
+        results = dict(parser.iter_tasks("get_parsed_key", (f"split/{index}.txt" for index in range(50))))
+        self.assertEqual(len(results), 50)
+        self.assertEqual(results["split/3.txt"], "parsed/3.json")
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "split_files", example), split_dir)
+        self.parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, output="jsonl")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unknown_output(self):
+        with self.assertRaises(ValueError):
+            LocalHandHistoryParser(data_dir=self.temp_dir.name, output="unknown")
+
+    def test_parse_hand_histories(self):
+        self.parser.parse_hand_histories()
+        manifest_keys = [key for key in os.listdir(self.parser.shards_dir) if key.startswith("manifest")]
+        self.assertEqual(len(manifest_keys), 1)
+        with open(os.path.join(self.parser.shards_dir, manifest_keys[0]), encoding="utf-8") as file:
+            shards = json.load(file)["shards"]
+        self.assertEqual({shard["group"] for shard in shards}, {"608341002", "408739556"})
+        for shard in shards:
+            with open(shard["key"], encoding="utf-8") as file:
+                lines = file.read().splitlines()
+            self.assertEqual(len(lines), shard["nb_records"])
+            self.assertEqual([json.loads(line)["hand_id"] for line in lines], shard["ids"])
+
+    def test_max_buffered_bytes(self):
+        writer = self.parser.output_writer
+        hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+        parsed_hand = self.parser.parse_hand(hand_text)
+        writer.add(parsed_hand, "hand", "tournament")
+        writer.max_buffered_bytes = 3 * writer.buffered_bytes
+        for index in range(100):
+            writer.add(parsed_hand, f"hand{index}", f"tournament{index}")
+            self.assertLessEqual(writer.buffered_bytes, writer.max_buffered_bytes)
+            self.assertLessEqual(len(writer.open_shards), 3)
+        writer.close()
+        self.assertEqual(writer.buffered_bytes, 0)
+        groups = [group for group in os.listdir(self.parser.shards_dir) if group.startswith("tournament")]
+        self.assertEqual(len(groups), 101)
+
+    def test_max_records(self):
+        self.parser.output_writer.max_records = 1
+        hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+        for _ in range(3):
+            self.parser.output_writer.add(self.parser.parse_hand(hand_text), "hand", "tournament")
+        self.assertEqual(len(self.parser.output_writer.manifest), 3)
+        self.assertEqual(len(os.listdir(os.path.join(self.parser.shards_dir, "tournament"))), 3)
+
+    def test_process_executor(self):
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        for index in range(250):
+            shutil.copy(os.path.join(TEST_DIR, "split_files", "example01.txt"), os.path.join(split_dir, f"{index}.txt"))
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="process", max_workers=2, output="jsonl")
+        parser.parse_hand_histories()
+        manifest_keys = [key for key in os.listdir(parser.shards_dir) if key.startswith("manifest")]
+        self.assertLessEqual(len(manifest_keys), 2)
+        shards = []
+        for manifest_key in manifest_keys:
+            with open(os.path.join(parser.shards_dir, manifest_key), encoding="utf-8") as file:
+                shards.extend(json.load(file)["shards"])
+        self.assertLessEqual(len(shards), 4)
+        nb_lines = 0
+        for shard in shards:
+            with open(shard["key"], encoding="utf-8") as file:
+                nb_lines += len(file.read().splitlines())
+        self.assertEqual(sum(shard["nb_records"] for shard in shards), 252)
+        self.assertEqual(nb_lines, 252)
+
+
+class TestNewHandHistories(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "split_files", example), split_dir)
+        self.parser = LocalHandHistoryParser(data_dir=self.temp_dir.name)
+        os.makedirs(self.parser.parsed_dir)
+        self.parser.write_text(os.path.join(self.parser.parsed_dir, "example01.json"), "{}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_list_parsed_histories_keys(self):
+        self.assertEqual(self.parser.list_parsed_histories_keys(),
+                         [os.path.join(self.parser.parsed_dir, "example01.json")])
+
+    def test_parse_new_hand_histories(self):
+        self.parser.parse_new_hand_histories()
+        self.assertEqual(self.parser.get_text(os.path.join(self.parser.parsed_dir, "example01.json")), "{}")
+        self.assertTrue(os.path.exists(os.path.join(self.parser.parsed_dir, "example03.json")))
+
+    def test_output_writers(self):
+        for output in ["jsonl", "columnar"]:
+            parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, output=output)
+            with self.assertRaises(ValueError):
+                parser.parse_new_hand_histories()
+            with self.assertRaises(ValueError):
+                parser.parse_new_hand_history(os.path.join(parser.split_dir, "example03.txt"))
+
+
+class TestHandModel(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+
+    def test_parse_hand_model(self):
+        hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+        hand = self.parser.parse_hand_model(hand_text)
+        self.assertIsInstance(hand, Hand)
+        self.assertEqual(hand.hero_cards, ("2c", "5h"))
+        self.assertEqual([street.name for street in hand.streets], ["preflop", "flop", "turn", "river"])
+        self.assertFalse(hasattr(hand, "__dict__"))
+
+    def test_round_trip(self):
+        for example in ["example01.txt", "example03.txt"]:
+            hand_info = self.parser.parse_hand(self.parser.get_text(os.path.join(TEST_DIR, "split_files", example)))
+            hand_dict = Hand.from_dict(hand_info).to_dict()
+            self.assertEqual(hand_dict, hand_info)
+            self.assertEqual(json.dumps(hand_dict), json.dumps(hand_info))
+
+    def test_model_without_parse_hand(self):
+        for engine in ["regex", "scanner"]:
+            parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR, engine=engine)
+            for example in ["example01.txt", "example03.txt"]:
+                hand_text = parser.get_text(os.path.join(TEST_DIR, "split_files", example))
+                hand_info = parser.parse_hand(hand_text)
+                with mock.patch.object(parser, "parse_hand", side_effect=AssertionError("parse_hand called")):
+                    hand = parser.parse_hand_model(hand_text)
+                self.assertEqual(json.dumps(hand.to_dict()), json.dumps(hand_info))
+
+    def test_street_cards_dict(self):
+        self.assertEqual(Street("flop", [], ("2c", "5h", "Kd")).to_cards_dict(),
+                         {"flop_card_1": "2c", "flop_card_2": "5h", "flop_card_3": "Kd"})
+        self.assertEqual(Street("river", [], (None,)).to_cards_dict(), {"river_card": None})
+
+
+class TestLazyHand(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+
+    def test_fields_on_access(self):
+        hand = self.parser.parse_hand_lazy(self.hand_text)
+        self.assertIsInstance(hand, LazyHand)
+        self.assertEqual(hand.hand_id, "2612804708405870609-6-1672853787")
+        self.assertEqual(hand["hero_hand"], self.parser.extract_hero_hand(self.hand_text))
+        self.assertNotIn("actions", hand.__dict__)
+        self.assertEqual(hand.street_actions, {})
+
+    def test_players_only_parse_preflop(self):
+        hand = self.parser.parse_hand_lazy(self.hand_text)
+        self.assertEqual(hand.players, self.parser.parse_hand(self.hand_text)["players"])
+        self.assertEqual(list(hand.street_actions), ["preflop"])
+
+    def test_unknown_field(self):
+        with self.assertRaises(KeyError):
+            self.parser.parse_hand_lazy(self.hand_text)["unknown"]
+
+    def test_to_dict(self):
+        for example in ["example01.txt", "example03.txt"]:
+            hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", example))
+            hand_info = self.parser.parse_hand(hand_text)
+            hand_dict = self.parser.parse_hand_lazy(hand_text).to_dict()
+            self.assertEqual(json.dumps(hand_dict), json.dumps(hand_info))
+
+    def test_scanner_sections(self):
+        parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR, engine="scanner", with_timestamp=True)
+        for example in ["example01.txt", "example03.txt"]:
+            hand_text = parser.get_text(os.path.join(TEST_DIR, "split_files", example))
+            hand_info = parser.parse_hand(hand_text)
+            with mock.patch.object(parser, "extract_street_actions", side_effect=AssertionError):
+                with mock.patch.object(parser, "split_hand_sections", wraps=parser.split_hand_sections) as split:
+                    self.assertEqual(parser.parse_hand(hand_text, fields=["hand_id", "level"]),
+                                     {field: hand_info[field] for field in ["hand_id", "level"]})
+                    split.assert_not_called()
+                    hand_dict = parser.parse_hand_lazy(hand_text).to_dict()
+                    split.assert_called_once()
+            self.assertEqual(json.dumps(hand_dict), json.dumps(hand_info))
+
+
+class TestHandProjection(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        shutil.copy(os.path.join(TEST_DIR, "split_files", "example01.txt"), split_dir)
+        self.parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="inline")
+        self.hand_text = self.parser.get_text(os.path.join(split_dir, "example01.txt"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_hand_fields(self):
+        hand_info = self.parser.parse_hand(self.hand_text)
+        projected_info = self.parser.parse_hand(self.hand_text, fields=["winners", "hand_id", "players"])
+        self.assertEqual(list(projected_info), ["hand_id", "players", "winners"])
+        self.assertEqual(projected_info, {field: hand_info[field] for field in projected_info})
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse_hand(self.hand_text, fields=["unknown"])
+
+    def test_parse_hand_histories_fields(self):
+        self.parser.parse_hand_histories(fields=["winners", "hand_id"])
+        projected_key = os.path.join(self.temp_dir.name, "histories", "projections", "hand_id-winners",
+                                     "example01.json")
+        with open(projected_key, encoding="utf-8") as file:
+            self.assertEqual(set(json.load(file)), {"hand_id", "winners"})
+        self.assertEqual(self.parser.list_parsed_histories_keys(), [])
+
+    def test_projection_output_mode(self):
+        self.parser.set_output("jsonl")
+        with self.assertRaises(ValueError):
+            self.parser.parse_hand_histories(fields=["hand_id"])
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "split_files", example), split_dir)
+        self.missing_key = os.path.join(split_dir, "missing.txt")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_hand_histories_pipeline(self):
+        for executor in ["thread", "process"]:
+            parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor=executor)
+            parser.max_workers = 2
+            split_keys = parser.list_split_histories_keys()
+            failed_keys = parser.parse_hand_histories_pipeline(split_keys + [self.missing_key])
+            self.assertEqual(failed_keys, [self.missing_key])
+            for split_key in split_keys:
+                self.assertEqual(parser.get_text(parser.get_parsed_key(split_key)), parser.parse_to_json(split_key))
+            shutil.rmtree(parser.parsed_dir)
+
+    def test_keys_listed_off_event_loop(self):
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name)
+        listing_threads = set()
+
+        def keys():
+            for split_key in parser.iter_split_histories_keys():
+                listing_threads.add(threading.get_ident())
+                yield split_key
+
+        self.assertEqual(parser.parse_hand_histories_pipeline(keys()), [])
+        self.assertEqual(len(os.listdir(parser.parsed_dir)), 2)
+        self.assertEqual(len(listing_threads), 1)
+        self.assertNotIn(threading.get_ident(), listing_threads)
+
+    def test_pipeline_jsonl_output(self):
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, output="jsonl")
+        self.assertEqual(parser.parse_hand_histories_pipeline(), [])
+        manifest_keys = [key for key in os.listdir(parser.shards_dir) if key.startswith("manifest-")]
+        self.assertEqual(len(manifest_keys), 1)
+
+
+class TestTimestamp(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.hand_text = self.parser.get_text(os.path.join(TEST_DIR, "split_files", "example01.txt"))
+
+    def test_timestamp_field(self):
+        self.assertEqual(self.parser.extract_timestamp(self.hand_text), {"timestamp": 1672853787})
+        self.assertNotIn("timestamp", self.parser.parse_hand(self.hand_text))
+        self.assertNotIn("timestamp", self.parser.parse_hand_lazy(self.hand_text).to_dict())
+        self.assertEqual(self.parser.parse_hand(self.hand_text, fields=["timestamp", "datetime"]),
+                         {"datetime": "04-01-2023 17:36:27", "timestamp": 1672853787})
+
+    def test_with_timestamp(self):
+        for engine in ["regex", "scanner"]:
+            parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR, engine=engine, with_timestamp=True)
+            hand_info = parser.parse_hand(self.hand_text)
+            self.assertEqual(hand_info["timestamp"], 1672853787)
+            self.assertEqual(hand_info["datetime"], "04-01-2023 17:36:27")
+            self.assertEqual(parser.parse_hand_model(self.hand_text).to_dict(), hand_info)
+            self.assertEqual(parser.parse_hand_lazy(self.hand_text).to_dict(), hand_info)
+            self.assertEqual(Hand.from_dict(hand_info).to_dict(), hand_info)
+
+
+class TestJsonFormats(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.split_keys = [
+            os.path.join(TEST_DIR, "split_files", example) for example in ["example01.txt", "example03.txt"]]
+
+    def test_compat_format(self):
+        for split_key in self.split_keys:
+            hand_info = self.parser.parse_hand(self.parser.get_text(split_key))
+            self.assertEqual(self.parser.parse_to_json(split_key), json.dumps(hand_info, indent=4, ensure_ascii=False))
+
+    def test_compact_format(self):
+        parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR, json_format="compact")
+        for split_key in self.split_keys:
+            json_hand = parser.parse_to_json(split_key)
+            self.assertNotIn("\n", json_hand)
+            self.assertEqual(json.loads(json_hand), json.loads(self.parser.parse_to_json(split_key)))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            LocalHandHistoryParser(data_dir=TEST_DATA_DIR, json_format="pretty")
+
+
+class TestCloudParserWithLocalS3(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.local_parser = LocalHandHistoryParser(data_dir=TEST_DATA_DIR)
+        self.hand_texts = {
+            f"data/histories/split/2023/01/04/{example}": self.local_parser.get_text(
+                os.path.join(TEST_DIR, "split_files", example))
+            for example in ["example01.txt", "example03.txt"]
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_parser(self, s3_client: LocalS3Client, executor: str = "thread") -> CloudHandHistoryParser:
+        for split_key, hand_text in self.hand_texts.items():
+            s3_client.put_object(Bucket="test-bucket", Key=split_key, Body=hand_text)
+        return CloudHandHistoryParser("test-bucket", executor=executor, s3_client=s3_client)
+
+    def test_parse_hand_histories(self):
+        for s3_client, executor in [(LocalS3Client(), "thread"), (LocalS3Client(self.temp_dir.name), "process")]:
+            parser = self.get_parser(s3_client, executor)
+            parser.parse_hand_histories()
+            self.assertEqual(len(parser.list_parsed_histories_keys()), 2)
+            for split_key, hand_text in self.hand_texts.items():
+                self.assertTrue(parser.check_is_parsed(split_key))
+                parsed_hand = json.loads(parser.get_text(parser.get_parsed_key(split_key)))
+                self.assertEqual(parsed_hand, json.loads(json.dumps(parser.parse_hand(hand_text))))
+
+    def test_compressed_outputs(self):
+        s3_client = LocalS3Client()
+        for split_key, hand_text in self.hand_texts.items():
+            s3_client.put_object(Bucket="test-bucket", Key=f"{split_key}.gz", Body=gzip.compress(hand_text.encode()))
+        parser = CloudHandHistoryParser("test-bucket", s3_client=s3_client, compression="gzip")
+        parser.parse_new_hand_histories()
+        parsed_keys = parser.list_parsed_histories_keys()
+        self.assertEqual(parsed_keys, [parser.get_parsed_key(split_key) for split_key in sorted(self.hand_texts)])
+        for split_key, parsed_key in zip(sorted(self.hand_texts), parsed_keys):
+            self.assertTrue(parsed_key.endswith(".json.gz"))
+            content = s3_client.get_object(Bucket="test-bucket", Key=parsed_key)["Body"].read()
+            self.assertEqual(gzip.decompress(content).decode(), parser.parse_to_json(f"{split_key}.gz"))
+            self.assertEqual(parser.get_text(parsed_key), parser.parse_to_json(f"{split_key}.gz"))
@@ -0,0 +1,145 @@
+import unittest
+import importlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+from unittest import mock
+
+records = importlib.import_module("pkrhistoryparser.lambda.records")
+history_handler = importlib.import_module("pkrhistoryparser.lambda.history_parser")
+summary_handler = importlib.import_module("pkrhistoryparser.lambda.summary_parser")
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = os.path.dirname(TESTS_DIR)
+BUCKET_NAME = "test-bucket"
+
+
+def get_record(message_id: str, key: str) -> dict:
+    message = {"Records": [{"s3": {"bucket": {"name": BUCKET_NAME}, "object": {"key": key}}}]}
+    return {"messageId": message_id, "body": json.dumps({"Message": json.dumps(message)})}
+
+
+class FakeContext:
+    def __init__(self, remaining_times: list):
+        self.remaining_times = remaining_times
+
+    def get_remaining_time_in_millis(self) -> int:
+        if len(self.remaining_times) > 1:
+            return self.remaining_times.pop(0)
+        return self.remaining_times[0]
+
+
+class TestProcessRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = [get_record(f"message-{index}", f"data/histories/split/{index}.txt") for index in range(10)]
+        self.processed_keys = []
+        self.lock = threading.Lock()
+
+    def process_object(self, bucket_name: str, key: str) -> None:
+        if key.endswith("3.txt") or key.endswith("7.txt"):
+            raise ValueError(f"Cannot parse {key}")
+        with self.lock:
+            self.processed_keys.append(key)
+
+    def test_get_s3_objects(self):
+        self.assertEqual(records.get_s3_objects(self.records[0]), [(BUCKET_NAME, "data/histories/split/0.txt")])
+
+    def test_process_all_records(self):
+        for max_workers in [1, 4]:
+            self.processed_keys.clear()
+            response = records.process_records(self.records, self.process_object, max_workers=max_workers)
+            self.assertEqual(len(self.processed_keys), 8)
+            self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "message-3"},
+                                                              {"itemIdentifier": "message-7"}]})
+
+    def test_deadline(self):
+        context = FakeContext(remaining_times=[10000, 10000, 10000, 1000])
+        response = records.process_records(self.records[:6], self.process_object, max_workers=1, context=context)
+        self.assertEqual(self.processed_keys, ["data/histories/split/0.txt", "data/histories/split/1.txt",
+                                               "data/histories/split/2.txt"])
+        self.assertEqual([failure["itemIdentifier"] for failure in response["batchItemFailures"]],
+                         ["message-3", "message-4", "message-5"])
+
+    def test_no_context(self):
+        records.check_deadline(None)
+        with self.assertRaises(records.DeadlineReached):
+            records.check_deadline(FakeContext(remaining_times=[100]))
+
+    def test_empty_batch(self):
+        self.assertEqual(records.process_records([], self.process_object), {"batchItemFailures": []})
+
+
+class TestLambdaHandlers(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-3")
+        history_handler.parsers.clear()
+        summary_handler.parsers.clear()
+
+    @staticmethod
+    def stub_file(stubber: Stubber, file_path: str) -> None:
+        with open(file_path, "rb") as file:
+            content = file.read()
+        stubber.add_response("get_object", {"Body": StreamingBody(io.BytesIO(content), len(content))})
+        stubber.add_response("put_object", {})
+
+    def test_get_parser(self):
+        parser = history_handler.get_parser(BUCKET_NAME)
+        self.assertIs(history_handler.get_parser(BUCKET_NAME), parser)
+        self.assertIsNot(history_handler.get_parser("other-bucket"), parser)
+
+    def test_parser_engine(self):
+        self.assertEqual(history_handler.get_parser(BUCKET_NAME).engine, "regex")
+        self.assertEqual(summary_handler.get_parser(BUCKET_NAME).engine, "regex")
+        with mock.patch.object(summary_handler, "ENGINE", "scanner"):
+            self.assertEqual(summary_handler.get_parser("other-bucket").engine, "scanner")
+
+    def test_history_handler(self):
+        parser = history_handler.get_parser(BUCKET_NAME)
+        event = {"Records": [get_record("message-0", "data/histories/split/example01.txt")]}
+        with Stubber(parser.s3) as stubber:
+            self.stub_file(stubber, os.path.join(TESTS_DIR, "history_parser", "split_files", "example01.txt"))
+            response = history_handler.lambda_handler(event, None)
+            stubber.assert_no_pending_responses()
+        self.assertEqual(response, {"batchItemFailures": []})
+
+    def test_summary_handler_failure(self):
+        parser = summary_handler.get_parser(BUCKET_NAME)
+        event = {"Records": [get_record("message-0", "data/summaries/raw/example01.txt")]}
+        with Stubber(parser.s3) as stubber:
+            stubber.add_client_error("get_object", service_error_code="NoSuchKey", http_status_code=404)
+            response = summary_handler.lambda_handler(event, None)
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "message-0"}]})
+
+
+class TestLambdaImage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        package_dir = os.path.join(self.temp_dir.name, "pkrhistoryparser")
+        shutil.copytree(os.path.join(BASE_DIR, "pkrhistoryparser"), package_dir)
+        for useless_list, remove in [("useless_files.txt", os.remove), ("useless_dirs.txt", shutil.rmtree)]:
+            with open(os.path.join(BASE_DIR, "config", useless_list), encoding="utf-8") as file:
+                for useless_path in file.read().split():
+                    remove(os.path.join(self.temp_dir.name, useless_path))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_import_handlers(self):
+        code = ("import importlib; importlib.import_module('pkrhistoryparser.lambda.history_parser'); "
+                "importlib.import_module('pkrhistoryparser.lambda.summary_parser')")
+        result = subprocess.run([sys.executable, "-c", code], cwd=self.temp_dir.name, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_report_batch_item_failures(self):
+        with open(os.path.join(BASE_DIR, "config", "lambda_params.json"), encoding="utf-8") as file:
+            functions = json.load(file)["functions"]
+        for function in functions:
+            self.assertEqual(function["functionResponseTypes"], "ReportBatchItemFailures")
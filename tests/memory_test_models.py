@@ -0,0 +1,49 @@
+"""This module compares the memory needed to hold parsed hands as dictionaries and as Hand models."""
+import os
+import tracemalloc
+
+from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+SPLIT_FILES_DIR = os.path.join(BASE_DIR, "tests", "history_parser", "split_files")
+MODELS_MEMORY_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_models_memory_results.txt")
+
+history_parser = LocalHandHistoryParser(SPLIT_FILES_DIR)
+
+
+def get_hand_texts() -> list:
+    hand_texts = []
+    for filename in sorted(os.listdir(SPLIT_FILES_DIR)):
+        hand_text = history_parser.get_text(os.path.join(SPLIT_FILES_DIR, filename))
+        try:
+            history_parser.parse_hand(hand_text)
+            hand_texts.append(hand_text)
+        except AttributeError:
+            print(f"Skipping {filename}, which cannot be parsed")
+    return hand_texts
+
+
+def get_memory_per_hand(parse_function, hand_texts: list, nb_copies: int) -> float:
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    hands = [parse_function(hand_text) for _ in range(nb_copies) for hand_text in hand_texts]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) / len(hands)
+
+
+def memory_test(results_path: str = MODELS_MEMORY_RESULTS_PATH, nb_copies: int = 1000):
+    hand_texts = get_hand_texts()
+    dict_memory = get_memory_per_hand(history_parser.parse_hand, hand_texts, nb_copies)
+    model_memory = get_memory_per_hand(history_parser.parse_hand_model, hand_texts, nb_copies)
+    results_text = (f"Memory per hand held in memory: {dict_memory / 1024:.2f} KiB as dictionaries, "
+                    f"{model_memory / 1024:.2f} KiB as Hand models ({model_memory / dict_memory:.0%}).\n")
+    print(results_text)
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.write(results_text)
+
+
+if __name__ == "__main__":
+    memory_test()
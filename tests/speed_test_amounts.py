@@ -0,0 +1,53 @@
+"""This module compares the time needed to convert all the written numbers of the test files into floats."""
+import os
+import re
+import timeit
+
+from pkrhistoryparser.amounts import to_float
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+AMOUNTS_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_amounts_speed_results.txt")
+WRITTEN_NUMBER_PATTERN = re.compile(r"\d[\d.,]*[kM]?")
+
+
+def replace_to_float(txt_num: str) -> float:
+    try:
+        return float(txt_num.replace(",", ".").replace("k", "e3").replace("M", "e6"))
+    except (TypeError, AttributeError, ValueError):
+        return 0.0
+
+
+def get_written_numbers(directory: str) -> list:
+    written_numbers = []
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+            written_numbers.extend(WRITTEN_NUMBER_PATTERN.findall(file.read()))
+    return written_numbers
+
+
+def get_time_per_number(function, written_numbers: list, number: int = 200) -> float:
+    return timeit.timeit(lambda: [function(txt_num) for txt_num in written_numbers],
+                         number=number) / (number * len(written_numbers)) * 1e9
+
+
+def speed_test(results_path: str = AMOUNTS_SPEED_RESULTS_PATH):
+    lines = []
+    for label, directory in [
+        ("history", os.path.join(TESTS_DIR, "history_parser", "split_files")),
+        ("summary", os.path.join(TESTS_DIR, "summary_parser", "raw_files"))
+    ]:
+        written_numbers = get_written_numbers(directory)
+        replace_time = get_time_per_number(replace_to_float, written_numbers)
+        fast_time = get_time_per_number(to_float, written_numbers)
+        lines.append(f"{label}: {len(written_numbers)} numbers, replace chain {replace_time:.0f} ns, "
+                     f"memoised to_float {fast_time:.0f} ns per number.\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
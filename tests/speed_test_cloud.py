@@ -0,0 +1,53 @@
+"""
+This module compares the time needed to parse hand histories with the cloud parser and the different execution
+strategies, on a local S3 stand-in simulating the latency of S3.
+"""
+import os
+import time
+
+from pkrhistoryparser.history_parsers.cloud import CloudHandHistoryParser
+from pkrhistoryparser.local_s3 import LocalS3Client
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+SPLIT_FILES_DIR = os.path.join(BASE_DIR, "tests", "history_parser", "split_files")
+CLOUD_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_cloud_speed_results.txt")
+BUCKET_NAME = "speed-test-bucket"
+
+
+def get_s3_client(nb_files: int, latency: float) -> LocalS3Client:
+    s3_client = LocalS3Client(latency=latency)
+    hand_texts = []
+    for filename in ["example01.txt", "example03.txt"]:
+        with open(os.path.join(SPLIT_FILES_DIR, filename), "rb") as file:
+            hand_texts.append(file.read())
+    for index in range(nb_files):
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=f"data/histories/split/{index:06d}.txt",
+                             Body=hand_texts[index % len(hand_texts)])
+    return s3_client
+
+
+def get_time_per_file(executor: str, method_name: str, nb_files: int, latency: float) -> float:
+    parser = CloudHandHistoryParser(BUCKET_NAME, executor=executor, s3_client=get_s3_client(nb_files, latency))
+    start = time.perf_counter()
+    getattr(parser, method_name)()
+    return (time.perf_counter() - start) / nb_files * 1000
+
+
+def speed_test(results_path: str = CLOUD_SPEED_RESULTS_PATH, nb_files: int = 200, latency: float = 0.01):
+    lines = [f"{nb_files} files, {latency * 1000:.0f} ms simulated latency per S3 call\n"]
+    for label, executor, method_name in [
+        ("inline", "inline", "parse_hand_histories"),
+        ("thread", "thread", "parse_hand_histories"),
+        ("pipeline", "thread", "parse_hand_histories_pipeline")
+    ]:
+        time_per_file = get_time_per_file(executor, method_name, nb_files, latency)
+        lines.append(f"{label}: {time_per_file:.2f} ms per file\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
@@ -0,0 +1,51 @@
+"""This module compares the time needed to rewrite all the datetimes of the test files as in the parsed hands."""
+import os
+import re
+import timeit
+from datetime import datetime
+
+from pkrhistoryparser.dates import format_datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+DATES_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_dates_speed_results.txt")
+DATETIME_PATTERN = re.compile(r"\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}")
+
+
+def strptime_format_datetime(datetime_text: str) -> str:
+    return datetime.strptime(datetime_text, "%Y/%m/%d %H:%M:%S").strftime("%d-%m-%Y %H:%M:%S")
+
+
+def get_datetime_texts(directory: str) -> list:
+    datetime_texts = []
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+            datetime_texts.extend(DATETIME_PATTERN.findall(file.read()))
+    return datetime_texts
+
+
+def get_time_per_datetime(function, datetime_texts: list, number: int = 2000) -> float:
+    return timeit.timeit(lambda: [function(datetime_text) for datetime_text in datetime_texts],
+                         number=number) / (number * len(datetime_texts)) * 1e9
+
+
+def speed_test(results_path: str = DATES_SPEED_RESULTS_PATH):
+    lines = []
+    for label, directory in [
+        ("history", os.path.join(TESTS_DIR, "history_parser", "split_files")),
+        ("summary", os.path.join(TESTS_DIR, "summary_parser", "raw_files"))
+    ]:
+        datetime_texts = get_datetime_texts(directory)
+        strptime_time = get_time_per_datetime(strptime_format_datetime, datetime_texts)
+        slicing_time = get_time_per_datetime(format_datetime, datetime_texts)
+        lines.append(f"{label}: {len(datetime_texts)} datetimes, strptime and strftime {strptime_time:.0f} ns, "
+                     f"slicing {slicing_time:.0f} ns per datetime.\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
@@ -0,0 +1,79 @@
+"""
+This module compares the cold start and warm latency of the lambda handlers on the test files.
+Each handler is measured in a fresh process, as in a new container, and the S3 calls are answered by a botocore
+Stubber, so that only the parser and client construction and the parsing are measured.
+"""
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+LAMBDA_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "lambda_warm_speed_results.txt")
+BUCKET_NAME = "speed-test-bucket"
+HANDLERS = [
+    ("history_parser", os.path.join(TESTS_DIR, "history_parser", "split_files", "example01.txt"),
+     "data/histories/split/2023/01/04/example01.txt"),
+    ("summary_parser", os.path.join(TESTS_DIR, "summary_parser", "raw_files", "example01.txt"),
+     "data/summaries/raw/2023/01/04/example01.txt")
+]
+
+
+def get_event(key: str) -> dict:
+    message = {"Records": [{"s3": {"bucket": {"name": BUCKET_NAME}, "object": {"key": key}}}]}
+    return {"Records": [{"messageId": "speed-test", "body": json.dumps({"Message": json.dumps(message)})}]}
+
+
+def stub_invocation(stubber: Stubber, content: bytes) -> None:
+    body = StreamingBody(io.BytesIO(content), len(content))
+    stubber.add_response("get_object", {"Body": body})
+    stubber.add_response("put_object", {})
+
+
+def get_latencies(module_name: str, file_path: str, key: str, nb_invocations: int = 100) -> tuple:
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-3")
+    module = importlib.import_module(f"pkrhistoryparser.lambda.{module_name}")
+    with open(file_path, "rb") as file:
+        content = file.read()
+    event = get_event(key)
+    module.parsers.clear()
+    start = time.perf_counter()
+    parser = module.get_parser(BUCKET_NAME)
+    construction_time = time.perf_counter() - start
+    with Stubber(parser.s3) as stubber:
+        stub_invocation(stubber, content)
+        start = time.perf_counter()
+        module.lambda_handler(event, None)
+        first_time = time.perf_counter() - start
+        warm_time = 0
+        for _ in range(nb_invocations):
+            stub_invocation(stubber, content)
+            start = time.perf_counter()
+            module.lambda_handler(event, None)
+            warm_time += time.perf_counter() - start
+    return (construction_time + first_time) * 1000, warm_time / nb_invocations * 1000
+
+
+def speed_test(results_path: str = LAMBDA_SPEED_RESULTS_PATH):
+    lines = []
+    for module_name, file_path, key in HANDLERS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            cold_time, warm_time = pool.submit(get_latencies, module_name, file_path, key).result()
+        lines.append(f"{module_name}: cold start {cold_time:.1f} ms (parser and S3 client construction included), "
+                     f"warm invocation {warm_time:.1f} ms per file.\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
@@ -0,0 +1,71 @@
+"""This module compares the time needed to run the raw and the compiled patterns on the test files."""
+import os
+import re
+import timeit
+
+from pkrhistoryparser.patterns import winamax, registry
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+PATTERNS_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_patterns_speed_results.txt")
+HISTORY_PATTERNS = [
+    "PLAYER_PATTERN", "BLINDS_PATTERN", "DATETIME_PATTERN", "TOURNAMENT_BLINDS_PATTERN", "OTHER_BLINDS_PATTERN",
+    "LEVEL_PATTERN", "NORMAL_BUY_IN_PATTERN", "FREE_ROLL_PATTERN", "MAX_PLAYERS_PATTERN", "BUTTON_SEAT_PATTERN",
+    "TOURNAMENT_INFO_PATTERN", "HERO_HAND_PATTERN", "FLOP_PATTERN", "TURN_PATTERN", "RIVER_PATTERN",
+    "WINNERS_PATTERN", "HAND_ID_PATTERN", "PREFLOP_ACTION_PATTERN", "FLOP_ACTION_PATTERN", "TURN_ACTION_PATTERN",
+    "RIVER_ACTION_PATTERN"
+]
+SUMMARY_PATTERNS = [
+    "PRIZE_POOL_PATTERN", "REGISTERED_PLAYERS_PATTERN", "SPEED_PATTERN", "START_DATE_PATTERN",
+    "TOURNAMENT_TYPE_PATTERN", "SUMMARY_TOURNAMENT_INFO_PATTERN", "BUY_IN_PATTERN", "AMOUNT_WON_PATTERN",
+    "FINAL_POSITION_PATTERN"
+]
+
+
+def get_texts(directory: str) -> list:
+    texts = []
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+            texts.append(file.read())
+    return texts
+
+
+def run_raw_patterns(pattern_names: list, texts: list, purge: bool = False):
+    for text in texts:
+        if purge:
+            re.purge()
+        for name in pattern_names:
+            re.search(getattr(winamax, name), text)
+
+
+def run_compiled_patterns(pattern_names: list, texts: list):
+    for text in texts:
+        for name in pattern_names:
+            getattr(registry, name).search(text)
+
+
+def get_time_per_file(function, texts: list, number: int = 1000) -> float:
+    return timeit.timeit(function, number=number) / (number * len(texts)) * 1e6
+
+
+def speed_test(results_path: str = PATTERNS_SPEED_RESULTS_PATH):
+    lines = []
+    for label, pattern_names, directory in [
+        ("history", HISTORY_PATTERNS, os.path.join(TESTS_DIR, "history_parser", "split_files")),
+        ("summary", SUMMARY_PATTERNS, os.path.join(TESTS_DIR, "summary_parser", "raw_files"))
+    ]:
+        texts = get_texts(directory)
+        raw_time = get_time_per_file(lambda: run_raw_patterns(pattern_names, texts), texts)
+        purged_time = get_time_per_file(lambda: run_raw_patterns(pattern_names, texts, purge=True), texts, 100)
+        compiled_time = get_time_per_file(lambda: run_compiled_patterns(pattern_names, texts), texts)
+        lines.append(f"{label}: raw patterns {raw_time:.1f} us, raw patterns with cold cache {purged_time:.1f} us, "
+                     f"compiled patterns {compiled_time:.1f} us per file.\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
@@ -0,0 +1,65 @@
+"""This module compares the time needed to serialize the parsed test files and the size of their JSON texts."""
+import json
+import os
+import timeit
+
+from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+from pkrhistoryparser.serializers import orjson, to_json
+from pkrhistoryparser.summary_parsers.local import LocalSummaryParser
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+TESTS_DIR = os.path.join(BASE_DIR, "tests")
+SERIALIZERS_SPEED_RESULTS_PATH = os.path.join(REPORTS_DIR, "parsing_serializers_speed_results.txt")
+
+
+def get_parsed_objects(parse_function, get_text, directory: str) -> list:
+    parsed_objects = []
+    for filename in sorted(os.listdir(directory)):
+        try:
+            parsed_objects.append(parse_function(get_text(os.path.join(directory, filename))))
+        except AttributeError:
+            print(f"Skipping {filename}, which cannot be parsed")
+    return parsed_objects
+
+
+def get_all_parsed_objects() -> dict:
+    history_parser = LocalHandHistoryParser(data_dir=BASE_DIR)
+    summary_parser = LocalSummaryParser(data_dir=BASE_DIR)
+    return {
+        "history": get_parsed_objects(history_parser.parse_hand, history_parser.get_text,
+                                      os.path.join(TESTS_DIR, "history_parser", "split_files")),
+        "summary": get_parsed_objects(summary_parser.parse_tournament_summary, summary_parser.get_text,
+                                      os.path.join(TESTS_DIR, "summary_parser", "raw_files"))
+    }
+
+
+def get_serializers(sort_keys: bool) -> dict:
+    serializers = {
+        "compat (json, indent=4)": lambda obj: to_json(obj, "compat", sort_keys=sort_keys),
+        "compact json": lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    }
+    if orjson is not None:
+        serializers["compact orjson"] = lambda obj: to_json(obj, "compact", sort_keys=sort_keys)
+    return serializers
+
+
+def get_time_per_file(serializer, objects: list, number: int = 2000) -> float:
+    return timeit.timeit(lambda: [serializer(obj) for obj in objects], number=number) / (number * len(objects)) * 1e6
+
+
+def speed_test(results_path: str = SERIALIZERS_SPEED_RESULTS_PATH):
+    lines = []
+    for label, objects in get_all_parsed_objects().items():
+        for name, serializer in get_serializers(sort_keys=label == "summary").items():
+            time_per_file = get_time_per_file(serializer, objects)
+            size_per_file = sum(len(serializer(obj).encode("utf-8")) for obj in objects) / len(objects)
+            lines.append(f"{label}: {name} {time_per_file:.1f} us and {size_per_file:.0f} bytes per file.\n")
+    print("".join(lines))
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.writelines(lines)
+
+
+if __name__ == "__main__":
+    speed_test()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from pkrhistoryparser.columnar import load_npz_tables
+from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPLIT_FILES_DIR = os.path.join(TESTS_DIR, "history_parser", "split_files")
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        os.makedirs(split_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(SPLIT_FILES_DIR, example), split_dir)
+        self.parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, output="columnar")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_rows(self):
+        hand_text = self.parser.get_text(os.path.join(SPLIT_FILES_DIR, "example01.txt"))
+        rows = self.parser.output_writer.get_rows(self.parser.parse_hand(hand_text))
+        self.assertEqual(len(rows["hands"]), 1)
+        self.assertEqual(len(rows["players"]), 6)
+        self.assertEqual(len(rows["postings"]), 8)
+        self.assertEqual(len(rows["actions"]), 16)
+        self.assertEqual(rows["players"][4]["amount_won"], 7575.0)
+
+    def test_parse_hand_histories_npz(self):
+        self.parser.output_writer.columnar_format = "npz"
+        self.parser.parse_hand_histories()
+        npz_keys = os.listdir(self.parser.columns_dir)
+        self.assertEqual(len(npz_keys), 1)
+        tables = load_npz_tables(os.path.join(self.parser.columns_dir, npz_keys[0]))
+        self.assertEqual(sorted(tables["hands"]["hand_id"]),
+                         ["1755523025601560743-37-1606853397", "2612804708405870609-6-1672853787"])
+        self.assertEqual(len(tables["players"]["name"]), 12)
+        self.assertEqual(tables["actions"]["amount"].dtype, numpy.float64)
+
+    def test_process_executor(self):
+        split_dir = os.path.join(self.temp_dir.name, "histories", "split")
+        for index in range(250):
+            shutil.copy(os.path.join(SPLIT_FILES_DIR, "example01.txt"), os.path.join(split_dir, f"{index}.txt"))
+        parser = LocalHandHistoryParser(data_dir=self.temp_dir.name, executor="process", max_workers=2,
+                                        output="columnar")
+        parser.output_writer.columnar_format = "npz"
+        parser.parse_hand_histories()
+        npz_keys = os.listdir(parser.columns_dir)
+        self.assertLessEqual(len(npz_keys), 2)
+        tables = [load_npz_tables(os.path.join(parser.columns_dir, npz_key)) for npz_key in npz_keys]
+        self.assertEqual(sum(len(part_tables["hands"]["hand_id"]) for part_tables in tables), 252)
+        self.assertEqual(sum(len(part_tables["players"]["name"]) for part_tables in tables), 252 * 6)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parse_hand_histories_parquet(self):
+        self.parser.output_writer.columnar_format = "parquet"
+        self.parser.parse_hand_histories()
+        for table_name in ["hands", "players", "postings", "actions"]:
+            self.assertEqual(len(os.listdir(os.path.join(self.parser.columns_dir, table_name))), 1)
+        table = pyarrow.parquet.read_table(os.path.join(self.parser.columns_dir, "players"))
+        self.assertEqual(table.num_rows, 12)
@@ -0,0 +1,274 @@
+import unittest
+import gzip
+import os
+import pickle
+import tempfile
+import threading
+
+from unittest import mock
+
+from pkrhistoryparser.base import AbstractParser
+from pkrhistoryparser.compression import check_compression, get_suffixes, iter_unique_stems, strip_extension
+from pkrhistoryparser.executors import init_worker
+from pkrhistoryparser.history_parsers.abstract import AbstractHandHistoryParser
+from pkrhistoryparser.history_parsers.cloud import CloudHandHistoryParser
+from pkrhistoryparser.history_parsers.local import LocalHandHistoryParser
+from pkrhistoryparser.local_s3 import LocalS3Client
+from pkrhistoryparser.storage import LocalStorage, MemoryStorage, S3Storage
+from pkrhistoryparser.summary_parsers.abstract import AbstractSummaryParser
+from pkrhistoryparser.summary_parsers.cloud import CloudSummaryParser
+from pkrhistoryparser.summary_parsers.local import LocalSummaryParser
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStorageBackends(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "data")
+        self.storages = [LocalStorage(), MemoryStorage(), S3Storage("test-bucket", LocalS3Client())]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_keys(self) -> list:
+        return [f"{self.root}/split/hand{index}.txt" for index in range(5)] + [f"{self.root}/split/notes.md"]
+
+    def test_put_and_get(self):
+        for storage in self.storages:
+            key = f"{self.root}/parsed/hand.json"
+            self.assertFalse(storage.exists(key))
+            storage.put(key, "{\n}\n")
+            self.assertTrue(storage.exists(key))
+            self.assertEqual(storage.get_text(key), "{\n}\n")
+            self.assertEqual(list(storage.iter_lines(key)), ["{\n", "}\n"])
+
+    def test_batched_operations(self):
+        for storage in self.storages:
+            keys = self.get_keys()
+            storage.put_many((key, f"content of {key}") for key in keys)
+            self.assertEqual(list(storage.get_many(keys)), [(key, f"content of {key}") for key in keys])
+            self.assertEqual(sorted(storage.list_prefix(f"{self.root}/split", ".txt")), sorted(keys[:-1]))
+
+    def test_pickle(self):
+        storage = pickle.loads(pickle.dumps(MemoryStorage({"key": "content"})))
+        self.assertEqual(storage.get_text("key"), "content")
+
+    def test_compressed_keys(self):
+        for storage in self.storages:
+            key = f"{self.root}/parsed/hand.json.gz"
+            storage.put(key, "{\n}\n")
+            self.assertEqual(storage.get_text(key), "{\n}\n")
+            self.assertEqual(list(storage.iter_lines(key)), ["{\n", "}\n"])
+            storage.put(f"{self.root}/split/hand.txt.gz", "hand")
+            storage.put(f"{self.root}/split/hand.txt", "hand")
+            self.assertEqual(len(list(storage.list_prefix(f"{self.root}/split", get_suffixes(".txt")))), 2)
+        with open(f"{self.root}/parsed/hand.json.gz", "rb") as file:
+            self.assertEqual(gzip.decompress(file.read()), b"{\n}\n")
+
+    def test_stream_compressed_lines(self):
+        for storage in self.storages[::2]:
+            key = f"{self.root}/raw/history.txt.gz"
+            storage.put(key, "".join(f"line {index}\n" for index in range(1000)))
+            with mock.patch("pkrhistoryparser.storage.decompress", side_effect=AssertionError("not streamed")):
+                lines = storage.iter_lines(key)
+                self.assertEqual(next(lines), "line 0\n")
+                self.assertEqual(len(list(lines)), 999)
+
+
+class TestCompression(unittest.TestCase):
+    def test_check_compression(self):
+        self.assertIsNone(check_compression(None))
+        self.assertEqual(check_compression("gzip"), "gzip")
+        with self.assertRaises(ValueError):
+            check_compression("bz2")
+
+    def test_strip_extension(self):
+        self.assertEqual(strip_extension("split/hand.txt.zst"), "split/hand.txt")
+        self.assertEqual(strip_extension("split/hand.txt"), "split/hand.txt")
+
+    def test_unique_stems(self):
+        keys = ["split/a.txt", "split/a.txt-1.txt", "split/a.txt-1.txt.zst", "split/a.txt.gz", "split/b.txt.gz",
+                "split/b.txt.zst", "split/c.txt"]
+        self.assertEqual(list(iter_unique_stems(keys)), ["split/a.txt", "split/a.txt-1.txt", "split/b.txt.gz",
+                                                         "split/c.txt"])
+
+    def test_parsers_skip_compressed_twins(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            parsers = [LocalHandHistoryParser(data_dir=temp_dir), LocalSummaryParser(data_dir=temp_dir)]
+            for parser, directory in zip(parsers, [parsers[0].split_dir, parsers[1].raw_dir]):
+                for index in range(3):
+                    parser.storage.put(os.path.join(directory, f"hand{index}.txt.gz"), "hand")
+                    parser.storage.put(os.path.join(directory, f"hand{index}.txt"), "hand")
+            self.assertEqual(parsers[0].list_split_histories_keys(),
+                             [os.path.join(parsers[0].split_dir, f"hand{index}.txt") for index in range(3)])
+            self.assertEqual(parsers[1].list_summary_keys(),
+                             [os.path.join(parsers[1].raw_dir, f"hand{index}.txt") for index in range(3)])
+
+    def test_s3_content_encoding(self):
+        s3_client = LocalS3Client()
+        storage = S3Storage("test-bucket", s3_client)
+        with mock.patch.object(s3_client, "put_object", wraps=s3_client.put_object) as put_object:
+            storage.put("parsed/hand.json.gz", "{}")
+        self.assertEqual(put_object.call_args.kwargs["ContentEncoding"], "gzip")
+        s3_client.put_object(Bucket="test-bucket", Key="raw/summary.txt", Body=gzip.compress(b"summary"))
+        get_object = s3_client.get_object
+        with mock.patch.object(s3_client, "get_object",
+                               side_effect=lambda **kwargs: {**get_object(**kwargs), "ContentEncoding": "gzip"}):
+            self.assertEqual(storage.get_text("raw/summary.txt"), "summary")
+
+    def test_local_s3_content_encoding(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for s3_client in [LocalS3Client(), LocalS3Client(temp_dir)]:
+                storage = S3Storage("test-bucket", s3_client)
+                storage.put("parsed/hand.json.gz", "{}")
+                response = s3_client.get_object(Bucket="test-bucket", Key="parsed/hand.json.gz")
+                self.assertEqual(response["ContentEncoding"], "gzip")
+                s3_client.put_object(Bucket="test-bucket", Key="raw/summary.txt", Body=gzip.compress(b"sum\nmary\n"),
+                                     ContentEncoding="gzip")
+                self.assertEqual(storage.get_text("raw/summary.txt"), "sum\nmary\n")
+                self.assertEqual(list(storage.iter_lines("raw/summary.txt")), ["sum\n", "mary\n"])
+                self.assertEqual(sorted(storage.list_prefix("")), ["parsed/hand.json.gz", "raw/summary.txt"])
+                s3_client.put_object(Bucket="test-bucket", Key="raw/summary.txt", Body=b"summary")
+                self.assertNotIn("ContentEncoding", s3_client.get_object(Bucket="test-bucket", Key="raw/summary.txt"))
+                self.assertEqual(storage.get_text("raw/summary.txt"), "summary")
+
+
+class TestLocalS3Client(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pagination(self):
+        s3_client = LocalS3Client()
+        keys = ["data/split/2023/01/04/example03.txt", "data/split/2023/01/04/example01.txt"]
+        for key in keys:
+            s3_client.put_object(Bucket="test-bucket", Key=key, Body="hand")
+        pages = list(s3_client.get_paginator("list_objects_v2").paginate(
+            Bucket="test-bucket", Prefix="data/split", MaxKeys=1))
+        self.assertEqual(len(pages), 2)
+        storage = S3Storage("test-bucket", s3_client)
+        self.assertEqual(list(storage.list_prefix("data/split")), sorted(keys))
+
+    def test_missing_key(self):
+        s3_client = LocalS3Client()
+        with self.assertRaises(s3_client.exceptions.NoSuchKey):
+            s3_client.get_object(Bucket="test-bucket", Key="data/split/missing.txt")
+        with self.assertRaises(s3_client.exceptions.NoSuchKey):
+            S3Storage("test-bucket", s3_client).get_text("data/split/missing.txt")
+
+    def test_list_objects_sorted_once(self):
+        for root_dir in [None, self.temp_dir.name]:
+            s3_client = LocalS3Client(root_dir)
+            keys = [f"split/hand{index:03d}.txt" for index in range(50)]
+            for key in reversed(keys):
+                s3_client.put_object(Bucket="test-bucket", Key=key, Body=b"hand")
+            s3_client.put_object(Bucket="test-bucket", Key="parsed/hand000.json", Body=b"{}")
+            with mock.patch.object(s3_client, "iter_keys", wraps=s3_client.iter_keys) as iter_keys:
+                pages = list(s3_client.get_paginator("list_objects_v2").paginate(
+                    Bucket="test-bucket", Prefix="split/", MaxKeys=7))
+            self.assertEqual(iter_keys.call_count, 1)
+            self.assertEqual(len(pages), 8)
+            self.assertEqual([obj["Key"] for page in pages for obj in page["Contents"]], keys)
+            self.assertEqual(s3_client.listings, {})
+
+
+class TestS3ConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.s3_client = LocalS3Client(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pool_stats(self):
+        storage = S3Storage("test-bucket", self.s3_client, max_pool_connections=2)
+        storage.put_many((f"data/hand{index}.txt", "content") for index in range(10))
+        self.assertEqual(len(list(storage.get_many(f"data/hand{index}.txt" for index in range(10)))), 10)
+        stats = storage.get_stats()
+        self.assertEqual(stats["max_pool_connections"], 2)
+        self.assertEqual(stats["nb_calls"], 20)
+        self.assertGreaterEqual(stats["pool_wait_time"], 0.0)
+        storage = pickle.loads(pickle.dumps(storage))
+        self.assertEqual(storage.get_stats()["nb_calls"], 0)
+        self.assertEqual(storage.get_text("data/hand0.txt"), "content")
+
+    def test_pool_slot_released_while_streaming(self):
+        storage = S3Storage("test-bucket", self.s3_client, max_pool_connections=1)
+        for key in ["data/hand.txt", "data/hand.txt.gz"]:
+            storage.put(key, "line 0\nline 1\n")
+            lines = storage.iter_lines(key)
+            self.assertEqual(next(lines), "line 0\n")
+            self.assertTrue(storage.pool_slots.acquire(blocking=False))
+            storage.pool_slots.release()
+            self.assertEqual(list(lines), ["line 1\n"])
+
+    def test_parse_raw_history_with_one_connection(self):
+        parser = CloudHandHistoryParser("test-bucket", s3_client=self.s3_client)
+        parser.storage = S3Storage("test-bucket", self.s3_client, max_pool_connections=1)
+        hand_texts = []
+        for example in ["example01.txt", "example03.txt"]:
+            with open(os.path.join(TESTS_DIR, "history_parser", "split_files", example), encoding="utf-8") as file:
+                hand_texts.append(file.read())
+        raw_key = f"{parser.raw_dir}/history.txt"
+        parser.storage.put(raw_key, "".join(f"Winamax Poker -{text}" for text in hand_texts))
+        thread = threading.Thread(target=parser.parse_raw_history, args=(raw_key,), daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(parser.list_parsed_histories_keys()), 2)
+
+    def test_pool_sized_to_workers(self):
+        parser = CloudHandHistoryParser("test-bucket", s3_client=self.s3_client, max_workers=64)
+        self.assertEqual(parser.storage.max_pool_connections, 64)
+        parser = CloudSummaryParser("test-bucket", executor="inline", s3_client=self.s3_client)
+        self.assertEqual(parser.storage.max_pool_connections, parser.fetch_workers + parser.upload_workers)
+
+    def test_boto3_client_config(self):
+        with mock.patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-3"}):
+            storage = S3Storage("test-bucket", max_pool_connections=48)
+        config = storage.s3.meta.config
+        self.assertEqual(config.max_pool_connections, 48)
+        self.assertEqual(config.retries["mode"], "adaptive")
+        self.assertEqual(config.retries["total_max_attempts"], 5)
+
+    def test_worker_connections(self):
+        with mock.patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-3"}):
+            parser = CloudHandHistoryParser("test-bucket", executor="process", max_workers=2)
+            s3, pool_slots = parser.s3, parser.storage.pool_slots
+            init_worker(parser)
+        self.assertIsNot(parser.s3, s3)
+        self.assertIsNot(parser.storage.pool_slots, pool_slots)
+        injected_parser = CloudSummaryParser("test-bucket", s3_client=self.s3_client)
+        init_worker(injected_parser)
+        self.assertIs(injected_parser.s3, self.s3_client)
+
+
+class TestParsersStorage(unittest.TestCase):
+    def test_shared_parser_base(self):
+        for parser_class in [AbstractHandHistoryParser, AbstractSummaryParser]:
+            self.assertTrue(issubclass(parser_class, AbstractParser))
+            for method_name in ["check_engine", "run_tasks", "iter_tasks", "print_storage_stats"]:
+                self.assertNotIn(method_name, vars(parser_class))
+
+    def test_history_parser_memory_storage(self):
+        parser = LocalHandHistoryParser(data_dir="data")
+        parser.storage = MemoryStorage()
+        with open(os.path.join(TESTS_DIR, "history_parser", "split_files", "example01.txt"), encoding="utf-8") as file:
+            hand_text = file.read()
+        split_key = os.path.join(parser.split_dir, "example01.txt")
+        parser.storage.put(split_key, hand_text)
+        parser.parse_hand_histories_batch(parser.iter_split_histories_keys())
+        self.assertEqual(parser.list_parsed_histories_keys(), [parser.get_parsed_key(split_key)])
+        self.assertTrue(parser.check_is_parsed(split_key))
+
+    def test_summary_parser_memory_storage(self):
+        parser = LocalSummaryParser(data_dir="data")
+        parser.storage = MemoryStorage()
+        with open(os.path.join(TESTS_DIR, "summary_parser", "raw_files", "example01.txt"), encoding="utf-8") as file:
+            parser.storage.put(os.path.join(parser.raw_dir, "example01.txt"), file.read())
+        parser.parse_summaries_batch(parser.iter_summary_keys(), fields=["tournament_id"])
+        self.assertEqual(list(parser.storage.list_prefix(os.path.join("data", "summaries", "projections"))),
+                         [os.path.join("data", "summaries", "projections", "tournament_id", "example01.json")])
@@ -1,6 +1,13 @@
 import unittest
+import inspect
+import json
 import os
+import shutil
+import tempfile
 
+from pkrhistoryparser.local_s3 import LocalS3Client
+from pkrhistoryparser.patterns import registry as patterns
+from pkrhistoryparser.summary_parsers.cloud import CloudSummaryParser
 from pkrhistoryparser.summary_parsers.local import LocalSummaryParser
 from pkrhistoryparser.settings import TEST_DATA_DIR
 
@@ -223,3 +230,245 @@ class Test03(unittest.TestCase):
         result = self.parser.extract_nb_entries(self.summary_text)
         expected_result = {"nb_entries": 2}
         self.assertEqual(result, expected_result)
+
+
+class TestNewSummaries(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser = LocalSummaryParser(data_dir=self.temp_dir.name)
+        os.makedirs(self.parser.raw_dir)
+        os.makedirs(self.parser.parsed_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "raw_files", example), self.parser.raw_dir)
+        with open(os.path.join(self.parser.parsed_dir, "example01.json"), "w", encoding="utf-8") as file:
+            file.write("{}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_list_parsed_summary_keys(self):
+        self.assertEqual(self.parser.list_parsed_summary_keys(),
+                         [os.path.join(self.parser.parsed_dir, "example01.json")])
+
+    def test_parse_new_summaries(self):
+        self.parser.parse_new_summaries()
+        self.assertEqual(self.parser.get_text(os.path.join(self.parser.parsed_dir, "example01.json")), "{}")
+        self.assertTrue(os.path.exists(os.path.join(self.parser.parsed_dir, "example03.json")))
+
+
+class TestSummaryProjection(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser = LocalSummaryParser(data_dir=self.temp_dir.name, executor="inline")
+        os.makedirs(self.parser.raw_dir)
+        shutil.copy(os.path.join(TEST_DIR, "raw_files", "example01.txt"), self.parser.raw_dir)
+        self.summary_text = self.parser.get_text(os.path.join(self.parser.raw_dir, "example01.txt"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_tournament_summary_fields(self):
+        summary_info = self.parser.parse_tournament_summary(self.summary_text)
+        projected_info = self.parser.parse_tournament_summary(
+            self.summary_text, fields=["levels_structure", "tournament_id"])
+        self.assertEqual(list(projected_info), ["tournament_id", "levels_structure"])
+        self.assertEqual(projected_info["levels_structure"], summary_info["levels_structure"])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse_tournament_summary(self.summary_text, fields=["unknown"])
+
+    def test_parse_summaries_fields(self):
+        self.parser.parse_summaries(fields=["amount_won", "tournament_id"])
+        projected_key = os.path.join(self.temp_dir.name, "summaries", "projections", "tournament_id-amount_won",
+                                     "example01.json")
+        with open(projected_key, encoding="utf-8") as file:
+            self.assertEqual(set(json.load(file)), {"tournament_id", "amount_won"})
+        self.assertEqual(self.parser.list_parsed_summary_keys(), [])
+
+
+class TestSummaryPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser = LocalSummaryParser(data_dir=self.temp_dir.name)
+        os.makedirs(self.parser.raw_dir)
+        for example in ["example01.txt", "example03.txt"]:
+            shutil.copy(os.path.join(TEST_DIR, "raw_files", example), self.parser.raw_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_summaries_pipeline(self):
+        self.assertEqual(self.parser.parse_summaries_pipeline(), [])
+        for summary_key in self.parser.list_summary_keys():
+            self.assertEqual(self.parser.get_text(self.parser.get_parsed_key(summary_key)),
+                             self.parser.parse_to_json(summary_key))
+
+    def test_pipeline_fields(self):
+        self.parser.parse_summaries_pipeline(fields=["tournament_id"])
+        self.assertEqual(self.parser.list_parsed_summary_keys(), [])
+        projection_dir = os.path.join(self.temp_dir.name, "summaries", "projections", "tournament_id")
+        self.assertEqual(sorted(os.listdir(projection_dir)), ["example01.json", "example03.json"])
+
+
+class TestSummaryParsersParameters(unittest.TestCase):
+    def test_parsers_parameters(self):
+        for parser_class in [LocalSummaryParser, CloudSummaryParser]:
+            parameters = list(inspect.signature(parser_class).parameters)
+            self.assertEqual(parameters[1:4], ["engine", "executor", "max_workers"], parser_class.__name__)
+
+
+class TestSummaryScannerEngine(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalSummaryParser(data_dir=TEST_DATA_DIR)
+        self.scanner_parser = LocalSummaryParser(data_dir=TEST_DATA_DIR, engine="scanner")
+
+    def get_summary_texts(self) -> list:
+        return [self.parser.get_text(os.path.join(TEST_DIR, "raw_files", example))
+                for example in ["example01.txt", "example02.txt", "example03.txt"]]
+
+    def test_same_summaries(self):
+        for summary_text in self.get_summary_texts():
+            self.assertEqual(self.scanner_parser.parse_tournament_summary(summary_text),
+                             self.parser.parse_tournament_summary(summary_text))
+
+    def test_same_projections(self):
+        fields = ["tournament_name", "start_date", "final_position", "nb_entries"]
+        for summary_text in self.get_summary_texts():
+            self.assertEqual(self.scanner_parser.parse_tournament_summary(summary_text, fields=fields),
+                             self.parser.parse_tournament_summary(summary_text, fields=fields))
+
+    def test_last_occurrences(self):
+        summary_text = self.get_summary_texts()[0]
+        edited_texts = [
+            summary_text.replace("Speed : normal", "Speed :"),
+            summary_text.replace("You finished in", "You finished"),
+            summary_text + "\nType : Levels Speed Prizepool\nYou finished in place\n",
+            summary_text.replace("Tournament started", "Tournament started 2023/05/07 14:00 UTC, ")
+        ]
+        for edited_text in edited_texts:
+            self.assertEqual(self.scanner_parser.parse_tournament_summary(edited_text),
+                             self.parser.parse_tournament_summary(edited_text))
+
+    def test_missing_field(self):
+        summary_text = self.get_summary_texts()[0].replace("Prizepool", "Pool")
+        with self.assertRaises(IndexError):
+            self.scanner_parser.parse_tournament_summary(summary_text)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            LocalSummaryParser(data_dir=TEST_DATA_DIR, engine="lines")
+
+    def test_start_timestamp(self):
+        summary_text = self.get_summary_texts()[0]
+        fields = ["start_date", "start_timestamp"]
+        expected_result = {"start_date": "2023/05/07 14:00:00 UTC", "start_timestamp": 1683468000}
+        self.assertEqual(self.parser.parse_tournament_summary(summary_text, fields=fields), expected_result)
+        self.assertEqual(self.scanner_parser.parse_tournament_summary(summary_text, fields=fields), expected_result)
+        self.assertNotIn("start_timestamp", self.parser.parse_tournament_summary(summary_text))
+        parser = LocalSummaryParser(data_dir=TEST_DATA_DIR, with_timestamp=True)
+        self.assertEqual(parser.parse_tournament_summary(summary_text)["start_timestamp"], 1683468000)
+
+
+class TestSummaryEntries(unittest.TestCase):
+    def setUp(self):
+        self.parser = LocalSummaryParser(data_dir=TEST_DATA_DIR)
+        self.summary_text = self.parser.get_text(os.path.join(TEST_DIR, "raw_files", "example03.txt"))
+
+    def test_entry_spans(self):
+        spans = list(self.parser.iter_entry_spans(self.summary_text))
+        self.assertEqual(len(spans), 2)
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[0][1], spans[1][0])
+        self.assertEqual(spans[1][1], len(self.summary_text))
+        self.assertEqual(list(self.parser.iter_entry_spans("")), [])
+
+    def test_extract_entries(self):
+        entries = self.parser.extract_entries(self.summary_text)["entries"]
+        self.assertEqual([entry["final_position"] for entry in entries], [2665, 1])
+        self.assertEqual(entries[0]["amount_won"], 0.0)
+        summary_info = self.parser.parse_tournament_summary(self.summary_text)
+        self.assertEqual(sum(entry["amount_won"] for entry in entries), summary_info["amount_won"])
+        self.assertEqual(sum(entry["bounty_won"] for entry in entries), summary_info["bounty_won"])
+
+    def test_optional_entries(self):
+        self.assertNotIn("entries", self.parser.parse_tournament_summary(self.summary_text))
+        projection = self.parser.parse_tournament_summary(self.summary_text, fields=["entries", "nb_entries"])
+        self.assertEqual(list(projection), ["nb_entries", "entries"])
+        parser = LocalSummaryParser(data_dir=TEST_DATA_DIR, with_entries=True)
+        summary_info = parser.parse_tournament_summary(self.summary_text)
+        self.assertEqual(len(summary_info["entries"]), summary_info["nb_entries"])
+
+
+class TestLevelsStructures(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser = LocalSummaryParser(data_dir=self.temp_dir.name)
+        self.summary_texts = [self.parser.get_text(os.path.join(TEST_DIR, "raw_files", example))
+                              for example in ["example01.txt", "example02.txt", "example03.txt"]]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_shared_structures(self):
+        summary_info = self.parser.parse_tournament_summary(self.summary_texts[0])
+        self.assertNotIn("levels_structure_id", summary_info)
+        summary_info["levels_structure"][0]["sb"] = 0.0
+        summary_info["levels_structure"].pop()
+        other_summary_info = self.parser.parse_tournament_summary(self.summary_texts[0])
+        self.assertGreater(self.parser.parse_levels_text.cache_info().hits, 0)
+        self.assertNotEqual(other_summary_info["levels_structure"], summary_info["levels_structure"])
+        levels_text = patterns.LEVELS_STRUCTURE_PATTERN.findall(self.summary_texts[0])[-1][0]
+        self.assertEqual([dict(level) for level in self.parser.parse_levels_text(levels_text)[1]],
+                         other_summary_info["levels_structure"])
+
+    def test_structures_table(self):
+        for engine in ["regex", "scanner"]:
+            parser = LocalSummaryParser(data_dir=self.temp_dir.name, engine=engine, levels_table=True)
+            summaries_info = [parser.parse_tournament_summary(summary_text) for summary_text in self.summary_texts]
+            for summary_text, summary_info in zip(self.summary_texts, summaries_info):
+                self.assertNotIn("levels_structure", summary_info)
+                structure_key = parser.get_levels_structure_key(summary_info["levels_structure_id"])
+                structure_info = json.loads(parser.get_text(structure_key))
+                self.assertEqual(structure_info["levels_structure"],
+                                 self.parser.extract_levels_structure(summary_text)["levels_structure"])
+        structure_ids = {summary_info["levels_structure_id"] for summary_info in summaries_info}
+        self.assertEqual(sorted(os.listdir(self.parser.structures_dir)),
+                         sorted(f"{structure_id}.json" for structure_id in structure_ids))
+
+
+class TestSummaryJsonFormats(unittest.TestCase):
+    def test_formats(self):
+        parser = LocalSummaryParser(data_dir=TEST_DATA_DIR)
+        compact_parser = LocalSummaryParser(data_dir=TEST_DATA_DIR, json_format="compact")
+        for example in ["example01.txt", "example02.txt", "example03.txt"]:
+            summary_key = os.path.join(TEST_DIR, "raw_files", example)
+            summary_info = parser.parse_tournament_summary(parser.get_text(summary_key))
+            json_summary = parser.parse_to_json(summary_key)
+            self.assertEqual(json_summary, json.dumps(summary_info, indent=4, sort_keys=True, ensure_ascii=False))
+            compact_json_summary = compact_parser.parse_to_json(summary_key)
+            self.assertEqual(json.loads(compact_json_summary), json.loads(json_summary))
+            self.assertEqual(list(json.loads(compact_json_summary)), sorted(summary_info))
+
+
+class TestCloudSummaryParserWithLocalS3(unittest.TestCase):
+    def test_parse_summaries(self):
+        s3_client = LocalS3Client(latency=0.001)
+        with open(os.path.join(TEST_DIR, "raw_files", "example01.txt"), "rb") as file:
+            s3_client.put_object(Bucket="test-bucket", Key="data/summaries/raw/example01.txt", Body=file.read())
+        parser = CloudSummaryParser("test-bucket", s3_client=s3_client)
+        parser.parse_summaries()
+        self.assertEqual(parser.list_parsed_summary_keys(), ["data/summaries/parsed/example01.json"])
+        self.assertEqual(parser.get_text("data/summaries/parsed/example01.json"),
+                         parser.parse_to_json("data/summaries/raw/example01.txt"))
+
+    def test_compressed_outputs(self):
+        s3_client = LocalS3Client()
+        with open(os.path.join(TEST_DIR, "raw_files", "example01.txt"), "rb") as file:
+            s3_client.put_object(Bucket="test-bucket", Key="data/summaries/raw/example01.txt", Body=file.read())
+        parser = CloudSummaryParser("test-bucket", s3_client=s3_client, compression="gzip")
+        parser.parse_summaries_pipeline()
+        self.assertEqual(parser.list_parsed_summary_keys(), ["data/summaries/parsed/example01.json.gz"])
+        self.assertTrue(parser.check_is_parsed("data/summaries/raw/example01.txt"))
+        self.assertEqual(parser.get_text("data/summaries/parsed/example01.json.gz"),
+                         parser.parse_to_json("data/summaries/raw/example01.txt"))